@@ -6,9 +6,11 @@ from optuna_framework.adapters.trial import TrialAdapter
 from optuna_framework.adapters.worker import WorkerAdapter
 from optuna_framework.adapters.optimization import OptimizationAdapter
 from optuna_framework.adapters.prune import PruneAdapter
+from optuna_framework.context import TrialContext
 from optuna_framework.objective import ObjectiveCallable
 from optuna_framework.runner import optimize_study
 from optuna_framework.search_space import (
+    CompiledSearchSpace,
     build_params_tree,
     flatten_spec_tree,
     normalize_value,
@@ -23,9 +25,11 @@ __all__ = [
     "TrialAdapter",
     "WorkerAdapter",
     "OptimizationAdapter",
+    "TrialContext",
     "PruneAdapter",
     "ObjectiveCallable",
     "optimize_study",
+    "CompiledSearchSpace",
     "build_params_tree",
     "flatten_spec_tree",
     "normalize_value",
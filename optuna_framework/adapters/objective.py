@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import optuna
 
-from optuna_framework.search_space import normalize_value, suggest_value
+from optuna_framework.search_space import CompiledSearchSpace, normalize_value, suggest_value
 
 
 @dataclass
@@ -17,9 +17,14 @@ class ObjectiveAdapter(ABC):
     def __init__(self, meta: Dict[str, Any], project: Dict[str, Any]) -> None:
         self.meta = dict(meta or {})
         self.project = dict(project or {})
+        self.shared: Dict[str, Any] = {}
+
+    def prepare_shared(self) -> Dict[str, Any]:
+        """Optional hook run once in the parent; returned arrays/bytes are shared with workers."""
+        return {}
 
     def worker_init(self) -> None:
-        """Optional hook executed once per worker before setup."""
+        """Optional hook executed once per worker before setup; ``self.shared`` is attached."""
 
     def setup(self) -> None:
         """Optional hook to load heavy data per worker."""
@@ -27,6 +32,10 @@ class ObjectiveAdapter(ABC):
     def teardown(self) -> None:
         """Optional hook to release resources per worker."""
 
+    def cache_fingerprint(self) -> Optional[str]:
+        """Optional code/data fingerprint mixed into evaluation cache keys."""
+        return None
+
     def validate_search_space(self, search_space: Dict[str, Any]) -> List[str]:
         return []
 
@@ -36,6 +45,8 @@ class ObjectiveAdapter(ABC):
     def suggest_params(
         self, trial: optuna.trial.Trial, search_space: Dict[str, Any]
     ) -> Dict[str, Any]:
+        if isinstance(search_space, CompiledSearchSpace):
+            return search_space.suggest(trial)
         return {
             name: normalize_value(suggest_value(trial, name, spec))
             for name, spec in search_space.items()
@@ -47,7 +58,24 @@ class ObjectiveAdapter(ABC):
     def on_trial_end(self, trial: optuna.trial.Trial, value: float, params: Dict[str, Any]) -> None:
         """Optional hook after execute."""
 
+    def report(self, trial: optuna.trial.Trial, value: float, step: int) -> None:
+        """Report ``value`` after ``step`` units of budget (epochs, rounds...); raise TrialPruned if told to stop."""
+        trial.report(float(value), int(step))
+        if trial.should_prune():
+            trial.set_user_attr("pruned_step", int(step))
+            raise optuna.TrialPruned(f"pruned at step {int(step)}")
+
     @abstractmethod
     def execute(self, params: Dict[str, Any], trial: optuna.trial.Trial) -> Any:
         """Return float or TrialResult."""
         raise NotImplementedError
+
+    def execute_batch(self, params_list: List[Dict[str, Any]], trials: List[optuna.trial.Trial]) -> List[Any]:
+        """Optional vectorized hook; return one float/TrialResult (or exception) per params."""
+        results: List[Any] = []
+        for params, trial in zip(params_list, trials):
+            try:
+                results.append(self.execute(params, trial))
+            except Exception as exc:
+                results.append(exc)
+        return results
@@ -0,0 +1,13 @@
+from typing import Any, Dict, Set
+
+_FRAMEWORK_ATTRS: Set[str] = set()
+
+
+def register_attrs(*names: str) -> None:
+    """Declare user attrs that the framework, not the objective, sets on trials."""
+    _FRAMEWORK_ATTRS.update(names)
+
+
+def result_attrs(user_attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """``user_attrs`` without the registered framework attrs, i.e. what the objective itself stored."""
+    return {key: value for key, value in user_attrs.items() if key not in _FRAMEWORK_ATTRS}
@@ -0,0 +1,301 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import optuna
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from optuna_framework.adapters.objective import ObjectiveAdapter
+from optuna_framework.objective import ObjectiveCallable
+from optuna_framework.runner import optimize_study
+from optuna_framework.search_space import CompiledSearchSpace
+from optuna_framework.storage import StorageSpec
+
+BACKENDS = ("sqlite", "sqlite-shm", "journal", "journal-shm")
+
+# Per-process counters; workers dump theirs on teardown and the parent reads its own directly.
+# ``first``/``last`` bound the process's trial loop, so startup and teardown stay out of per-trial overhead.
+_STATS: Dict[str, Any] = {"queries": 0, "execute_sec": 0.0, "first": None, "last": None, "counting": False}
+
+
+def _count_query(*args: Any) -> None:
+    _STATS["queries"] += 1
+
+
+def _install_query_counter() -> None:
+    if _STATS["counting"]:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    event.listen(Engine, "before_cursor_execute", _count_query)
+    _STATS["counting"] = True
+
+
+def _reset_stats() -> None:
+    _STATS["queries"] = 0
+    _STATS["execute_sec"] = 0.0
+    _STATS["first"] = None
+    _STATS["last"] = None
+
+
+class _BenchObjective(ObjectiveAdapter):
+    def worker_init(self) -> None:
+        if os.getpid() != int(self.project["bench_parent_pid"]):
+            # Forked workers inherit the parent's counts.
+            _reset_stats()
+        _install_query_counter()
+
+    def execute(self, params: Dict[str, Any], trial: optuna.trial.Trial) -> float:
+        if _STATS["first"] is None:
+            _STATS["first"] = time.time()
+        t0 = time.perf_counter()
+        value = self.evaluate(params)
+        _STATS["execute_sec"] += time.perf_counter() - t0
+        _STATS["last"] = time.time()
+        return value
+
+    @abstractmethod
+    def evaluate(self, params: Dict[str, Any]) -> float:
+        """Work of one trial; the benchmarked cost."""
+
+    def teardown(self) -> None:
+        if os.getpid() == int(self.project["bench_parent_pid"]):
+            return
+        path = Path(self.project["bench_dir"]) / f"stats-{os.getpid()}.json"
+        path.write_text(json.dumps({key: _STATS[key] for key in ("queries", "execute_sec", "first", "last")}))
+
+
+class NoopObjective(_BenchObjective):
+    """Returns immediately; every second measured is framework overhead."""
+
+    def evaluate(self, params: Dict[str, Any]) -> float:
+        return float(len(params))
+
+
+class SleepObjective(_BenchObjective):
+    """Sleeps ``project.bench_sleep_sec`` (default 0.01); models I/O-bound objectives."""
+
+    def evaluate(self, params: Dict[str, Any]) -> float:
+        time.sleep(float(self.project.get("bench_sleep_sec", 0.01)))
+        return float(len(params))
+
+
+class CpuObjective(_BenchObjective):
+    """NumPy matmuls of ``project.bench_cpu_size`` (default 128); models CPU-bound objectives."""
+
+    def setup(self) -> None:
+        if np is None:
+            raise ImportError("NumPy is required for the cpu benchmark objective. Install with 'pip install numpy'.")
+        size = int(self.project.get("bench_cpu_size", 128))
+        self._matrix = np.random.default_rng(0).random((size, size))
+
+    def evaluate(self, params: Dict[str, Any]) -> float:
+        out = self._matrix
+        for _ in range(4):
+            out = out @ self._matrix
+            out /= np.abs(out).max()
+        return float(out.sum())
+
+
+OBJECTIVES = {"noop": NoopObjective, "sleep": SleepObjective, "cpu": CpuObjective}
+
+
+def _search_space(n_params: int) -> Dict[str, Any]:
+    return {f"x{i}": {"range": [0.0, 1.0]} for i in range(n_params)}
+
+
+def _storage_path(backend: str, workdir: Path, run: int) -> Path:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend '{backend}'. Choose from {'/'.join(BACKENDS)}.")
+    suffix = ".journal" if backend.startswith("journal") else ".db"
+    if backend.endswith("-shm"):
+        shm = Path("/dev/shm")
+        base = shm if shm.is_dir() else workdir
+        return base / f"optuna-bench-{os.getpid()}-{run}{suffix}"
+    return workdir / f"run-{run}{suffix}"
+
+
+def _storage_config(backend: str, path: Path) -> Dict[str, Any]:
+    if backend.startswith("journal"):
+        return {"storage_backend": "journal", "storage_journal": str(path)}
+    return {"storage_url": f"sqlite:///{path.as_posix()}"}
+
+
+def _prefill(storage_cfg: Dict[str, Any], study_name: str, space: CompiledSearchSpace, n: int, seed: int) -> None:
+    """Add ``n`` finished trials so the run measures a study of that size."""
+    if n <= 0:
+        return
+    storage = StorageSpec.from_config(storage_cfg).build()
+    study = optuna.create_study(study_name=study_name, storage=storage, direction="maximize")
+    rng = random.Random(seed)
+    chunk: List[optuna.trial.FrozenTrial] = []
+    for _ in range(n):
+        params = {name: rng.random() for name in space.distributions}
+        chunk.append(
+            optuna.trial.create_trial(params=params, distributions=space.distributions, value=rng.random())
+        )
+        if len(chunk) >= 1000:
+            study.add_trials(chunk)
+            chunk = []
+    if chunk:
+        study.add_trials(chunk)
+
+
+def _trial_loops(stats: List[Dict[str, Any]], started: float, slots: int) -> Tuple[float, int, Optional[float]]:
+    """Slot-seconds spent inside trial loops, the number of loops, and the mean time until a loop began."""
+    ran = [s for s in stats if s["first"] is not None]
+    if not ran:
+        return 0.0, 0, None
+    busy = sum((s["last"] - s["first"]) * slots for s in ran)
+    return busy, len(ran) * slots, sum(s["first"] - started for s in ran) / len(ran)
+
+
+def run_case(case: Dict[str, Any], workdir: Path, run: int) -> Dict[str, Any]:
+    """Run one benchmark configuration and return its metrics."""
+    space = CompiledSearchSpace(_search_space(case["params"]))
+    storage_path = _storage_path(case["backend"], workdir, run)
+    storage_cfg = _storage_config(case["backend"], storage_path)
+    study_name = f"bench_{run}"
+    stats_dir = workdir / f"stats-{run}"
+    stats_dir.mkdir()
+    _prefill(storage_cfg, study_name, space, case["prefill"], case["seed"])
+    project = {
+        "bench_dir": str(stats_dir),
+        "bench_parent_pid": os.getpid(),
+        "bench_sleep_sec": case["sleep_sec"],
+        "bench_cpu_size": case["cpu_size"],
+    }
+    opt_cfg = {
+        "n_trials": case["prefill"] + case["trials"],
+        "n_jobs": case["n_jobs"],
+        **storage_cfg,
+        "sampler": case["sampler"],
+        "pruner": None,
+        "executor": case["executor"],
+        "start_method": case["start_method"],
+    }
+    objective = ObjectiveCallable(
+        space, f"optuna_framework.bench:{OBJECTIVES[case['objective']].__name__}", meta={}, project=project
+    )
+    _reset_stats()
+    started = time.time()
+    t0 = time.perf_counter()
+    study, *_ = optimize_study(
+        objective, {}, str(workdir / "params.yaml"), opt_cfg, {"name": study_name}, space, {}, True,
+        case["seed"], project=project,
+    )
+    wall = time.perf_counter() - t0
+    stats = [dict(_STATS)] + [json.loads(entry.read_text()) for entry in stats_dir.iterdir()]
+    # Thread/async slots share the parent's counters and run n_jobs trials at a time.
+    slots = 1 if case["executor"] == "process" else case["n_jobs"]
+    queries = sum(s["queries"] for s in stats)
+    execute_sec = sum(s["execute_sec"] for s in stats)
+    busy_sec, loops, startup_sec = _trial_loops(stats, started, slots)
+    done = len(study.trials) - case["prefill"]
+    # A loop of k trials spans k - 1 tell/ask gaps; its first ask and last tell fall in startup and teardown.
+    gaps = max(1, done - loops)
+    # The engine hook only sees SQL backends; journal storage issues no statements to count.
+    counted = not case["backend"].startswith("journal")
+    if case["backend"].endswith("-shm"):
+        for leftover in storage_path.parent.glob(f"{storage_path.name}*"):
+            leftover.unlink()
+    return dict(
+        case,
+        wall_sec=round(wall, 3),
+        trials_done=done,
+        trials_per_sec=round(done / wall, 2) if wall > 0 else None,
+        startup_sec=round(startup_sec, 3) if startup_sec is not None else None,
+        overhead_ms_per_trial=round(1e3 * max(0.0, busy_sec - execute_sec) / gaps, 3),
+        execute_ms_per_trial=round(1e3 * execute_sec / max(1, done), 3),
+        queries=queries if counted else None,
+        queries_per_trial=round(queries / max(1, done), 1) if counted else None,
+    )
+
+
+def _csv(kind: Any) -> Any:
+    return lambda value: [kind(v) for v in str(value).split(",") if v.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the framework's own per-trial overhead.")
+    parser.add_argument("--objective", type=_csv(str), default=["noop"], help=f"Any of {'/'.join(OBJECTIVES)}.")
+    parser.add_argument("--backend", type=_csv(str), default=["sqlite"], help=f"Any of {'/'.join(BACKENDS)}.")
+    parser.add_argument("--sampler", type=_csv(str), default=["random"], help="Samplers, e.g. random,tpe.")
+    parser.add_argument("--n-jobs", type=_csv(int), default=[1, 4], help="Worker counts, e.g. 1,4,16.")
+    parser.add_argument("--params", type=_csv(int), default=[10], help="Search-space sizes, e.g. 10,100,1000.")
+    parser.add_argument("--trials", type=_csv(int), default=[200], help="Trials to run per case.")
+    parser.add_argument("--prefill", type=_csv(int), default=[0], help="Finished trials already in the study, e.g. 0,1000,100000.")
+    parser.add_argument("--executor", default="process", help="process/thread/async.")
+    parser.add_argument("--start-method", default="spawn", help="spawn/forkserver/fork.")
+    parser.add_argument("--sleep-sec", type=float, default=0.01, help="Sleep per trial of the sleep objective.")
+    parser.add_argument("--cpu-size", type=int, default=128, help="Matrix size of the cpu objective.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="Write the JSON results here instead of stdout.")
+    args = parser.parse_args()
+
+    for name in args.objective:
+        if name not in OBJECTIVES:
+            raise ValueError(f"Unsupported objective '{name}'. Choose from {'/'.join(OBJECTIVES)}.")
+    if "cpu" in args.objective and np is None:
+        raise ImportError("NumPy is required for the cpu benchmark objective. Install with 'pip install numpy'.")
+
+    _install_query_counter()
+    grid = itertools.product(
+        args.objective, args.backend, args.sampler, args.n_jobs, args.params, args.trials, args.prefill
+    )
+    workdir = Path(tempfile.mkdtemp(prefix="optuna-bench-"))
+    results = []
+    try:
+        for run, (objective, backend, sampler, n_jobs, n_params, trials, prefill) in enumerate(grid):
+            case = {
+                "objective": objective,
+                "backend": backend,
+                "sampler": sampler,
+                "n_jobs": n_jobs,
+                "params": n_params,
+                "trials": trials,
+                "prefill": prefill,
+                "executor": args.executor,
+                "start_method": args.start_method,
+                "sleep_sec": args.sleep_sec,
+                "cpu_size": args.cpu_size,
+                "seed": args.seed,
+            }
+            result = run_case(case, workdir, run)
+            queries_per_trial = "n/a" if result["queries_per_trial"] is None else result["queries_per_trial"]
+            print(
+                f"[BENCH] {objective} {backend} {sampler} n_jobs={n_jobs} params={n_params} prefill={prefill} "
+                f"trials/sec={result['trials_per_sec']} startup={result['startup_sec']}s "
+                f"overhead={result['overhead_ms_per_trial']}ms queries/trial={queries_per_trial}",
+                flush=True,
+            )
+            results.append(result)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    payload = json.dumps({"optuna": optuna.__version__, "results": results}, indent=2)
+    if args.out:
+        Path(args.out).write_text(payload + "\n")
+        print(f"[BENCH] wrote {len(results)} result(s) to {args.out}", flush=True)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    # Run from the importable module so workers and the parent share the same counters.
+    from optuna_framework.bench import main as _main
+
+    _main()
@@ -0,0 +1,191 @@
+from typing import Any, Dict, Optional, Tuple
+
+import optuna
+from optuna.storages import BaseStorage, RDBStorage
+from optuna.trial import TrialState
+
+from optuna_framework.attrs import register_attrs
+from optuna_framework.config import _ensure_positive_int
+
+register_attrs("budget_surplus")
+
+BUDGET_MODES = ("all", "complete", "complete_pruned")
+
+_BUDGET_MODE_ALIASES = {
+    "all": "all",
+    "complete": "complete",
+    "completed": "complete",
+    "complete_pruned": "complete_pruned",
+    "completed_pruned": "complete_pruned",
+    "complete+pruned": "complete_pruned",
+    "completed+pruned": "complete_pruned",
+}
+
+_IN_FLIGHT_STATES = (TrialState.RUNNING, TrialState.WAITING)
+
+
+def resolve_budget_mode(value: Any) -> str:
+    mode = _BUDGET_MODE_ALIASES.get(str(value or "all").strip().lower())
+    if mode is None:
+        raise ValueError(
+            f"Unsupported budget_mode '{value}'. Choose from {'/'.join(BUDGET_MODES)}."
+        )
+    return mode
+
+
+def budget_states(mode: str) -> Optional[Tuple[TrialState, ...]]:
+    if mode == "complete":
+        return (TrialState.COMPLETE,)
+    if mode == "complete_pruned":
+        return (TrialState.COMPLETE, TrialState.PRUNED)
+    return None
+
+
+def count_trials(
+    storage: BaseStorage,
+    study_id: int,
+    states: Optional[Tuple[TrialState, ...]] = None,
+    max_number: Optional[int] = None,
+) -> int:
+    """Trials of the study in ``states``; only those numbered up to ``max_number`` when given."""
+    if isinstance(storage, RDBStorage):
+        # COUNT(*) on the trials table instead of materializing every FrozenTrial.
+        from sqlalchemy import bindparam, text
+
+        sql = "SELECT COUNT(*) FROM trials WHERE study_id = :study_id"
+        query_params: dict = {"study_id": int(study_id)}
+        if states is not None:
+            sql += " AND state IN :states"
+            query_params["states"] = [s.name for s in states]
+        if max_number is not None:
+            sql += " AND number <= :max_number"
+            query_params["max_number"] = int(max_number)
+        stmt = text(sql)
+        if states is not None:
+            stmt = stmt.bindparams(bindparam("states", expanding=True))
+        with storage.engine.connect() as conn:
+            return int(conn.execute(stmt, query_params).scalar() or 0)
+    if max_number is None:
+        return int(storage.get_n_trials(study_id, state=states))
+    trials = storage.get_all_trials(study_id, deepcopy=False, states=states)
+    return sum(1 for t in trials if t.number <= max_number)
+
+
+def max_consecutive_failures(opt_cfg: Dict[str, Any]) -> int:
+    return _ensure_positive_int(opt_cfg.get("max_consecutive_failures", 20), "max_consecutive_failures")
+
+
+class SharedTrialBudget:
+    """Trial budget backed by a counter owned by the coordinator process."""
+
+    def __init__(
+        self, ctx: Any, n_trials: int, mode: str = "all", initial: int = 0, max_failures: Optional[int] = None
+    ) -> None:
+        self.n_trials = int(n_trials)
+        self.mode = resolve_budget_mode(mode)
+        self.max_failures = max_failures
+        self._states = budget_states(self.mode)
+        self._counter = ctx.Value("q", int(initial))
+        self._failures = ctx.Value("i", 0)
+
+    @property
+    def used(self) -> int:
+        return int(self._counter.value)
+
+    @property
+    def failing(self) -> bool:
+        """Failed trials are given back and the last ``max_failures`` trials all failed."""
+        return self.max_failures is not None and self._failures.value >= self.max_failures
+
+    def exhausted_reason(self) -> str:
+        if self.failing:
+            return f"{self._failures.value} trials failed in a row (max_consecutive_failures={self.max_failures})"
+        return f"n_trials={self.n_trials} reached"
+
+    def claim(self) -> bool:
+        if self.failing:
+            return False
+        with self._counter.get_lock():
+            if self._counter.value >= self.n_trials:
+                return False
+            self._counter.value += 1
+            return True
+
+    def confirm(self, study: optuna.Study, trial: Any) -> bool:
+        # Claims from the shared counter are already exact.
+        return True
+
+    def release(self) -> None:
+        with self._counter.get_lock():
+            self._counter.value -= 1
+
+    def settle(self, state: TrialState) -> None:
+        # Trials whose final state does not count toward the budget give their slot back.
+        if self._states is not None and state not in self._states:
+            self.release()
+        if self._states is not None and TrialState.FAIL not in self._states:
+            # Given-back failures would otherwise be replaced forever by an objective that always fails.
+            with self._failures.get_lock():
+                self._failures.value = self._failures.value + 1 if state == TrialState.FAIL else 0
+
+
+class StorageTrialBudget:
+    """Trial budget checked with count-only storage queries (no shared counter).
+
+    ``claim`` is a cheap pre-check that concurrent workers can pass together. After asking, ``confirm``
+    ranks the new trial among the counted trials numbered up to it; a trial ranked past ``n_trials`` is
+    failed at once with the ``budget_surplus`` user attr, so at most ``n_trials`` trials run.
+    """
+
+    def __init__(
+        self, storage: BaseStorage, study_id: int, n_trials: int, mode: str = "all", max_failures: Optional[int] = None
+    ) -> None:
+        self.n_trials = int(n_trials)
+        self.mode = resolve_budget_mode(mode)
+        self.max_failures = max_failures
+        states = budget_states(self.mode)
+        # In-flight trials hold a slot until they finish in a state that is not counted.
+        self._states = None if states is None else states + _IN_FLIGHT_STATES
+        self._gives_back_failures = states is not None and TrialState.FAIL not in states
+        self._storage = storage
+        self._study_id = int(study_id)
+        # Per process: other hosts' failures are not seen.
+        self._failures = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes rebind to their own storage instead of unpickling the coordinator's engine.
+        return dict(self.__dict__, _storage=None)
+
+    def bind(self, storage: BaseStorage, study_id: int) -> "StorageTrialBudget":
+        return StorageTrialBudget(storage, study_id, self.n_trials, self.mode, self.max_failures)
+
+    @property
+    def used(self) -> int:
+        return count_trials(self._storage, self._study_id, self._states)
+
+    @property
+    def failing(self) -> bool:
+        return self.max_failures is not None and self._failures >= self.max_failures
+
+    def exhausted_reason(self) -> str:
+        if self.failing:
+            return f"{self._failures} trials failed in a row (max_consecutive_failures={self.max_failures})"
+        return f"n_trials={self.n_trials} reached"
+
+    def claim(self) -> bool:
+        return not self.failing and self.used < self.n_trials
+
+    def confirm(self, study: optuna.Study, trial: Any) -> bool:
+        """Keep ``trial`` if it is within the budget; otherwise fail it and return False."""
+        if count_trials(self._storage, self._study_id, self._states, trial.number) <= self.n_trials:
+            return True
+        trial.storage.set_trial_user_attr(trial._trial_id, "budget_surplus", True)
+        study.tell(trial.number, state=TrialState.FAIL)
+        return False
+
+    def release(self) -> None:
+        pass
+
+    def settle(self, state: TrialState) -> None:
+        if self._gives_back_failures:
+            self._failures = self._failures + 1 if state == TrialState.FAIL else 0
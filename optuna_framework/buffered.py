@@ -0,0 +1,126 @@
+import json
+from typing import Any, Dict, Optional
+
+import optuna
+from optuna.exceptions import UpdateFinishedTrialError
+from optuna.storages import RDBStorage
+from optuna.trial import TrialState
+
+from optuna_framework.config import _ensure_positive_int
+from optuna_framework.storage import unwrap_storage
+
+
+def write_buffer_reports(opt_cfg: Dict[str, Any]) -> Optional[int]:
+    """Reports per flush when ``write_buffer`` is enabled, else None."""
+    if not bool(opt_cfg.get("write_buffer", False)):
+        return None
+    return _ensure_positive_int(opt_cfg.get("write_buffer_reports", 10), "write_buffer_reports")
+
+
+def _write_rdb(
+    storage: RDBStorage, trial_id: int, user_attrs: Dict[str, Any], intermediate_values: Dict[int, float]
+) -> None:
+    from optuna.storages._rdb import models
+    from sqlalchemy import delete, insert, update
+
+    trials = models.TrialModel.__table__
+    attrs = models.TrialUserAttributeModel.__table__
+    values = models.TrialIntermediateValueModel.__table__
+    with storage.engine.begin() as conn:
+        # A write first, so SQLite takes its write lock before anything is read; also checks the trial is running.
+        running = conn.execute(
+            update(trials)
+            .where(trials.c.trial_id == trial_id, trials.c.state == TrialState.RUNNING)
+            .values(state=TrialState.RUNNING)
+        )
+        if running.rowcount == 0:
+            raise UpdateFinishedTrialError(f"Trial#{trial_id} is not running; its buffered writes were dropped.")
+        if user_attrs:
+            conn.execute(delete(attrs).where(attrs.c.trial_id == trial_id, attrs.c.key.in_(list(user_attrs))))
+            rows = [{"trial_id": trial_id, "key": k, "value_json": json.dumps(v)} for k, v in user_attrs.items()]
+            conn.execute(insert(attrs), rows)
+        if intermediate_values:
+            steps = list(intermediate_values)
+            conn.execute(delete(values).where(values.c.trial_id == trial_id, values.c.step.in_(steps)))
+            rows = []
+            for step, value in intermediate_values.items():
+                stored, kind = models.TrialIntermediateValueModel.intermediate_value_to_stored_repr(value)
+                rows.append(
+                    {"trial_id": trial_id, "step": step, "intermediate_value": stored, "intermediate_value_type": kind}
+                )
+            conn.execute(insert(values), rows)
+
+
+def write_trial_buffer(
+    trial: optuna.trial.Trial, user_attrs: Dict[str, Any], intermediate_values: Dict[int, float]
+) -> None:
+    """Write buffered attrs and reports; one transaction on RDB storage, one call per entry elsewhere."""
+    storage = unwrap_storage(trial.storage)
+    local = getattr(trial, "_cached_frozen_trial", None)
+    if not isinstance(storage, RDBStorage) or local is None:
+        # Journal, proxy and in-memory storages: the trial's own API keeps its local copy in step.
+        for key, value in user_attrs.items():
+            trial.set_user_attr(key, value)
+        for step, value in sorted(intermediate_values.items()):
+            trial.report(value, step)
+        return
+    # Steps already reported are ignored, as Trial.report does.
+    intermediate_values = {s: v for s, v in intermediate_values.items() if s not in local.intermediate_values}
+    _write_rdb(storage, trial._trial_id, user_attrs, intermediate_values)
+    # The trial's local copy is what its pruner reads.
+    local.user_attrs.update(user_attrs)
+    local.intermediate_values.update(intermediate_values)
+
+
+class BufferedTrial:
+    """Trial proxy holding user attrs and reports until ``flush``; everything else is delegated."""
+
+    def __init__(self, trial: optuna.trial.Trial, report_every: int = 10) -> None:
+        self.trial = trial
+        self.report_every = max(1, int(report_every))
+        self._user_attrs: Dict[str, Any] = {}
+        self._reports: Dict[int, float] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.trial, name)
+
+    @property
+    def user_attrs(self) -> Dict[str, Any]:
+        attrs = self.trial.user_attrs
+        attrs.update(self._user_attrs)
+        return attrs
+
+    def set_user_attr(self, key: str, value: Any) -> None:
+        self._user_attrs[key] = value
+
+    def report(self, value: float, step: int) -> None:
+        try:
+            value = float(value)
+        except (TypeError, ValueError) as exc:
+            raise TypeError(f"The `value` argument is of type '{type(value)}' but supposed to be a float.") from exc
+        if step < 0:
+            raise ValueError(f"The `step` argument is {step} but cannot be negative.")
+        if step in self._reports:
+            return
+        self._reports[step] = value
+        if len(self._reports) >= self.report_every:
+            self.flush()
+
+    def should_prune(self) -> bool:
+        if self._reports and not isinstance(self.trial.study.pruner, optuna.pruners.NopPruner):
+            # The pruner reads reports from the trial and other workers compare against it in storage.
+            self.flush()
+        return self.trial.should_prune()
+
+    def flush(self) -> None:
+        if not self._user_attrs and not self._reports:
+            return
+        user_attrs, reports = self._user_attrs, self._reports
+        self._user_attrs, self._reports = {}, {}
+        write_trial_buffer(self.trial, user_attrs, reports)
+
+
+def buffer_trial(trial: Any, report_every: Optional[int]) -> Any:
+    if report_every is None:
+        return trial
+    return BufferedTrial(trial, report_every)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from optuna_framework.search_space import normalize_value
+
+
+def canonical_params_hash(params: Dict[str, Any], fingerprint: Optional[str] = None) -> str:
+    payload = {
+        "params": {str(k): normalize_value(v) for k, v in params.items()},
+        "fingerprint": fingerprint,
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """On-disk cache of objective values keyed by canonical params, shared across studies."""
+
+    def __init__(self, path: str, max_size_mb: Optional[float] = None) -> None:
+        self.path = str(path)
+        self.max_size_bytes = int(float(max_size_mb) * 1024 * 1024) if max_size_mb else None
+        self._init_connections()
+
+    def _init_connections(self) -> None:
+        # One connection per thread; the thread executor shares this cache between slots.
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any]) -> Optional["EvaluationCache"]:
+        path = opt_cfg.get("eval_cache", None)
+        if not path:
+            return None
+        return cls(str(path), opt_cfg.get("eval_cache_max_mb", None))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "max_size_bytes": self.max_size_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_connections()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # check_same_thread=False only so close() can run from the teardown thread.
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute("PRAGMA busy_timeout=30000;")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "key TEXT PRIMARY KEY, value REAL NOT NULL, user_attrs TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS evaluations_accessed ON evaluations (accessed)")
+            self._ensure_size_total(conn)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    @staticmethod
+    def _ensure_size_total(conn: sqlite3.Connection) -> None:
+        # Triggers keep the total exact across every process sharing the file; it is summed once, when created.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            for event, delta in (
+                ("INSERT", "NEW.size"),
+                ("DELETE", "-OLD.size"),
+                ("UPDATE OF size", "NEW.size - OLD.size"),
+            ):
+                name = "evaluations_size_" + event.split()[0].lower()
+                conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON evaluations "
+                    f"BEGIN UPDATE cache_size SET total = total + {delta}; END"
+                )
+            if conn.execute("SELECT 1 FROM cache_size").fetchone() is None:
+                conn.execute("INSERT INTO cache_size (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM evaluations")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, user_attrs FROM evaluations WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE evaluations SET accessed = ? WHERE key = ?", (time.time(), key))
+        return float(row[0]), json.loads(row[1])
+
+    def put(self, key: str, value: float, user_attrs: Dict[str, Any]) -> None:
+        conn = self._connect()
+        attrs_text = json.dumps(user_attrs, default=repr)
+        size = len(key) + len(attrs_text) + 8
+        now = time.time()
+        conn.execute(
+            "INSERT INTO evaluations (key, value, user_attrs, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, user_attrs = excluded.user_attrs, "
+            "size = excluded.size, created = excluded.created, accessed = excluded.accessed",
+            (key, float(value), attrs_text, size, now, now),
+        )
+        if self.max_size_bytes is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        conn = self._connect()
+        total = int(conn.execute("SELECT total FROM cache_size").fetchone()[0])
+        if total <= self.max_size_bytes:
+            return
+        excess = total - self.max_size_bytes
+        freed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM evaluations ORDER BY accessed ASC"):
+            stale.append((key,))
+            freed += int(size)
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM evaluations WHERE key = ?", stale)
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
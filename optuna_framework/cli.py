@@ -3,12 +3,15 @@ from pathlib import Path
 from typing import Any, Dict
 
 from optuna_framework.adapters.objective import ObjectiveAdapter
+from optuna_framework.cache import EvaluationCache
+from optuna_framework.fidelity import FidelitySpec
 from optuna_framework.imports import load_object
 from optuna_framework.io import load_params
 from optuna_framework.objective import ObjectiveCallable
 from optuna_framework.reporting import build_best_payload, write_best_json
 from optuna_framework.runner import optimize_study
-from optuna_framework.search_space import flatten_spec_tree
+from optuna_framework.search_space import CompiledSearchSpace, flatten_spec_tree
+from optuna_framework.timeouts import TrialTimeoutSpec
 
 
 def _ensure_dict(payload: Dict[str, Any], key: str) -> Dict[str, Any]:
@@ -75,6 +78,13 @@ def main() -> None:
         default=None,
         help="Override optuna n_trials for quick runs.",
     )
+    parser.add_argument(
+        "--join",
+        "-j",
+        default=None,
+        metavar="STUDY_NAME",
+        help="Add n_jobs workers to an existing study in storage_url (no versioning, params rewrite or best JSON).",
+    )
     args = parser.parse_args()
 
     params_path = Path(args.params)
@@ -116,13 +126,23 @@ def main() -> None:
     if errors:
         raise ValueError("Invalid search_space configuration:\n  " + "\n  ".join(errors))
     adapter.teardown()
+    compiled_space = CompiledSearchSpace(search_space, tree=search_space_tree)
+    fidelity = FidelitySpec.from_config(opt_cfg)
+    trial_timeout = TrialTimeoutSpec.from_config(opt_cfg)
+    if fidelity is not None and fidelity.name in compiled_space:
+        raise ValueError(f"fidelity param '{fidelity.name}' must not also be in search_space.")
 
     objective = ObjectiveCallable(
-        search_space,
+        compiled_space,
         str(objective_adapter_path),
         meta=meta,
         project=project,
         prune_adapter_path=args.prune_adapter or meta.get("prune_adapter"),
+        eval_cache=EvaluationCache.from_config(opt_cfg),
+        duplicate_policy=opt_cfg.get("duplicate_policy", "none"),
+        max_duplicate_resamples=int(opt_cfg.get("duplicate_max_resamples", 10)),
+        fidelity_param=fidelity.name if fidelity is not None else None,
+        soft_timeout_sec=trial_timeout.soft_sec if trial_timeout is not None else None,
     )
 
     study, best_value, best_params_full, best_params_tree, study_version = optimize_study(
@@ -131,7 +151,7 @@ def main() -> None:
         str(params_path),
         opt_cfg,
         meta,
-        search_space,
+        compiled_space,
         search_space_tree,
         args.continue_study,
         seed,
@@ -139,7 +159,11 @@ def main() -> None:
         trial_adapter_path=args.trial_adapter or meta.get("trial_adapter"),
         worker_adapter_path=args.worker_adapter or meta.get("worker_adapter"),
         optimization_adapter_path=args.optimization_adapter or meta.get("optimization_adapter"),
+        join=args.join,
     )
+    if args.join:
+        print(f"[JOIN] study={study.study_name} trials={len(study.trials)} best_value={best_value:.6f}")
+        return
 
     best = study.best_trial
     out_path = Path(opt_cfg.get("out_path", "optuna_best.json"))
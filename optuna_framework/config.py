@@ -0,0 +1,11 @@
+from typing import Union
+
+
+def _ensure_positive_int(value: Union[int, str, float], name: str) -> int:
+    try:
+        result = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    if result < 1:
+        raise ValueError(f"{name} must be >= 1, got {result}")
+    return result
@@ -0,0 +1,159 @@
+from typing import Any, Optional
+
+_TRIAL_KEYS = ("params", "user_attrs")
+_TAIL_KEYS = ("value", "state", "error")
+
+
+class TrialContext(dict):
+    """Context dict for adapter hooks; ``params`` and ``user_attrs`` are copied from the trial on first use.
+
+    It is a plain ``dict`` to hooks: they may read, write, copy or serialize it. Every dict method loads the
+    two trial copies first, so hooks that only look at the scalar keys skip the copies.
+    """
+
+    __slots__ = ("_trial",)
+
+    def __init__(
+        self,
+        role: str,
+        study_name: str,
+        trial: Optional[Any] = None,
+        value: Optional[float] = None,
+        state: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        phase: Optional[str] = None,
+        worker_id: Optional[int] = None,
+    ) -> None:
+        super().__init__(role=role, study_name=study_name)
+        self._trial = None
+        if phase:
+            dict.__setitem__(self, "phase", phase)
+        if worker_id is not None:
+            dict.__setitem__(self, "worker_id", int(worker_id))
+        if trial is not None:
+            dict.__setitem__(self, "trial_number", int(trial.number))
+        if value is not None:
+            dict.__setitem__(self, "value", float(value))
+        if state is not None:
+            dict.__setitem__(self, "state", state)
+        if error is not None:
+            dict.__setitem__(self, "error", str(error))
+        self._trial = trial
+
+    def _load(self) -> None:
+        trial = self._trial
+        if trial is None:
+            return
+        self._trial = None
+        # Trial.params / user_attrs already return fresh copies; keep the key order of the old dict.
+        tail = [(key, dict.pop(self, key)) for key in _TAIL_KEYS if dict.__contains__(self, key)]
+        dict.__setitem__(self, "params", dict(trial.params))
+        dict.__setitem__(self, "user_attrs", dict(trial.user_attrs))
+        dict.update(self, tail)
+
+    @property
+    def params(self) -> Optional[dict]:
+        return self.get("params")
+
+    @property
+    def user_attrs(self) -> Optional[dict]:
+        return self.get("user_attrs")
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in _TRIAL_KEYS:
+            self._load()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _TRIAL_KEYS:
+            return self._trial is not None or dict.__contains__(self, key)
+        return dict.__contains__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in _TRIAL_KEYS:
+            self._load()
+        return dict.get(self, key, default)
+
+    def __iter__(self):
+        self._load()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self._load()
+        return dict.__len__(self)
+
+    def __repr__(self) -> str:
+        self._load()
+        return dict.__repr__(self)
+
+    def __eq__(self, other: object) -> bool:
+        self._load()
+        if isinstance(other, TrialContext):
+            other._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __or__(self, other: Any) -> Any:
+        self._load()
+        return dict.__or__(self, other)
+
+    def __ror__(self, other: Any) -> Any:
+        self._load()
+        return dict.__ror__(self, other)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        self._load()
+        return dict, (dict(self.items()),)
+
+    def keys(self):
+        self._load()
+        return dict.keys(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    def copy(self) -> dict:
+        self._load()
+        return dict.copy(self)
+
+    def pop(self, *args: Any) -> Any:
+        self._load()
+        return dict.pop(self, *args)
+
+    def popitem(self) -> Any:
+        self._load()
+        return dict.popitem(self)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self._load()
+        return dict.setdefault(self, key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._load()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self._load()
+        dict.__delitem__(self, key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._load()
+        dict.update(self, *args, **kwargs)
+
+    def __ior__(self, other: Any) -> Any:
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        self._trial = None
+        dict.clear(self)
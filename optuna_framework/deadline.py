@@ -0,0 +1,103 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from optuna.storages import BaseStorage, RDBStorage
+from optuna.trial import TrialState
+
+from optuna_framework.attrs import register_attrs
+from optuna_framework.storage import unwrap_storage
+
+register_attrs("time_budget_sec")
+
+_FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+
+
+def duration_alpha(opt_cfg: Dict[str, Any]) -> Optional[float]:
+    """EWMA weight for trial durations when ``deadline_aware`` scheduling applies, else None."""
+    if not opt_cfg.get("timeout_sec", 0) or not bool(opt_cfg.get("deadline_aware", True)):
+        return None
+    alpha = float(opt_cfg.get("duration_ewma_alpha", 0.3))
+    if not 0 < alpha <= 1:
+        raise ValueError(f"duration_ewma_alpha must be in (0, 1], got {alpha}")
+    return alpha
+
+
+def recent_durations(storage: BaseStorage, study_id: int, n: int = 20) -> List[float]:
+    """Wall-clock seconds of the study's last ``n`` finished trials, oldest first."""
+    if isinstance(storage, RDBStorage):
+        from optuna.storages._rdb import models
+        from sqlalchemy import select
+
+        # Two columns of the newest rows instead of materializing every FrozenTrial.
+        table = models.TrialModel.__table__
+        stmt = (
+            select(table.c.datetime_start, table.c.datetime_complete)
+            .where(table.c.study_id == int(study_id), table.c.state.in_(_FINISHED_STATES))
+            .order_by(table.c.trial_id.desc())
+            .limit(int(n))
+        )
+        with storage.engine.connect() as conn:
+            pairs = list(reversed(conn.execute(stmt).fetchall()))
+    else:
+        trials = storage.get_all_trials(study_id, deepcopy=False, states=_FINISHED_STATES)
+        pairs = [(t.datetime_start, t.datetime_complete) for t in trials[-n:]]
+    return [(end - start).total_seconds() for start, end in pairs if start is not None and end is not None]
+
+
+class DurationEstimate:
+    """Exponentially weighted moving average of trial wall-clock seconds."""
+
+    def __init__(self, alpha: float = 0.3, seed: Iterable[float] = ()) -> None:
+        self.alpha = float(alpha)
+        self.value: Optional[float] = None
+        for seconds in seed:
+            self.update(seconds)
+
+    def update(self, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        self.value = seconds if self.value is None else self.alpha * seconds + (1.0 - self.alpha) * self.value
+
+
+class StudyDeadline:
+    """Study deadline; with an estimate, trials predicted to end past it are not started."""
+
+    def __init__(self, timeout_sec: Optional[float], estimate: Optional[DurationEstimate] = None) -> None:
+        self.at = time.time() + float(timeout_sec) if timeout_sec is not None else None
+        self.estimate = estimate
+
+    def remaining(self) -> Optional[float]:
+        return None if self.at is None else self.at - time.time()
+
+    def expired(self) -> bool:
+        return self.at is not None and time.time() > self.at
+
+    def admits(self) -> bool:
+        if self.at is None or self.estimate is None or self.estimate.value is None:
+            return True
+        return self.estimate.value <= self.remaining()
+
+    def record(self, seconds: float) -> None:
+        if self.estimate is not None:
+            self.estimate.update(seconds)
+
+    def budget_attrs(self) -> Dict[str, Any]:
+        """User attrs handing the remaining budget to ``execute`` and the trial adapter."""
+        if self.at is None or self.estimate is None:
+            return {}
+        return {"time_budget_sec": round(max(0.0, self.remaining()), 1)}
+
+    def annotate(self, trials: List[Any]) -> None:
+        for key, value in self.budget_attrs().items():
+            for trial in trials:
+                trial.set_user_attr(key, value)
+
+    def describe(self) -> str:
+        return f"next trial predicted to take {self.estimate.value:.1f}s, {self.remaining():.1f}s left"
+
+
+def study_deadline(study: Any, timeout_sec: Optional[float], alpha: Optional[float]) -> StudyDeadline:
+    """Deadline for this process, its estimate seeded from the study's recent trials."""
+    if timeout_sec is None or alpha is None:
+        return StudyDeadline(timeout_sec)
+    storage = unwrap_storage(study._storage)
+    return StudyDeadline(timeout_sec, DurationEstimate(alpha, recent_durations(storage, study._study_id)))
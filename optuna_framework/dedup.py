@@ -0,0 +1,75 @@
+import threading
+from typing import Any, Dict, Optional, Set
+
+import optuna
+from optuna.trial import TrialState
+
+from optuna_framework.attrs import result_attrs
+from optuna_framework.cache import canonical_params_hash
+from optuna_framework.feed import TrialFeed
+from optuna_framework.fidelity import fidelity_params
+
+DUPLICATE_POLICIES = ("none", "reuse", "prune", "resample")
+
+
+def resolve_duplicate_policy(value: Any) -> str:
+    policy = str(value or "none").strip().lower()
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(
+            f"Unsupported duplicate_policy '{value}'. Choose from {'/'.join(DUPLICATE_POLICIES)}."
+        )
+    return policy
+
+
+class DuplicateParams(optuna.exceptions.TrialPruned):
+    """Pruned because the params were already evaluated; ``resample`` frees the budget slot."""
+
+    def __init__(self, message: str, resample: bool = False) -> None:
+        super().__init__(message)
+        self.resample = resample
+
+
+class DuplicateIndex:
+    """Param-hash index of completed trials, fed by local completions and incremental reads of the study."""
+
+    def __init__(self, fidelity_param: Optional[str] = None) -> None:
+        self.fidelity_param = fidelity_param
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._indexed: Set[int] = set()
+        self._feed = TrialFeed()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Each process builds its own index from the study.
+        return {"fidelity_param": self.fidelity_param}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_state()
+
+    def add(self, key: str, number: int, value: float, user_attrs: Dict[str, Any]) -> None:
+        """Index a completed trial; ``user_attrs`` are the objective's own attrs, reused for duplicates."""
+        with self._lock:
+            if number in self._indexed:
+                return
+            self._indexed.add(number)
+            entry = {"number": number, "value": float(value), "user_attrs": user_attrs, "hits": 0}
+            self._entries.setdefault(key, entry)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry["hits"] += 1
+        return entry
+
+    def sync(self, study: optuna.Study) -> None:
+        with self._lock:
+            # Only trials started or finished since the last sync are read.
+            trials = self._feed.read(study)
+        for t in trials:
+            if t.state == TrialState.COMPLETE and t.number not in self._indexed:
+                params = fidelity_params(t.params, t.user_attrs, self.fidelity_param)
+                self.add(canonical_params_hash(params), t.number, t.value, result_attrs(t.user_attrs))
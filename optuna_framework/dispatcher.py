@@ -0,0 +1,189 @@
+import logging
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import optuna
+from optuna.trial import TrialState
+
+from optuna_framework.attrs import register_attrs
+from optuna_framework.budget import SharedTrialBudget
+from optuna_framework.buffered import BufferedTrial
+from optuna_framework.deadline import study_deadline
+from optuna_framework.execution import _close_worker, _open_worker, _run_trial, _tell
+from optuna_framework.logs import LogSink, log
+from optuna_framework.search_space import CompiledSearchSpace
+from optuna_framework.timing import PhaseTiming
+
+register_attrs("dispatch_error")
+
+
+def _dispatch_worker_loop(
+    task_queue: Any,
+    result_queue: Any,
+    claimed: Any,
+    study_name: str,
+    objective: Callable[[optuna.trial.Trial], float],
+    trial_adapter_path: Optional[str],
+    worker_adapter_path: Optional[str],
+    meta: Dict[str, Any],
+    project: Dict[str, Any],
+    worker_id: int,
+    startup: Optional[Any] = None,
+    timing: Optional[PhaseTiming] = None,
+    log_sink: Optional[LogSink] = None,
+) -> None:
+    if log_sink is not None:
+        log_sink.attach()
+    if timing is not None:
+        timing.activate()
+    adapter, worker_adapter = _open_worker(
+        study_name, trial_adapter_path, worker_adapter_path, meta, project, worker_id, startup, objective
+    )
+
+    def finish(trial: Any, state: TrialState, value: Optional[float]) -> None:
+        result_queue.put(("end", worker_id, trial.number, state.name, value, dict(trial.user_attrs)))
+
+    claimed[worker_id - 1] = -1
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        number, params, user_attrs = task
+        claimed[worker_id - 1] = number
+        result_queue.put(("start", worker_id, number))
+        # Params were sampled by the coordinator; the worker never touches storage.
+        trial = optuna.trial.FixedTrial(params, number=number)
+        for key, value in user_attrs.items():
+            trial.set_user_attr(key, value)
+        _run_trial(objective, trial, finish, adapter, study_name, worker_id)
+        claimed[worker_id - 1] = -1
+
+    _close_worker(study_name, objective, worker_adapter, worker_id)
+    if timing is not None:
+        timing.dump()
+
+
+def _fail_trial(study: optuna.Study, trial: optuna.trial.Trial, budget: SharedTrialBudget, reason: str) -> None:
+    try:
+        trial.set_user_attr("dispatch_error", reason)
+        study.tell(trial, state=TrialState.FAIL)
+    except Exception as exc:
+        log(f"[DISPATCH] error failing trial {trial.number}: {exc}", logging.WARNING, trial_number=trial.number)
+    budget.settle(TrialState.FAIL)
+
+
+def dispatch_trials(
+    study: optuna.Study,
+    search_space: CompiledSearchSpace,
+    budget: SharedTrialBudget,
+    task_queue: Any,
+    result_queue: Any,
+    claimed: Any,
+    procs: List[Any],
+    lookahead: int,
+    timeout_sec: Optional[int],
+    alpha: Optional[float] = None,
+) -> None:
+    """Ask trials in the coordinator, stream params to workers and tell their results."""
+    pid = os.getpid()
+    workers = {worker_id: p for worker_id, p in enumerate(procs, start=1)}
+    max_pending = len(workers) + max(0, int(lookahead))
+    pending: Dict[int, optuna.trial.Trial] = {}
+    running: Dict[int, Tuple[int, float]] = {}
+    exited: Set[int] = set()
+    asking = True
+    deadline = study_deadline(study, timeout_sec, alpha)
+
+    while True:
+        if asking and deadline.expired():
+            log(f"[DISPATCH pid={pid}] timeout reached, waiting for running trials")
+            asking = False
+        if asking and not deadline.admits():
+            log(f"[DISPATCH pid={pid}] {deadline.describe()}, waiting for running trials")
+            asking = False
+        while asking and len(pending) < max_pending:
+            if getattr(study.sampler, "exhausted", False) or not budget.claim():
+                if budget.failing:
+                    log(f"[DISPATCH pid={pid}] {budget.exhausted_reason()}, waiting for running trials", logging.WARNING)
+                asking = False
+                break
+            try:
+                trial = study.ask(search_space.distributions)
+            except Exception as exc:
+                budget.release()
+                log(f"[DISPATCH pid={pid}] error asking for trial: {exc}", logging.WARNING)
+                asking = False
+                break
+            if not budget.confirm(study, trial):
+                asking = False
+                break
+            pending[trial.number] = trial
+            task_queue.put((trial.number, dict(trial.params), deadline.budget_attrs()))
+        if not pending:
+            break
+
+        try:
+            message = result_queue.get(timeout=1.0)
+        except queue.Empty:
+            for worker_id, p in workers.items():
+                if p.is_alive() or worker_id in exited:
+                    continue
+                exited.add(worker_id)
+                running.pop(worker_id, None)
+                number = claimed[worker_id - 1]
+                if number >= 0:
+                    lost = [number] if number in pending else []
+                elif number == -2:
+                    lost = []
+                else:
+                    # Idle, or killed between taking a task and recording it; a lost task cannot be told apart
+                    # from those still queued, so every trial no worker has started is failed.
+                    started = {n for n, _ in running.values()} | {claimed[w - 1] for w in workers}
+                    lost = [n for n in pending if n not in started]
+                for number in lost:
+                    log(
+                        f"[DISPATCH pid={pid}] worker {worker_id} exited during trial {number}",
+                        logging.WARNING,
+                        worker_id=worker_id,
+                        trial_number=number,
+                    )
+                    _fail_trial(study, pending.pop(number), budget, f"worker {worker_id} exited")
+            if not any(p.is_alive() for p in workers.values()):
+                log(f"[DISPATCH pid={pid}] all workers exited, failing {len(pending)} trial(s)", logging.WARNING)
+                for trial in pending.values():
+                    _fail_trial(study, trial, budget, "no live workers")
+                pending.clear()
+                break
+            continue
+
+        if message[0] == "start":
+            _, worker_id, number = message
+            running[worker_id] = (number, time.time())
+            continue
+        _, worker_id, number, state_name, value, user_attrs = message
+        started = running.pop(worker_id, None)
+        if started is not None:
+            deadline.record(time.time() - started[1])
+        trial = pending.pop(number, None)
+        if trial is None:
+            continue
+        state = TrialState[state_name]
+        try:
+            # Worker attrs arrive together and are written in one transaction on tell.
+            buffered = BufferedTrial(trial)
+            for key, val in user_attrs.items():
+                buffered.set_user_attr(key, val)
+            _tell(study, buffered, state, value)
+        except Exception as exc:
+            log(f"[DISPATCH pid={pid}] error telling trial {number}: {exc}", logging.WARNING, trial_number=number)
+            state = TrialState.FAIL
+            try:
+                study.tell(trial, state=TrialState.FAIL)
+            except Exception:
+                pass
+        budget.settle(state)
+
+    for _ in workers:
+        task_queue.put(None)
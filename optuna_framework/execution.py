@@ -0,0 +1,439 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
+import warnings
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import optuna
+from optuna.trial import TrialState
+
+from optuna_framework.adapters.trial import TrialAdapter
+from optuna_framework.adapters.worker import WorkerAdapter
+from optuna_framework.attrs import register_attrs
+from optuna_framework.buffered import BufferedTrial, buffer_trial
+from optuna_framework.context import TrialContext
+from optuna_framework.imports import load_object
+from optuna_framework.logs import log
+from optuna_framework.recovery import heartbeat
+from optuna_framework.recycle import peak_rss_mb
+from optuna_framework.timing import annotate_phases, close_phases, phase, record_phase
+
+register_attrs("trial_adapter_error")
+
+
+def _load_run_adapter(
+    adapter_path: Optional[str],
+    adapter_cls: Any,
+    meta: Dict[str, Any],
+    project: Dict[str, Any],
+    role: str,
+) -> Optional[Any]:
+    if not adapter_path:
+        return None
+    loaded = load_object(adapter_path)
+    adapter = loaded(meta, project)
+    if not isinstance(adapter, adapter_cls):
+        raise TypeError(f"{role} adapter must inherit from {adapter_cls.__name__}.")
+    return adapter
+
+
+def _build_context(
+    role: str,
+    study_name: str,
+    trial: Optional[optuna.trial.Trial] = None,
+    value: Optional[float] = None,
+    state: Optional[str] = None,
+    error: Optional[BaseException] = None,
+    phase: Optional[str] = None,
+    worker_id: Optional[int] = None,
+) -> TrialContext:
+    return TrialContext(role, study_name, trial, value, state, error, phase, worker_id)
+
+
+def _tell(study: optuna.Study, trial: optuna.trial.Trial, state: TrialState, value: Optional[float]) -> None:
+    if isinstance(trial, BufferedTrial):
+        trial.flush()
+        trial = trial.trial
+    try:
+        if state == TrialState.COMPLETE:
+            study.tell(trial, value)
+        else:
+            study.tell(trial, state=state)
+    except RuntimeError:
+        # GridSampler.after_trial calls study.stop() once the grid is exhausted, which is
+        # rejected outside study.optimize; the trial has already been recorded by then.
+        if not study._storage.get_trial(trial._trial_id).state.is_finished():
+            raise
+
+
+def _ignore_heartbeat_warning() -> None:
+    # Workers record heartbeats themselves (recovery.heartbeat) instead of going through Study.optimize.
+    warnings.filterwarnings("ignore", "Heartbeat of storage is supposed to be used with Study.optimize")
+
+
+def _open_worker(
+    study_name: str,
+    trial_adapter_path: Optional[str],
+    worker_adapter_path: Optional[str],
+    meta: Dict[str, Any],
+    project: Dict[str, Any],
+    worker_id: int,
+    startup: Optional[Any] = None,
+    objective: Optional[Any] = None,
+    own_process: bool = True,
+) -> Tuple[Optional[TrialAdapter], Optional[WorkerAdapter]]:
+    if own_process:
+        # Process-wide settings; in-process executors scope the filter themselves and leave the environment alone.
+        os.environ["OPTUNA_WORKER_ROLE"] = "worker"
+        _ignore_heartbeat_warning()
+    pid = os.getpid()
+    log(
+        f"[WORKER {worker_id}] started pid={pid} cuda_visible={os.environ.get('CUDA_VISIBLE_DEVICES','')}",
+        worker_id=worker_id,
+        phase="worker_start",
+    )
+    adapter = _load_run_adapter(trial_adapter_path, TrialAdapter, meta, project, "Trial")
+    worker_adapter = _load_run_adapter(worker_adapter_path, WorkerAdapter, meta, project, "Worker")
+    if worker_adapter is not None:
+        try:
+            worker_adapter.on_worker_start(
+                _build_context("worker", study_name, phase="start", worker_id=worker_id)
+            )
+        except Exception as exc:
+            log(f"[WORKER {worker_id} pid={pid}] worker adapter start error: {exc}", logging.WARNING, worker_id=worker_id)
+    if hasattr(objective, "_lazy_init"):
+        # Importing and setting up the objective adapter is part of startup, and is not left to the first trial.
+        try:
+            objective._lazy_init()
+        except Exception as exc:
+            # Left for the first trial to raise again and fail as before.
+            log(f"[WORKER {worker_id} pid={pid}] objective init error: {exc}", logging.WARNING, worker_id=worker_id)
+    if startup is not None:
+        latency = startup.mark_ready(worker_id)
+        log(f"[WORKER {worker_id} pid={pid}] ready startup={latency:.2f}s", worker_id=worker_id, duration_sec=latency)
+    return adapter, worker_adapter
+
+
+def _close_worker(
+    study_name: str,
+    objective: Callable[[optuna.trial.Trial], float],
+    worker_adapter: Optional[WorkerAdapter],
+    worker_id: int,
+) -> None:
+    pid = os.getpid()
+    if worker_adapter is not None:
+        try:
+            worker_adapter.on_worker_end(
+                _build_context("worker", study_name, phase="end", worker_id=worker_id)
+            )
+        except Exception as exc:
+            log(f"[WORKER {worker_id} pid={pid}] worker adapter end error: {exc}", logging.WARNING, worker_id=worker_id)
+
+    if hasattr(objective, "close"):
+        try:
+            objective.close()
+        except Exception as exc:
+            log(f"[WORKER {worker_id} pid={pid}] error during objective teardown: {exc}", logging.WARNING, worker_id=worker_id)
+
+    peak = peak_rss_mb()
+    if peak is not None:
+        log(f"[WORKER {worker_id} pid={pid}] exiting peak_rss={peak:.0f}MB", worker_id=worker_id, phase="worker_end")
+
+
+def _heartbeat(trial: Any) -> Any:
+    """Heartbeat thread for trials backed by a heartbeat-enabled storage; FixedTrial gets a no-op."""
+    storage = getattr(trial, "storage", None)
+    if storage is None:
+        return contextlib.nullcontext()
+    return heartbeat(storage, trial._trial_id)
+
+
+def _trial_start_hook(
+    adapter: Optional[TrialAdapter], trial: Any, study_name: str, worker_id: int
+) -> Optional[BaseException]:
+    if adapter is None:
+        return None
+    try:
+        with phase(trial, "hooks"):
+            adapter.on_trial_start(
+                _build_context("trial", study_name, trial=trial, phase="start", worker_id=worker_id)
+            )
+    except Exception as exc:
+        log(
+            f"[WORKER {worker_id} pid={os.getpid()}] trial adapter start failed on trial {trial.number}: {exc}",
+            logging.WARNING,
+            worker_id=worker_id,
+            trial_number=trial.number,
+        )
+        try:
+            trial.set_user_attr("trial_adapter_error", str(exc))
+        except Exception:
+            pass
+        return exc
+    return None
+
+
+def _trial_end_hook(
+    adapter: Optional[TrialAdapter],
+    trial: Any,
+    study_name: str,
+    worker_id: int,
+    value: Optional[float],
+    state_name: Optional[str],
+    error: Optional[BaseException],
+    where: str,
+) -> None:
+    if adapter is not None:
+        try:
+            with phase(trial, "hooks"):
+                adapter.on_trial_end(
+                    _build_context(
+                        "trial",
+                        study_name,
+                        trial=trial,
+                        value=value,
+                        state=state_name,
+                        error=error,
+                        phase="end",
+                        worker_id=worker_id,
+                    )
+                )
+        except Exception as exc:
+            log(
+                f"[WORKER {worker_id} pid={os.getpid()}] trial adapter end error {where}: {exc}",
+                logging.WARNING,
+                worker_id=worker_id,
+                trial_number=trial.number,
+            )
+    # The end hook is the last step of every trial.
+    close_phases(trial)
+
+
+def _finish(
+    finish: Callable[[Any, TrialState, Optional[float]], None], trial: Any, state: TrialState, value: Optional[float]
+) -> None:
+    annotate_phases(trial)
+    with phase(trial, "tell"):
+        finish(trial, state, value)
+
+
+async def _afinish(
+    finish: Callable[[Any, TrialState, Optional[float]], Awaitable[None]],
+    trial: Any,
+    state: TrialState,
+    value: Optional[float],
+) -> None:
+    annotate_phases(trial)
+    with phase(trial, "tell"):
+        await finish(trial, state, value)
+
+
+def _failed_state(exc: BaseException, trial: Any, worker_id: int) -> TrialState:
+    pid = os.getpid()
+    if isinstance(exc, optuna.exceptions.TrialPruned):
+        log(f"[WORKER {worker_id} pid={pid}] trial {trial.number} pruned", worker_id=worker_id, trial_number=trial.number)
+        return TrialState.PRUNED
+    log(
+        f"[WORKER {worker_id} pid={pid}] trial {trial.number} failed: {exc}",
+        logging.WARNING,
+        worker_id=worker_id,
+        trial_number=trial.number,
+    )
+    return TrialState.FAIL
+
+
+def _run_trial(
+    objective: Callable[[optuna.trial.Trial], float],
+    trial: Any,
+    finish: Callable[[Any, TrialState, Optional[float]], None],
+    adapter: Optional[TrialAdapter],
+    study_name: str,
+    worker_id: int,
+) -> Tuple[TrialState, Optional[BaseException]]:
+    """Run one trial with its adapter hooks; ``finish`` records the outcome."""
+    with _heartbeat(trial):
+        error = _trial_start_hook(adapter, trial, study_name, worker_id)
+        if error is not None:
+            _finish(finish, trial, TrialState.FAIL, None)
+            _trial_end_hook(
+                adapter, trial, study_name, worker_id, None, TrialState.FAIL.name, error, "after start failure"
+            )
+            return TrialState.FAIL, error
+
+        value: Optional[float] = None
+        state = TrialState.FAIL
+        state_name = None
+        try:
+            value = objective(trial)
+            _finish(finish, trial, TrialState.COMPLETE, value)
+            state = TrialState.COMPLETE
+            state_name = state.name
+        except Exception as exc:
+            error = exc
+            state = _failed_state(exc, trial, worker_id)
+            state_name = state.name
+            _finish(finish, trial, state, None)
+        finally:
+            _trial_end_hook(
+                adapter, trial, study_name, worker_id, value, state_name, error, f"on trial {trial.number}"
+            )
+        return state, error
+
+
+def _ask(
+    study: optuna.Study,
+    scheduler: Optional[Any] = None,
+    buffer_reports: Optional[int] = None,
+    lock: Optional[Any] = None,
+) -> Any:
+    """Ask the next trial, through the fidelity scheduler, ask lock and write buffer when configured."""
+    t0 = time.perf_counter()
+    if scheduler is not None:
+        trial = scheduler.ask(study)
+    elif lock is not None:
+        with lock.hold():
+            trial = study.ask()
+    else:
+        trial = study.ask()
+    record_phase(trial, "ask", time.perf_counter() - t0)
+    return buffer_trial(trial, buffer_reports)
+
+
+def _run_batch(
+    objective: Any,
+    trials: List[Any],
+    finish: Callable[[Any, TrialState, Optional[float]], None],
+    adapter: Optional[TrialAdapter],
+    study_name: str,
+    worker_id: int,
+) -> List[Tuple[TrialState, Optional[BaseException]]]:
+    """Batched ``_run_trial``: hooks and ``finish`` per trial, one ``objective.call_batch`` for all."""
+    with contextlib.ExitStack() as heartbeats:
+        for trial in trials:
+            heartbeats.enter_context(_heartbeat(trial))
+        return _run_batch_trials(objective, trials, finish, adapter, study_name, worker_id)
+
+
+def _run_batch_trials(
+    objective: Any,
+    trials: List[Any],
+    finish: Callable[[Any, TrialState, Optional[float]], None],
+    adapter: Optional[TrialAdapter],
+    study_name: str,
+    worker_id: int,
+) -> List[Tuple[TrialState, Optional[BaseException]]]:
+    outcomes: Dict[int, Tuple[TrialState, Optional[BaseException]]] = {}
+    runnable = []
+    for trial in trials:
+        error = _trial_start_hook(adapter, trial, study_name, worker_id)
+        if error is None:
+            runnable.append(trial)
+            continue
+        _finish(finish, trial, TrialState.FAIL, None)
+        _trial_end_hook(
+            adapter, trial, study_name, worker_id, None, TrialState.FAIL.name, error, "after start failure"
+        )
+        outcomes[trial.number] = (TrialState.FAIL, error)
+
+    if hasattr(objective, "call_batch"):
+        results = objective.call_batch(runnable) if runnable else []
+    else:
+        results = []
+        for trial in runnable:
+            try:
+                results.append(objective(trial))
+            except Exception as exc:
+                results.append(exc)
+
+    for trial, result in zip(runnable, results):
+        value: Optional[float] = None
+        state = TrialState.FAIL
+        state_name = None
+        error = None
+        try:
+            if isinstance(result, BaseException):
+                raise result
+            value = result
+            _finish(finish, trial, TrialState.COMPLETE, value)
+            state = TrialState.COMPLETE
+            state_name = state.name
+        except Exception as exc:
+            error = exc
+            state = _failed_state(exc, trial, worker_id)
+            state_name = state.name
+            _finish(finish, trial, state, None)
+        finally:
+            _trial_end_hook(
+                adapter, trial, study_name, worker_id, value, state_name, error, f"on trial {trial.number}"
+            )
+        outcomes[trial.number] = (state, error)
+    return [outcomes[trial.number] for trial in trials]
+
+
+def _fill_batch(
+    study: optuna.Study,
+    budget: Any,
+    trials: List[Any],
+    batch_size: int,
+    ask: Optional[Callable[[optuna.Study], Any]] = None,
+) -> List[Any]:
+    """Ask more trials up to ``batch_size`` while the budget and the grid allow."""
+    while len(trials) < batch_size and budget.claim():
+        if getattr(study.sampler, "exhausted", False):
+            budget.release()
+            break
+        try:
+            trial = ask(study) if ask is not None else study.ask()
+        except Exception as exc:
+            budget.release()
+            log(f"[WORKER pid={os.getpid()}] error asking for batch trial: {exc}", logging.WARNING)
+            break
+        if not budget.confirm(study, trial):
+            break
+        trials.append(trial)
+    return trials
+
+
+async def _arun_trial(
+    objective: Any,
+    trial: Any,
+    finish: Callable[[Any, TrialState, Optional[float]], Awaitable[None]],
+    adapter: Optional[TrialAdapter],
+    study_name: str,
+    worker_id: int,
+) -> Tuple[TrialState, Optional[BaseException]]:
+    """Async twin of ``_run_trial``; blocking hooks run in the loop's thread pool."""
+    with _heartbeat(trial):
+        error = await asyncio.to_thread(_trial_start_hook, adapter, trial, study_name, worker_id)
+        if error is not None:
+            await _afinish(finish, trial, TrialState.FAIL, None)
+            await asyncio.to_thread(
+                _trial_end_hook,
+                adapter, trial, study_name, worker_id, None, TrialState.FAIL.name, error, "after start failure",
+            )
+            return TrialState.FAIL, error
+
+        value: Optional[float] = None
+        state = TrialState.FAIL
+        state_name = None
+        try:
+            if hasattr(objective, "acall"):
+                value = await objective.acall(trial)
+            else:
+                value = await asyncio.to_thread(objective, trial)
+            await _afinish(finish, trial, TrialState.COMPLETE, value)
+            state = TrialState.COMPLETE
+            state_name = state.name
+        except Exception as exc:
+            error = exc
+            state = _failed_state(exc, trial, worker_id)
+            state_name = state.name
+            await _afinish(finish, trial, state, None)
+        finally:
+            await asyncio.to_thread(
+                _trial_end_hook,
+                adapter, trial, study_name, worker_id, value, state_name, error, f"on trial {trial.number}",
+            )
+        return state, error
@@ -0,0 +1,201 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import optuna
+from optuna.trial import TrialState
+
+from optuna_framework.adapters.trial import TrialAdapter
+from optuna_framework.deadline import StudyDeadline, study_deadline
+from optuna_framework.logs import log
+from optuna_framework.timing import PhaseTiming
+from optuna_framework.execution import (
+    _arun_trial,
+    _ask,
+    _close_worker,
+    _fill_batch,
+    _ignore_heartbeat_warning,
+    _open_worker,
+    _run_batch,
+    _run_trial,
+    _tell,
+)
+
+EXECUTORS = ("process", "thread", "async")
+
+_EXECUTOR_ALIASES = {"processes": "process", "threads": "thread", "asyncio": "async"}
+
+# Blocking storage calls and sync hooks of the async executor share this many threads at most.
+_MAX_IO_THREADS = 32
+
+
+def resolve_executor(value: Any) -> str:
+    executor = str(value or "process").strip().lower()
+    executor = _EXECUTOR_ALIASES.get(executor, executor)
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unsupported executor '{value}'. Choose from {'/'.join(EXECUTORS)}.")
+    return executor
+
+
+def _next_trial(
+    study: optuna.Study,
+    budget: Any,
+    deadline: StudyDeadline,
+    slot: int,
+    ask: Callable[[optuna.Study], Any] = _ask,
+) -> Optional[optuna.trial.Trial]:
+    pid = os.getpid()
+    if deadline.expired():
+        log(f"[WORKER {slot} pid={pid}] timeout reached, exiting", worker_id=slot)
+        return None
+    if not deadline.admits():
+        log(f"[WORKER {slot} pid={pid}] {deadline.describe()}, exiting", worker_id=slot)
+        return None
+    if not budget.claim():
+        log(f"[WORKER {slot} pid={pid}] {budget.exhausted_reason()}, exiting", worker_id=slot)
+        return None
+    if getattr(study.sampler, "exhausted", False):
+        budget.release()
+        log(f"[WORKER {slot} pid={pid}] grid exhausted, exiting", worker_id=slot)
+        return None
+    try:
+        trial = ask(study)
+    except Exception as exc:
+        budget.release()
+        log(f"[WORKER {slot} pid={pid}] error asking for trial: {exc}", logging.WARNING, worker_id=slot)
+        return None
+    if not budget.confirm(study, trial):
+        log(f"[WORKER {slot} pid={pid}] trial {trial.number} is over budget, exiting", worker_id=slot)
+        return None
+    deadline.annotate([trial])
+    return trial
+
+
+def _settle(budget: Any, state: TrialState, error: Optional[BaseException]) -> None:
+    if getattr(error, "resample", False):
+        budget.release()
+    else:
+        budget.settle(state)
+
+
+def _thread_slot(
+    study: optuna.Study,
+    objective: Callable[[optuna.trial.Trial], float],
+    budget: Any,
+    deadline: StudyDeadline,
+    adapter: Optional[TrialAdapter],
+    slot: int,
+    batch_size: int = 1,
+    ask: Callable[[optuna.Study], Any] = _ask,
+) -> None:
+    finish = functools.partial(_tell, study)
+    while True:
+        trial = _next_trial(study, budget, deadline, slot, ask)
+        if trial is None:
+            return
+        t_trial = time.time()
+        if batch_size > 1:
+            trials = _fill_batch(study, budget, [trial], batch_size, ask)
+            deadline.annotate(trials[1:])
+            for state, error in _run_batch(objective, trials, finish, adapter, study.study_name, slot):
+                _settle(budget, state, error)
+        else:
+            state, error = _run_trial(objective, trial, finish, adapter, study.study_name, slot)
+            _settle(budget, state, error)
+        deadline.record(time.time() - t_trial)
+
+
+async def _async_slots(
+    study: optuna.Study,
+    objective: Any,
+    budget: Any,
+    concurrency: int,
+    deadline: StudyDeadline,
+    adapter: Optional[TrialAdapter],
+    ask: Callable[[optuna.Study], Any] = _ask,
+) -> None:
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=min(concurrency, _MAX_IO_THREADS), thread_name_prefix="optuna-io")
+    )
+
+    async def finish(trial: Any, state: TrialState, value: Optional[float]) -> None:
+        await asyncio.to_thread(_tell, study, trial, state, value)
+
+    async def slot(slot_id: int) -> None:
+        while True:
+            trial = await asyncio.to_thread(_next_trial, study, budget, deadline, slot_id, ask)
+            if trial is None:
+                return
+            t_trial = time.time()
+            state, error = await _arun_trial(objective, trial, finish, adapter, study.study_name, slot_id)
+            _settle(budget, state, error)
+            deadline.record(time.time() - t_trial)
+
+    await asyncio.gather(*(slot(slot_id) for slot_id in range(1, concurrency + 1)))
+
+
+def run_in_process(
+    executor: str,
+    study: optuna.Study,
+    objective: Callable[[optuna.trial.Trial], float],
+    budget: Any,
+    concurrency: int,
+    timeout_sec: Optional[int],
+    trial_adapter_path: Optional[str],
+    worker_adapter_path: Optional[str],
+    meta: Dict[str, Any],
+    project: Dict[str, Any],
+    batch_size: int = 1,
+    ask: Callable[[optuna.Study], Any] = _ask,
+    alpha: Optional[float] = None,
+    timing: Optional[PhaseTiming] = None,
+) -> None:
+    """Run trials concurrently inside the parent on threads or an asyncio loop.
+
+    The parent study, storage engine, objective and adapters are shared by every slot, so
+    ``ObjectiveAdapter.execute`` must be safe to call concurrently.
+    """
+    study_name = study.study_name
+    if timing is not None:
+        timing.activate()
+    if hasattr(objective, "set_trial_env"):
+        objective.set_trial_env = False
+    with warnings.catch_warnings():
+        # The slots run in the coordinator's process: the filter is undone when the run ends.
+        _ignore_heartbeat_warning()
+        # The objective is set up once here, before the slots start, instead of racing on the first trial.
+        adapter, worker_adapter = _open_worker(
+            study_name,
+            trial_adapter_path,
+            worker_adapter_path,
+            meta,
+            project,
+            1,
+            objective=objective,
+            own_process=False,
+        )
+        deadline = study_deadline(study, timeout_sec, alpha)
+        log(f"[OPTUNA] executor={executor} concurrency={concurrency}")
+        try:
+            if executor == "thread":
+                with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="optuna-trial") as pool:
+                    futures = [
+                        pool.submit(
+                            _thread_slot, study, objective, budget, deadline, adapter, slot, batch_size, ask
+                        )
+                        for slot in range(1, concurrency + 1)
+                    ]
+                    for future in futures:
+                        future.result()
+            else:
+                asyncio.run(_async_slots(study, objective, budget, concurrency, deadline, adapter, ask))
+        finally:
+            _close_worker(study_name, objective, worker_adapter, 1)
+        if timing is not None:
+            timing.dump()
@@ -0,0 +1,43 @@
+from typing import List, Optional, Set
+
+import optuna
+from optuna.trial import FrozenTrial
+
+
+class TrialFeed:
+    """Incremental reader of a study's trials for per-ask bookkeeping.
+
+    The first read loads the study once. Later reads fetch only the trials numbered past the last one
+    seen and those that were still unfinished, so a read costs the new and in-flight trials instead of
+    the whole study.
+    """
+
+    def __init__(self) -> None:
+        self._next: Optional[int] = None
+        self._open: Set[int] = set()
+
+    def read(self, study: optuna.Study) -> List[FrozenTrial]:
+        """Trials seen for the first time or finished since the last read."""
+        if self._next is None:
+            trials = study.get_trials(deepcopy=False)
+            self._next = trials[-1].number + 1 if trials else 0
+            self._open = {t._trial_id for t in trials if not t.state.is_finished()}
+            return trials
+        storage = study._storage
+        changed: List[FrozenTrial] = []
+        for trial_id in list(self._open):
+            trial = storage.get_trial(trial_id)
+            if trial.state.is_finished():
+                self._open.discard(trial_id)
+                changed.append(trial)
+        while True:
+            try:
+                trial_id = storage.get_trial_id_from_study_id_trial_number(study._study_id, self._next)
+            except KeyError:
+                break
+            trial = storage.get_trial(trial_id)
+            self._next += 1
+            if not trial.state.is_finished():
+                self._open.add(trial_id)
+            changed.append(trial)
+        return changed
@@ -0,0 +1,143 @@
+import bisect
+import heapq
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import optuna
+from optuna.study import StudyDirection
+from optuna.trial import TrialState
+
+from optuna_framework.attrs import register_attrs
+from optuna_framework.feed import TrialFeed
+
+FIDELITY_ATTRS = ("fidelity_rung", "fidelity_budget", "fidelity_parent")
+
+register_attrs(*FIDELITY_ATTRS)
+
+
+@dataclass(frozen=True)
+class FidelitySpec:
+    """Fidelity knob (epochs, data fraction...) scheduled over rungs ``min * eta**k`` up to ``max``."""
+
+    name: str
+    min_resource: float
+    max_resource: float
+    eta: float = 3
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any]) -> Optional["FidelitySpec"]:
+        cfg = opt_cfg.get("fidelity", None)
+        if not cfg:
+            return None
+        if not isinstance(cfg, dict) or not all(key in cfg for key in ("name", "min", "max")):
+            raise ValueError("optuna.fidelity requires name, min and max.")
+        spec = cls(str(cfg["name"]), cfg["min"], cfg["max"], cfg.get("eta", 3))
+        if not 0 < float(spec.min_resource) < float(spec.max_resource):
+            raise ValueError(f"fidelity needs 0 < min < max, got min={spec.min_resource} max={spec.max_resource}")
+        if float(spec.eta) <= 1:
+            raise ValueError(f"fidelity eta must be > 1, got {spec.eta}")
+        return spec
+
+    def budgets(self) -> List[Any]:
+        integral = all(isinstance(v, int) for v in (self.min_resource, self.max_resource))
+        budgets: List[Any] = []
+        budget = float(self.min_resource)
+        while budget < float(self.max_resource) - 1e-12:
+            budgets.append(int(round(budget)) if integral else budget)
+            budget *= float(self.eta)
+        budgets.append(self.max_resource)
+        return budgets
+
+
+def fidelity_params(params: Dict[str, Any], user_attrs: Dict[str, Any], name: Optional[str]) -> Dict[str, Any]:
+    """``params`` plus the trial's fidelity budget under ``name``, when the trial has one."""
+    if not name or "fidelity_budget" not in user_attrs:
+        return params
+    return dict(params, **{name: user_attrs["fidelity_budget"]})
+
+
+class FidelityScheduler:
+    """ASHA-style scheduler; promotions live in trial user attrs, so the schedule survives restarts.
+
+    Rungs are kept per process and fed incrementally from the study, so an ask costs the trials that
+    started or finished since the last one. Every ask goes through ``lock`` (shared by all workers),
+    which makes the last read and claiming a promotion atomic.
+    """
+
+    def __init__(self, spec: FidelitySpec, lock: Any) -> None:
+        self.spec = spec
+        self.lock = lock
+        self._budgets = spec.budgets()
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._feed = TrialFeed()
+        self._sign: Optional[float] = None
+        # Per rung: every completed trial sorted best first, and a heap of those not promoted yet.
+        self._ranked: Dict[int, List[Tuple[float, int]]] = defaultdict(list)
+        self._candidates: Dict[int, List[Tuple[float, int]]] = defaultdict(list)
+        self._params: Dict[int, Dict[str, Any]] = {}
+        self._promoted: Set[int] = set()
+        self._sync_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"spec": self.spec, "lock": self.lock, "_budgets": self._budgets}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_state()
+
+    def _sync(self, study: optuna.Study) -> None:
+        with self._sync_lock:
+            if self._sign is None:
+                self._sign = -1.0 if study.direction == StudyDirection.MAXIMIZE else 1.0
+            for t in self._feed.read(study):
+                attrs = t.user_attrs
+                if "fidelity_parent" in attrs:
+                    self._promoted.add(int(attrs["fidelity_parent"]))
+                if t.state == TrialState.COMPLETE and "fidelity_rung" in attrs:
+                    key = (self._sign * t.value, t.number)
+                    rung = int(attrs["fidelity_rung"])
+                    bisect.insort(self._ranked[rung], key)
+                    heapq.heappush(self._candidates[rung], key)
+                    self._params[t.number] = t.params
+
+    def _promotion(self) -> Optional[Tuple[int, int]]:
+        for rung in range(len(self._budgets) - 2, -1, -1):
+            candidates = self._candidates[rung]
+            while candidates and candidates[0][1] in self._promoted:
+                heapq.heappop(candidates)
+            if not candidates:
+                continue
+            # The best unpromoted trial is promoted if it ranks in the rung's top 1/eta.
+            top = int(len(self._ranked[rung]) / float(self.spec.eta))
+            if bisect.bisect_left(self._ranked[rung], candidates[0]) < top:
+                return candidates[0][1], rung + 1
+        return None
+
+    def ask(self, study: optuna.Study) -> optuna.trial.Trial:
+        # Most of the reading happens here, outside the lock; the read under it only sees the last few trials.
+        self._sync(study)
+        with self.lock.hold():
+            self._sync(study)
+            with self._sync_lock:
+                promotion = self._promotion()
+                if promotion is not None:
+                    self._promoted.add(promotion[0])
+            if promotion is None:
+                trial = study.ask()
+                trial.set_user_attr("fidelity_rung", 0)
+                trial.set_user_attr("fidelity_budget", self._budgets[0])
+                return trial
+            parent, rung = promotion
+            study.enqueue_trial(
+                self._params[parent],
+                user_attrs={
+                    "fidelity_rung": rung,
+                    "fidelity_budget": self._budgets[rung],
+                    "fidelity_parent": parent,
+                },
+            )
+            return study.ask()
@@ -0,0 +1,95 @@
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import optuna
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial, TrialState
+
+from optuna_framework.search_space import normalize_value
+
+
+class ShardedGrid:
+    """Exhaustive grid addressed by index, so workers can split it without coordination."""
+
+    def __init__(self, grid_params: Dict[str, List[Any]]) -> None:
+        self.names = list(grid_params)
+        self.axes = [list(values) for values in grid_params.values()]
+        self.size = 1
+        for values in self.axes:
+            self.size *= len(values)
+
+    def point(self, index: int) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        for name, values in zip(reversed(self.names), reversed(self.axes)):
+            index, pos = divmod(index, len(values))
+            params[name] = values[pos]
+        return {name: params[name] for name in self.names}
+
+    def key(self, params: Dict[str, Any]) -> Tuple[Any, ...]:
+        # Normalized, so list-valued choices (stored back as lists) are hashable and match the grid's own values.
+        return tuple(normalize_value(params.get(name)) for name in self.names)
+
+    def shard(self, worker_id: int, n_workers: int, done: Iterable[Tuple[Any, ...]] = ()) -> Iterator[Dict[str, Any]]:
+        done = set(done)
+        for index in range(int(worker_id) - 1, self.size, max(1, int(n_workers))):
+            params = self.point(index)
+            if done and self.key(params) in done:
+                continue
+            yield params
+
+
+class GridShardSampler(optuna.samplers.BaseSampler):
+    """Assigns the next point of a worker's shard to each new trial."""
+
+    def __init__(self) -> None:
+        self._points: Iterator[Dict[str, Any]] = iter(())
+        self._next: Optional[Dict[str, Any]] = None
+        self._assigned: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def feed(self, points: Iterator[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._points = points
+            self._next = next(points, None)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._next is None
+
+    def infer_relative_search_space(self, study: optuna.Study, trial: FrozenTrial) -> Dict[str, BaseDistribution]:
+        return {}
+
+    def sample_relative(
+        self, study: optuna.Study, trial: FrozenTrial, search_space: Dict[str, BaseDistribution]
+    ) -> Dict[str, Any]:
+        return {}
+
+    def before_trial(self, study: optuna.Study, trial: FrozenTrial) -> None:
+        with self._lock:
+            if self._next is None:
+                raise RuntimeError("Grid shard exhausted.")
+            self._assigned[trial.number] = self._next
+            self._next = next(self._points, None)
+
+    def sample_independent(
+        self,
+        study: optuna.Study,
+        trial: FrozenTrial,
+        param_name: str,
+        param_distribution: BaseDistribution,
+    ) -> Any:
+        return self._assigned[trial.number][param_name]
+
+    def after_trial(
+        self,
+        study: optuna.Study,
+        trial: FrozenTrial,
+        state: TrialState,
+        values: Optional[List[float]],
+    ) -> None:
+        self._assigned.pop(trial.number, None)
+
+
+def finished_grid_keys(study: optuna.Study, grid: ShardedGrid) -> Set[Tuple[Any, ...]]:
+    trials = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED))
+    return {grid.key(t.params) for t in trials}
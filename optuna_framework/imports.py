@@ -1,12 +1,21 @@
 import importlib
-from typing import Any
+from typing import Any, Tuple
 
 
-def load_object(path: str) -> Any:
+def _split_path(path: str) -> Tuple[str, str]:
     if ":" in path:
         module_name, attr_name = path.split(":", 1)
     else:
         module_name, attr_name = path.rsplit(".", 1)
+    return module_name, attr_name
+
+
+def module_of(path: str) -> str:
+    return _split_path(path)[0]
+
+
+def load_object(path: str) -> Any:
+    module_name, attr_name = _split_path(path)
     module = importlib.import_module(module_name)
     return getattr(module, attr_name)
 
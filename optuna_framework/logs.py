@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional
+
+LOG_LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+
+_SINK: Optional["LogSink"] = None
+
+
+def log(message: str, level: int = logging.INFO, **fields: Any) -> None:
+    """Emit one record; printed as before unless structured logging is active in this process."""
+    sink = _SINK
+    if sink is None:
+        print(message, flush=True)
+        return
+    if level < sink.level:
+        return
+    record = {"ts": time.time(), "level": logging.getLevelName(level), "pid": os.getpid(), "msg": message}
+    record.update(fields)
+    sink.send(record)
+
+
+class LogSink:
+    """Write end of one process's log pipe; passed to the worker it was created for."""
+
+    def __init__(self, conn: Any, level: int = logging.INFO) -> None:
+        self.conn = conn
+        self.level = level
+        self._lock: Optional[threading.Lock] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"conn": self.conn, "level": self.level, "_lock": None}
+
+    def attach(self) -> None:
+        global _SINK
+        self._lock = threading.Lock()
+        _SINK = self
+
+    def detach(self) -> None:
+        global _SINK
+        if _SINK is self:
+            _SINK = None
+        self.close()
+
+    def send(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            try:
+                self.conn.send(record)
+            except (OSError, ValueError):
+                pass
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class LogHub:
+    """Parent-side listener: one pipe per process, drained by a single thread that batch-writes the records.
+
+    A pipe per process (instead of one shared queue) means a killed worker can never leave a
+    shared write lock held.
+    """
+
+    def __init__(self, ctx: Any, level: int = logging.INFO, path: Optional[str] = None, console: bool = True) -> None:
+        self.ctx = ctx
+        self.level = level
+        self.path = path
+        self.console = console
+        self._readers: List[Any] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[Any] = None
+
+    @classmethod
+    def from_config(cls, ctx: Any, opt_cfg: Dict[str, Any]) -> Optional["LogHub"]:
+        path = opt_cfg.get("log_file", None)
+        level_name = opt_cfg.get("log_level", None)
+        if not path and not level_name:
+            return None
+        level_name = str(level_name or "info").strip().lower()
+        if level_name not in LOG_LEVELS:
+            raise ValueError(f"Unsupported log_level '{level_name}'. Choose from {'/'.join(LOG_LEVELS)}.")
+        console = bool(opt_cfg.get("log_console", not path))
+        return cls(ctx, LOG_LEVELS[level_name], str(path) if path else None, console)
+
+    def sink(self) -> LogSink:
+        reader, writer = self.ctx.Pipe(duplex=False)
+        with self._lock:
+            self._readers.append(reader)
+        return LogSink(writer, self.level)
+
+    def start(self) -> None:
+        if self.path:
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1 << 16)
+        self._thread = threading.Thread(target=self._run, name="optuna-log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._file is not None:
+            self._file.close()
+
+    def _run(self) -> None:
+        while True:
+            stopping = self._stopping.is_set()
+            with self._lock:
+                readers = list(self._readers)
+            records: List[Dict[str, Any]] = []
+            for reader in wait(readers, timeout=0.0 if stopping else 0.2) if readers else []:
+                try:
+                    while reader.poll():
+                        records.append(reader.recv())
+                except (EOFError, OSError):
+                    with self._lock:
+                        self._readers.remove(reader)
+                    reader.close()
+            if records:
+                self._write(records)
+            elif stopping:
+                return
+            elif not readers:
+                time.sleep(0.2)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        records.sort(key=lambda record: record["ts"])
+        if self._file is not None:
+            self._file.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+            self._file.flush()
+        if self.console:
+            sys.stdout.write("".join(record["msg"] + "\n" for record in records))
+            sys.stdout.flush()
@@ -1,12 +1,26 @@
+import asyncio
+import inspect
+import logging
 import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import optuna
 
 from optuna_framework.adapters.objective import ObjectiveAdapter, TrialResult
 from optuna_framework.adapters.prune import PruneAdapter
+from optuna_framework.attrs import register_attrs
+from optuna_framework.cache import EvaluationCache, canonical_params_hash
+from optuna_framework.dedup import DuplicateIndex, DuplicateParams, resolve_duplicate_policy
+from optuna_framework.fidelity import fidelity_params
 from optuna_framework.imports import load_object
+from optuna_framework.logs import log
+from optuna_framework.search_space import CompiledSearchSpace
+from optuna_framework.shared import SharedStore, SharedView, attach_shared
+from optuna_framework.timeouts import SoftDeadline, TrialTimeout
+from optuna_framework.timing import phase, record_phase
+
+register_attrs("duplicate_of", "duplicate_hits", "cache_hit", "prune_reason", "timeout")
 
 
 class ObjectiveCallable:
@@ -17,8 +31,16 @@ class ObjectiveCallable:
         prune_adapter_path: Optional[str] = None,
         meta: Optional[Dict[str, Any]] = None,
         project: Optional[Dict[str, Any]] = None,
+        eval_cache: Optional[EvaluationCache] = None,
+        duplicate_policy: str = "none",
+        max_duplicate_resamples: int = 10,
+        fidelity_param: Optional[str] = None,
+        soft_timeout_sec: Optional[float] = None,
     ) -> None:
-        self.search_space = dict(search_space)
+        if isinstance(search_space, CompiledSearchSpace):
+            self.search_space = search_space
+        else:
+            self.search_space = CompiledSearchSpace(search_space)
         self.adapter_path = str(adapter_path) if adapter_path else None
         self.prune_adapter_path = str(prune_adapter_path) if prune_adapter_path else None
         self._prune_adapter = None
@@ -26,23 +48,39 @@ class ObjectiveCallable:
         self.project = dict(project or {})
         self._initialized = False
         self._adapter: Optional[ObjectiveAdapter] = None
+        self.eval_cache = eval_cache
+        self._cache_fingerprint: Optional[str] = None
+        self.duplicate_policy = resolve_duplicate_policy(duplicate_policy)
+        self.max_duplicate_resamples = int(max_duplicate_resamples)
+        self.fidelity_param = fidelity_param
+        self._duplicates = DuplicateIndex(fidelity_param)
+        self.soft_timeout_sec = soft_timeout_sec
+        self._consecutive_resamples = 0
+        self.shared_manifest: Dict[str, Any] = {}
+        self._shared: Optional[SharedView] = None
+        # TRIAL_ID is process-global, so executors running trials concurrently in one process turn it off.
+        self.set_trial_env = True
 
     def _lazy_init(self) -> None:
         if self._initialized:
             return
         if not self.adapter_path:
-            print(
+            log(
                 "[WARNING] Objective adapter not configured; set meta.objective_adapter or --objective-adapter.",
-                flush=True,
+                logging.WARNING,
             )
             raise RuntimeError("Objective adapter not configured.")
         adapter_cls = load_object(self.adapter_path)
         adapter = adapter_cls(self.meta, self.project)
         if not isinstance(adapter, ObjectiveAdapter):
             raise TypeError("Objective adapter must inherit from ObjectiveAdapter.")
+        self._shared = attach_shared(self.shared_manifest)
+        adapter.shared = self._shared
         adapter.worker_init()
         adapter.setup()
         self._adapter = adapter
+        if self.eval_cache is not None:
+            self._cache_fingerprint = adapter.cache_fingerprint()
 
         if self.prune_adapter_path:
             prune_cls = load_object(self.prune_adapter_path)
@@ -53,59 +91,251 @@ class ObjectiveCallable:
             self._prune_adapter = prune_adapter
         self._initialized = True
 
-    def __call__(self, trial: optuna.trial.Trial) -> float:
+    def prepare_shared(self, backend: str = "shm") -> Optional[SharedStore]:
+        if not self.adapter_path:
+            return None
+        adapter = load_object(self.adapter_path)(self.meta, self.project)
+        data = adapter.prepare_shared() if isinstance(adapter, ObjectiveAdapter) else None
+        if not data:
+            return None
+        store = SharedStore(backend)
+        try:
+            for name, obj in data.items():
+                store.publish(name, obj)
+        except Exception:
+            store.close()
+            raise
+        self.shared_manifest = store.manifest()
+        return store
+
+    def _check_duplicate(self, trial: optuna.trial.Trial, params_key: str) -> Optional[float]:
+        if hasattr(trial, "study"):
+            self._duplicates.sync(trial.study)
+        entry = self._duplicates.lookup(params_key)
+        if entry is None:
+            self._consecutive_resamples = 0
+            return None
+        trial.set_user_attr("duplicate_of", entry["number"])
+        trial.set_user_attr("duplicate_hits", entry["hits"])
+        if self.duplicate_policy == "reuse":
+            for key, val in entry["user_attrs"].items():
+                trial.set_user_attr(key, val)
+            return entry["value"]
+        reason = f"duplicate params of trial {entry['number']}"
+        if self.duplicate_policy == "resample" and self._consecutive_resamples < self.max_duplicate_resamples:
+            self._consecutive_resamples += 1
+            raise DuplicateParams(reason, resample=True)
+        raise DuplicateParams(reason)
+
+    def _begin(self, trial: optuna.trial.Trial) -> Tuple[Dict[str, Any], Optional[float], Dict[str, Any]]:
+        """Suggest and screen params; returns ``(params, early_value, keys)``."""
         self._lazy_init()
         if self._adapter is None:
             raise RuntimeError("Objective adapter not initialized.")
         t0 = time.perf_counter()
         pid = os.getpid()
-        os.environ["TRIAL_ID"] = str(trial.number)
-        print(f"[TRIAL] start number={trial.number} pid={pid}", flush=True)
-        params = self._adapter.suggest_params(trial, self.search_space)
-        errors = self._adapter.validate_trial_params(params)
+        if self.set_trial_env:
+            os.environ["TRIAL_ID"] = str(trial.number)
+        log(f"[TRIAL] start number={trial.number} pid={pid}", logging.DEBUG, trial_number=trial.number, phase="start")
+        keys: Dict[str, Any] = {"t0": t0, "params": None, "cache": None}
+        with phase(trial, "suggest"):
+            params = self._adapter.suggest_params(trial, self.search_space)
+        if self.fidelity_param:
+            # Budget assigned by the fidelity scheduler for this rung.
+            params = fidelity_params(params, trial.user_attrs, self.fidelity_param)
+        with phase(trial, "validate"):
+            errors = self._adapter.validate_trial_params(params)
         if errors:
             reason = "; ".join(errors)
             trial.set_user_attr("prune_reason", reason)
             raise optuna.exceptions.TrialPruned(reason)
 
         if self._prune_adapter is not None:
-            self._prune_adapter.prune(params, trial)
+            with phase(trial, "prune"):
+                self._prune_adapter.prune(params, trial)
 
-        try:
-            self._adapter.on_trial_start(trial, params)
-            result = self._adapter.execute(params, trial)
-            if isinstance(result, TrialResult):
-                value = float(result.value)
-                for key, val in result.user_attrs.items():
+        if self.duplicate_policy != "none":
+            keys["params"] = canonical_params_hash(
+                fidelity_params(trial.params, trial.user_attrs, self.fidelity_param)
+            )
+            value = self._check_duplicate(trial, keys["params"])
+            if value is not None:
+                elapsed = time.perf_counter() - t0
+                log(
+                    f"[TRIAL] duplicate number={trial.number} score={value:.6f} sec={elapsed:.1f} pid={pid}",
+                    trial_number=trial.number,
+                    phase="duplicate",
+                    value=value,
+                    duration_sec=elapsed,
+                )
+                return params, value, keys
+
+        if self.eval_cache is not None:
+            keys["cache"] = canonical_params_hash(params, self._cache_fingerprint)
+            cached = self.eval_cache.get(keys["cache"])
+            if cached is not None:
+                value, user_attrs = cached
+                for key, val in user_attrs.items():
                     trial.set_user_attr(key, val)
-            else:
-                value = float(result)
+                trial.set_user_attr("cache_hit", True)
+                if keys["params"] is not None:
+                    self._duplicates.add(keys["params"], trial.number, value, user_attrs)
+                elapsed = time.perf_counter() - t0
+                log(
+                    f"[TRIAL] cached number={trial.number} score={value:.6f} sec={elapsed:.1f} pid={pid}",
+                    trial_number=trial.number,
+                    phase="cached",
+                    value=value,
+                    duration_sec=elapsed,
+                )
+                return params, value, keys
+
+        return params, None, keys
+
+    def _end(self, trial: optuna.trial.Trial, params: Dict[str, Any], result: Any, keys: Dict[str, Any]) -> float:
+        user_attrs: Dict[str, Any] = {}
+        if isinstance(result, TrialResult):
+            value = float(result.value)
+            user_attrs = result.user_attrs
+            with phase(trial, "attrs"):
+                for key, val in user_attrs.items():
+                    trial.set_user_attr(key, val)
+        else:
+            value = float(result)
+        if keys["cache"] is not None:
+            self.eval_cache.put(keys["cache"], value, user_attrs)
+        if keys["params"] is not None:
+            self._duplicates.add(keys["params"], trial.number, value, user_attrs)
+        with phase(trial, "hooks"):
             self._adapter.on_trial_end(trial, value, params)
-            elapsed = time.perf_counter() - t0
-            print(
-                f"[TRIAL] done number={trial.number} score={value:.6f} sec={elapsed:.1f} pid={pid}",
-                flush=True,
-            )
-            return value
-        except optuna.exceptions.TrialPruned as exc:
-            elapsed = time.perf_counter() - t0
-            print(
+        elapsed = time.perf_counter() - keys["t0"]
+        log(
+            f"[TRIAL] done number={trial.number} score={value:.6f} sec={elapsed:.1f} pid={os.getpid()}",
+            trial_number=trial.number,
+            phase="done",
+            value=value,
+            duration_sec=elapsed,
+        )
+        return value
+
+    def _execute(self, params: Dict[str, Any], trial: optuna.trial.Trial) -> Any:
+        with phase(trial, "execute"), SoftDeadline(self.soft_timeout_sec):
+            return self._adapter.execute(params, trial)
+
+    def _log_failure(self, trial: optuna.trial.Trial, exc: BaseException, t0: float) -> None:
+        elapsed = time.perf_counter() - t0
+        pid = os.getpid()
+        if isinstance(exc, TrialTimeout):
+            trial.set_user_attr("timeout", "soft")
+        if isinstance(exc, optuna.exceptions.TrialPruned):
+            log(
                 f"[TRIAL] pruned number={trial.number} sec={elapsed:.1f} pid={pid} reason={exc}",
-                flush=True,
+                trial_number=trial.number,
+                phase="pruned",
+                duration_sec=elapsed,
             )
-            raise
-        except Exception as exc:
-            elapsed = time.perf_counter() - t0
-            print(
+        else:
+            log(
                 f"[TRIAL] error number={trial.number} sec={elapsed:.1f} pid={pid} err={exc}",
-                flush=True,
+                logging.WARNING,
+                trial_number=trial.number,
+                phase="error",
+                duration_sec=elapsed,
             )
+
+    def __call__(self, trial: optuna.trial.Trial) -> float:
+        params, value, keys = self._begin(trial)
+        if value is not None:
+            return value
+        try:
+            with phase(trial, "hooks"):
+                self._adapter.on_trial_start(trial, params)
+            result = self._execute(params, trial)
+            if inspect.isawaitable(result):
+                # ``async def execute`` outside the async executor runs on a private loop.
+                result = asyncio.run(result)
+            return self._end(trial, params, result, keys)
+        except Exception as exc:
+            self._log_failure(trial, exc, keys["t0"])
             raise
 
+    async def acall(self, trial: optuna.trial.Trial) -> float:
+        """Awaitable ``__call__`` for the async executor; sync ``execute`` runs in a thread."""
+        params, value, keys = await asyncio.to_thread(self._begin, trial)
+        if value is not None:
+            return value
+        try:
+            with phase(trial, "hooks"):
+                await asyncio.to_thread(self._adapter.on_trial_start, trial, params)
+            if inspect.iscoroutinefunction(self._adapter.execute):
+                try:
+                    with phase(trial, "execute"):
+                        result = await asyncio.wait_for(self._adapter.execute(params, trial), self.soft_timeout_sec)
+                except asyncio.TimeoutError:
+                    raise TrialTimeout() from None
+            else:
+                result = await asyncio.to_thread(self._execute, params, trial)
+            return await asyncio.to_thread(self._end, trial, params, result, keys)
+        except Exception as exc:
+            self._log_failure(trial, exc, keys["t0"])
+            raise
+
+    def call_batch(self, trials: List[optuna.trial.Trial]) -> List[Any]:
+        """Evaluate trials with one ``execute_batch`` call; failures are returned in place of values."""
+        results: List[Any] = [None] * len(trials)
+        pending: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+        for i, trial in enumerate(trials):
+            try:
+                params, value, keys = self._begin(trial)
+            except Exception as exc:
+                results[i] = exc
+                continue
+            if value is not None:
+                results[i] = value
+                continue
+            try:
+                with phase(trial, "hooks"):
+                    self._adapter.on_trial_start(trial, params)
+            except Exception as exc:
+                self._log_failure(trial, exc, keys["t0"])
+                results[i] = exc
+                continue
+            pending.append((i, params, keys))
+        if not pending:
+            return results
+
+        t0 = time.perf_counter()
+        try:
+            outputs = self._adapter.execute_batch(
+                [params for _, params, _ in pending], [trials[i] for i, _, _ in pending]
+            )
+            if len(outputs) != len(pending):
+                raise ValueError(f"execute_batch returned {len(outputs)} results for {len(pending)} trials.")
+        except Exception as exc:
+            outputs = [exc] * len(pending)
+        # One execute_batch call; each trial is charged an equal share.
+        share = (time.perf_counter() - t0) / len(pending)
+        for i, _, _ in pending:
+            record_phase(trials[i], "execute", share)
+        for (i, params, keys), output in zip(pending, outputs):
+            try:
+                if isinstance(output, BaseException):
+                    raise output
+                results[i] = self._end(trials[i], params, output, keys)
+            except Exception as exc:
+                self._log_failure(trials[i], exc, keys["t0"])
+                results[i] = exc
+        return results
+
     def close(self) -> None:
         if self._adapter is not None:
             self._adapter.teardown()
             self._adapter = None
         if self._prune_adapter is not None:
             self._prune_adapter = None
+        if self.eval_cache is not None:
+            self.eval_cache.close()
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
         self._initialized = False
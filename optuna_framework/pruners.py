@@ -0,0 +1,81 @@
+import importlib.util
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+import optuna
+
+PRUNER_OPTIONS = {
+    "none": (),
+    "median": ("n_startup_trials", "n_warmup_steps", "interval_steps", "n_min_trials"),
+    "percentile": ("percentile", "n_startup_trials", "n_warmup_steps", "interval_steps", "n_min_trials"),
+    "successive_halving": ("min_resource", "reduction_factor", "min_early_stopping_rate", "bootstrap_count"),
+    "hyperband": ("min_resource", "max_resource", "reduction_factor", "bootstrap_count"),
+    "wilcoxon": ("p_threshold", "n_startup_steps"),
+}
+
+_PRUNER_ALIASES = {"nop": "none", "sha": "successive_halving", "asha": "successive_halving"}
+
+_INT_OPTIONS = (
+    "n_startup_trials",
+    "n_warmup_steps",
+    "interval_steps",
+    "n_min_trials",
+    "reduction_factor",
+    "min_early_stopping_rate",
+    "bootstrap_count",
+    "n_startup_steps",
+)
+
+
+@dataclass
+class PrunerSpec:
+    """Picklable pruner description rebuilt in every worker."""
+
+    name: str
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def build(self) -> optuna.pruners.BasePruner:
+        if self.name == "none":
+            return optuna.pruners.NopPruner()
+        if self.name == "median":
+            return optuna.pruners.MedianPruner(**self.options)
+        if self.name == "percentile":
+            return optuna.pruners.PercentilePruner(**self.options)
+        if self.name == "successive_halving":
+            return optuna.pruners.SuccessiveHalvingPruner(**self.options)
+        if self.name == "hyperband":
+            return optuna.pruners.HyperbandPruner(**self.options)
+        if self.name == "wilcoxon":
+            return optuna.pruners.WilcoxonPruner(**self.options)
+        raise ValueError(f"Unsupported pruner '{self.name}'. Choose from {'/'.join(PRUNER_OPTIONS)}.")
+
+
+def build_pruner_spec(opt_cfg: Dict[str, Any]) -> PrunerSpec:
+    # Median matches what create_study/load_study pick when no pruner is given.
+    raw_name = str(opt_cfg.get("pruner", "median") or "none").strip().lower()
+    pruner_name = _PRUNER_ALIASES.get(raw_name, raw_name)
+    if pruner_name not in PRUNER_OPTIONS:
+        raise ValueError(f"Unsupported pruner '{raw_name}'. Choose from {'/'.join(PRUNER_OPTIONS)}.")
+    options = dict(opt_cfg.get("pruner_options", None) or {})
+    unknown = sorted(set(options) - set(PRUNER_OPTIONS[pruner_name]))
+    if unknown:
+        raise ValueError(f"Unsupported pruner_options for '{pruner_name}': {', '.join(unknown)}.")
+    for key in _INT_OPTIONS:
+        if key in options:
+            options[key] = int(options[key])
+    for key in ("min_resource", "max_resource"):
+        if key in options and str(options[key]).lower() != "auto":
+            options[key] = int(options[key])
+    if pruner_name == "percentile":
+        if "percentile" not in options:
+            raise ValueError("Percentile pruner requires optuna.pruner_options.percentile.")
+        options["percentile"] = float(options["percentile"])
+    if pruner_name == "wilcoxon" and importlib.util.find_spec("scipy") is None:
+        raise ImportError("SciPy is required for the wilcoxon pruner. Install with 'pip install scipy'.")
+    if "p_threshold" in options:
+        options["p_threshold"] = float(options["p_threshold"])
+    return PrunerSpec(pruner_name, options)
+
+
+def create_pruner(opt_cfg: Dict[str, Any]) -> optuna.pruners.BasePruner:
+    return build_pruner_spec(opt_cfg).build()
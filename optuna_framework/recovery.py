@@ -0,0 +1,286 @@
+import contextlib
+import copy
+import logging
+import os
+import threading
+import time
+import warnings
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import optuna
+from optuna.storages import BaseStorage, fail_stale_trials
+from optuna.trial import TrialState
+
+from optuna_framework.attrs import register_attrs
+from optuna_framework.logs import log
+from optuna_framework.timeouts import TrialTimeoutSpec
+
+register_attrs("worker_error", "timeout")
+
+try:
+    from optuna.storages import RetryHeartbeatStaleTrialCallback as _RetryCallback
+
+    _RETRY_CALLBACK_KWARG = "heartbeat_stale_trial_callback"
+except ImportError:  # pragma: no cover - optuna < 4.9
+    from optuna.storages import RetryFailedTrialCallback as _RetryCallback
+
+    _RETRY_CALLBACK_KWARG = "failed_trial_callback"
+
+
+def heartbeat_storage_kwargs(opt_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """RDBStorage heartbeat kwargs; stale trials are re-enqueued up to ``trial_retries`` times."""
+    interval = opt_cfg.get("heartbeat_interval", None)
+    if not interval:
+        return {}
+    kwargs: Dict[str, Any] = {"heartbeat_interval": int(interval)}
+    if opt_cfg.get("grace_period", None):
+        kwargs["grace_period"] = int(opt_cfg["grace_period"])
+    retries = int(opt_cfg.get("trial_retries", 0))
+    if retries > 0:
+        kwargs[_RETRY_CALLBACK_KWARG] = _retry_callback(retries)
+    return kwargs
+
+
+def _retry_callback(retries: int) -> Any:
+    with warnings.catch_warnings():
+        # Opted into via trial_retries.
+        warnings.simplefilter("ignore", optuna.exceptions.ExperimentalWarning)
+        return _RetryCallback(max_retry=retries)
+
+
+def heartbeat_interval(storage: BaseStorage) -> Optional[int]:
+    """Heartbeat interval of ``storage``; None when it records no heartbeats."""
+    getter = getattr(storage, "get_heartbeat_interval", None)
+    return getter() if getter is not None else None
+
+
+@contextlib.contextmanager
+def heartbeat(storage: Optional[BaseStorage], trial_id: int) -> Iterator[None]:
+    """Record heartbeats for ``trial_id`` from a background thread while the block runs."""
+    interval = heartbeat_interval(storage) if storage is not None else None
+    if interval is None:
+        yield
+        return
+    stop = threading.Event()
+
+    def beat() -> None:
+        while True:
+            storage.record_heartbeat(trial_id)
+            if stop.wait(interval):
+                return
+
+    thread = threading.Thread(target=beat, name=f"optuna-heartbeat-{trial_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def fail_stale(study: optuna.Study) -> None:
+    """Fail trials whose heartbeat went stale (and re-enqueue them); a no-op without heartbeats."""
+    if heartbeat_interval(study._storage) is None:
+        return
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", optuna.exceptions.ExperimentalWarning)
+        fail_stale_trials(study)
+
+
+class AskLock:
+    """Cross-process lock around ``study.ask``; records its holder so a crashed holder cannot block the others.
+
+    The coordinator releases the lock for workers that died holding it. A waiter that still gets no lock
+    within ``timeout`` seconds asks without it.
+    """
+
+    def __init__(self, ctx: Any, timeout: float = 30.0) -> None:
+        self.timeout = float(timeout)
+        self._lock = ctx.Lock()
+        self._holder = ctx.Value("i", 0, lock=False)
+
+    @contextlib.contextmanager
+    def hold(self) -> Iterator[None]:
+        if not self._lock.acquire(timeout=self.timeout):
+            log(
+                f"[OPTUNA pid={os.getpid()}] ask lock held by pid {self._holder.value} for over {self.timeout:g}s; "
+                "asking without it",
+                logging.WARNING,
+            )
+            yield
+            return
+        self._holder.value = os.getpid()
+        try:
+            yield
+        finally:
+            self._holder.value = 0
+            self._lock.release()
+
+    def release_for(self, pid: int) -> bool:
+        """Release the lock if the (dead) process ``pid`` holds it."""
+        if pid <= 0 or self._holder.value != pid:
+            return False
+        self._holder.value = 0
+        self._lock.release()
+        return True
+
+
+class TrialTracker:
+    """Trial ids each worker is running, shared with the coordinator through one array."""
+
+    def __init__(self, ctx: Any, n_workers: int, slots: int = 1) -> None:
+        self.slots = max(1, int(slots))
+        self._ids = ctx.Array("q", [-1] * (int(n_workers) * self.slots), lock=False)
+        self._retired = ctx.Array("b", int(n_workers), lock=False)
+        self._started = ctx.Array("d", int(n_workers), lock=False)
+
+    def track(self, worker_id: int, trial_ids: List[int]) -> None:
+        base = (worker_id - 1) * self.slots
+        for i in range(self.slots):
+            self._ids[base + i] = int(trial_ids[i]) if i < len(trial_ids) else -1
+        self._started[worker_id - 1] = time.time() if trial_ids else 0.0
+
+    def clear(self, worker_id: int) -> None:
+        self.track(worker_id, [])
+
+    def peek(self, worker_id: int) -> List[int]:
+        base = (worker_id - 1) * self.slots
+        return [self._ids[base + i] for i in range(self.slots) if self._ids[base + i] >= 0]
+
+    def running_for(self, worker_id: int) -> float:
+        """Seconds the worker's current trials have been running, 0 when idle."""
+        started = self._started[worker_id - 1]
+        return time.time() - started if started else 0.0
+
+    def take(self, worker_id: int) -> List[int]:
+        trial_ids = self.peek(worker_id)
+        self.clear(worker_id)
+        return trial_ids
+
+    def retire(self, worker_id: int) -> None:
+        """Mark a clean exit as a recycle, so the coordinator starts a replacement."""
+        self._retired[worker_id - 1] = 1
+
+    def retired(self, worker_id: int) -> bool:
+        flag = bool(self._retired[worker_id - 1])
+        self._retired[worker_id - 1] = 0
+        return flag
+
+
+def recover_trials(study: optuna.Study, trial_ids: List[int], reason: str, retries: int) -> int:
+    """Fail orphaned trials and re-enqueue their params up to ``retries`` times; returns how many were failed."""
+    storage = study._storage
+    retry = _retry_callback(retries) if retries > 0 else None
+    failed = 0
+    for trial_id in trial_ids:
+        try:
+            storage.set_trial_user_attr(trial_id, "worker_error", reason)
+            if not storage.set_trial_state_values(trial_id, state=TrialState.FAIL):
+                continue
+        except optuna.exceptions.UpdateFinishedTrialError:
+            continue
+        failed += 1
+        if retry is not None:
+            frozen = copy.copy(storage.get_trial(trial_id))
+            frozen.user_attrs = {k: v for k, v in frozen.user_attrs.items() if k != "worker_error"}
+            retry(study, frozen)
+    return failed
+
+
+def expire_trials(study: optuna.Study, trial_ids: List[int], state: TrialState) -> List[TrialState]:
+    """Finish trials killed by ``trial_timeout_sec`` as ``state`` with a ``timeout`` user attr."""
+    storage = study._storage
+    expired = []
+    for trial_id in trial_ids:
+        try:
+            storage.set_trial_user_attr(trial_id, "timeout", "hard")
+            if storage.set_trial_state_values(trial_id, state=state):
+                expired.append(state)
+        except optuna.exceptions.UpdateFinishedTrialError:
+            continue
+    return expired
+
+
+def supervise_workers(
+    procs: Dict[int, Any],
+    spawn_worker: Callable[[int], Any],
+    study: optuna.Study,
+    tracker: TrialTracker,
+    budget: Any,
+    trial_retries: int = 0,
+    max_restarts: int = 0,
+    poll_sec: float = 1.0,
+    deadline: Optional[float] = None,
+    trial_timeout: Optional[TrialTimeoutSpec] = None,
+    ask_lock: Optional[AskLock] = None,
+) -> List[Any]:
+    """Wait for workers and replace recycled ones.
+
+    Crashed workers have their trials recovered and are respawned up to ``max_restarts`` times.
+    Workers stuck in a trial past ``trial_timeout.hard_sec`` are killed and always replaced.
+    """
+    pid = os.getpid()
+    live = dict(procs)
+    finished: List[Any] = []
+    restarts = 0
+    hard_sec = trial_timeout.hard_sec if trial_timeout is not None else None
+    killed: Dict[int, List[int]] = {}
+    interval = heartbeat_interval(study._storage)
+
+    def has_work() -> bool:
+        return budget.used < budget.n_trials and (deadline is None or time.time() < deadline)
+
+    next_stale_check = time.time()
+    while live:
+        wait([p.sentinel for p in live.values()], timeout=poll_sec)
+        if interval is not None and time.time() >= next_stale_check:
+            # Covers trials whose worker vanished before it could be tracked (or on other hosts).
+            fail_stale(study)
+            next_stale_check = time.time() + interval
+        if hard_sec is not None:
+            for worker_id, p in live.items():
+                if worker_id not in killed and tracker.running_for(worker_id) > hard_sec:
+                    killed[worker_id] = tracker.peek(worker_id)
+                    log(
+                        f"[OPTUNA pid={pid}] trial id(s) {killed[worker_id]} exceeded trial_timeout_sec={hard_sec:g}; "
+                        f"killing worker {worker_id}",
+                        logging.WARNING,
+                        worker_id=worker_id,
+                    )
+                    p.kill()
+        for worker_id, p in list(live.items()):
+            if p.is_alive():
+                continue
+            p.join()
+            del live[worker_id]
+            finished.append(p)
+            if p.exitcode != 0 and ask_lock is not None and ask_lock.release_for(p.pid):
+                log(f"[OPTUNA pid={pid}] released the ask lock held by dead worker {worker_id}", logging.WARNING)
+            orphans = tracker.take(worker_id)
+            if worker_id in killed:
+                timed_out = killed.pop(worker_id)
+                for state in expire_trials(study, [t for t in orphans if t in timed_out], trial_timeout.trial_state):
+                    budget.settle(state)
+                # Trials it started after the timeout was detected are not to blame.
+                for _ in range(recover_trials(study, [t for t in orphans if t not in timed_out], "killed", trial_retries)):
+                    budget.release()
+                if has_work():
+                    live[worker_id] = spawn_worker(worker_id)
+                continue
+            if p.exitcode == 0:
+                if tracker.retired(worker_id) and has_work():
+                    log(f"[OPTUNA pid={pid}] replacing recycled worker {worker_id}", worker_id=worker_id)
+                    live[worker_id] = spawn_worker(worker_id)
+                continue
+            reason = f"worker {worker_id} exited with code {p.exitcode}"
+            recovered = recover_trials(study, orphans, reason, trial_retries)
+            for _ in range(recovered):
+                # A crash is not the trial's fault; its slot goes back to the budget.
+                budget.release()
+            log(f"[OPTUNA pid={pid}] {reason}; recovered {recovered} trial(s)", logging.WARNING, worker_id=worker_id)
+            if restarts < max_restarts and has_work():
+                restarts += 1
+                log(f"[OPTUNA pid={pid}] respawning worker {worker_id} ({restarts}/{max_restarts})", worker_id=worker_id)
+                live[worker_id] = spawn_worker(worker_id)
+    return finished
@@ -0,0 +1,62 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from optuna_framework.config import _ensure_positive_int
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where ``resource`` is unavailable."""
+    if resource is None:
+        return None
+    peak = float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    # ru_maxrss is bytes on macOS and KB elsewhere.
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB; falls back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_mb()
+
+
+@dataclass(frozen=True)
+class RecyclePolicy:
+    """Limits after which a worker finishes its current trial, exits cleanly and is replaced."""
+
+    max_trials: Optional[int] = None
+    max_rss_mb: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any]) -> Optional["RecyclePolicy"]:
+        max_trials = opt_cfg.get("max_trials_per_worker", None)
+        max_rss_mb = opt_cfg.get("max_worker_rss_mb", None)
+        if not max_trials and not max_rss_mb:
+            return None
+        if max_trials:
+            max_trials = _ensure_positive_int(max_trials, "max_trials_per_worker")
+        if max_rss_mb:
+            max_rss_mb = float(max_rss_mb)
+            if max_rss_mb <= 0:
+                raise ValueError(f"max_worker_rss_mb must be > 0, got {max_rss_mb}")
+        return cls(max_trials or None, max_rss_mb or None)
+
+    def reason(self, trials_run: int) -> Optional[str]:
+        """Why the worker should be recycled after ``trials_run`` trials, or None to keep going."""
+        if self.max_trials is not None and trials_run >= self.max_trials:
+            return f"ran {trials_run} trials (max_trials_per_worker={self.max_trials})"
+        if self.max_rss_mb is not None:
+            rss = current_rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                return f"rss={rss:.0f}MB (max_worker_rss_mb={self.max_rss_mb:.0f})"
+        return None
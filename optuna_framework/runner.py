@@ -1,274 +1,175 @@
-import multiprocessing as mp
+import functools
+import logging
 import os
-import sqlite3
 import time
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import optuna
-from optuna.storages import RDBStorage
+from optuna.storages import BaseStorage
 from optuna.trial import TrialState
 
-from optuna_framework.adapters.trial import TrialAdapter
-from optuna_framework.adapters.worker import WorkerAdapter
 from optuna_framework.adapters.optimization import OptimizationAdapter
-from optuna_framework.imports import load_object
+from optuna_framework.budget import (
+    SharedTrialBudget,
+    StorageTrialBudget,
+    budget_states,
+    count_trials,
+    max_consecutive_failures,
+    resolve_budget_mode,
+)
+from optuna_framework.buffered import write_buffer_reports
+from optuna_framework.config import _ensure_positive_int
+from optuna_framework.deadline import duration_alpha, study_deadline
+from optuna_framework.dispatcher import _dispatch_worker_loop, dispatch_trials
+from optuna_framework.executors import resolve_executor, run_in_process
+from optuna_framework.execution import (
+    _ask,
+    _build_context,
+    _close_worker,
+    _load_run_adapter,
+    _fill_batch,
+    _open_worker,
+    _run_batch,
+    _run_trial,
+    _tell,
+)
+from optuna_framework.fidelity import FidelityScheduler, FidelitySpec
+from optuna_framework.grid import finished_grid_keys
 from optuna_framework.io import save_params
-from optuna_framework.search_space import build_params_tree, normalize_value, resolve_param_value
+from optuna_framework.logs import LogHub, LogSink, log
+from optuna_framework.pruners import PrunerSpec, build_pruner_spec
+from optuna_framework.recycle import RecyclePolicy
+from optuna_framework.recovery import AskLock, TrialTracker, fail_stale, supervise_workers
+from optuna_framework.samplers import SamplerSpec, build_sampler_spec
+from optuna_framework.search_space import CompiledSearchSpace
+from optuna_framework.startup import StartupTimer, create_context
+from optuna_framework.storage import StorageProxy, StorageSpec
+from optuna_framework.timeouts import TrialTimeoutSpec
+from optuna_framework.timing import PhaseTiming
 
 
-def _ensure_sqlite_pragmas(path: Path) -> None:
-    try:
-        with sqlite3.connect(str(path)) as conn:
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
-            conn.execute("PRAGMA busy_timeout=30000;")
-    except sqlite3.Error:
-        pass
-
-
-def _ensure_positive_int(value: Union[int, str, float], name: str) -> int:
-    try:
-        result = int(value)
-    except (TypeError, ValueError):
-        raise ValueError(f"{name} must be a positive integer, got {value!r}")
-    if result < 1:
-        raise ValueError(f"{name} must be >= 1, got {result}")
-    return result
-
-
-def create_sampler(opt_cfg: Dict[str, Any], seed: int) -> Tuple[Optional[optuna.samplers.BaseSampler], int]:
-    n_trials = _ensure_positive_int(opt_cfg.get("n_trials", 100), "n_trials")
-    sampler_name = str(opt_cfg.get("sampler", "tpe")).lower()
-    sampler: Optional[optuna.samplers.BaseSampler] = None
-    if sampler_name == "grid":
-        grid_params = opt_cfg.get("grid_params", None)
-        if not isinstance(grid_params, dict) or not grid_params:
-            raise ValueError("Grid sampler requires optuna.grid_params dict with parameter lists.")
-        sampler = optuna.samplers.GridSampler(grid_params)
-        grid_size = 1
-        for values in grid_params.values():
-            grid_size *= len(values)
-        if n_trials > grid_size:
-            n_trials = grid_size
-    elif sampler_name == "random":
-        sampler = optuna.samplers.RandomSampler(seed=int(seed))
-    elif sampler_name == "tpe":
-        sampler = optuna.samplers.TPESampler(seed=int(seed))
-    elif sampler_name == "qmc":
-        sampler = optuna.samplers.QMCSampler(seed=int(seed))
-    else:
-        raise ValueError(
-            f"Unsupported sampler '{sampler_name}'. Choose from grid/random/tpe/qmc."
-        )
-    return sampler, n_trials
-
-
-def _create_storage(storage_url: str, engine_kwargs: Dict[str, Any]) -> RDBStorage:
-    return RDBStorage(url=storage_url, engine_kwargs=engine_kwargs)
-
-
-def _load_run_adapter(
-    adapter_path: Optional[str],
-    adapter_cls: Any,
-    meta: Dict[str, Any],
-    project: Dict[str, Any],
-    role: str,
-) -> Optional[Any]:
-    if not adapter_path:
-        return None
-    loaded = load_object(adapter_path)
-    adapter = loaded(meta, project)
-    if not isinstance(adapter, adapter_cls):
-        raise TypeError(f"{role} adapter must inherit from {adapter_cls.__name__}.")
-    return adapter
-
-
-def _build_context(
-    role: str,
-    study_name: str,
-    trial: Optional[optuna.trial.Trial] = None,
-    value: Optional[float] = None,
-    state: Optional[str] = None,
-    error: Optional[BaseException] = None,
-    phase: Optional[str] = None,
-    worker_id: Optional[int] = None,
-) -> Dict[str, Any]:
-    ctx: Dict[str, Any] = {"role": role, "study_name": study_name}
-    if phase:
-        ctx["phase"] = phase
-    if worker_id is not None:
-        ctx["worker_id"] = int(worker_id)
-    if trial is not None:
-        ctx["trial_number"] = int(trial.number)
-        ctx["params"] = dict(trial.params)
-        ctx["user_attrs"] = dict(trial.user_attrs)
-    if value is not None:
-        ctx["value"] = float(value)
-    if state is not None:
-        ctx["state"] = state
-    if error is not None:
-        ctx["error"] = str(error)
-    return ctx
+# Enqueued (WAITING) trials are not counted up front; the worker that runs one claims its slot.
+_CLAIMED_STATES = (TrialState.COMPLETE, TrialState.PRUNED, TrialState.FAIL, TrialState.RUNNING)
 
 
 def _worker_loop(
-    storage_url: str,
+    storage_spec: StorageSpec,
     study_name: str,
     objective: Callable[[optuna.trial.Trial], float],
     timeout_sec: Optional[int],
-    n_trials: int,
-    engine_kwargs: Dict[str, Any],
+    budget: SharedTrialBudget,
+    sampler_spec: SamplerSpec,
     trial_adapter_path: Optional[str],
     worker_adapter_path: Optional[str],
     meta: Dict[str, Any],
     project: Dict[str, Any],
     worker_id: int,
+    n_workers: int = 1,
+    startup: Optional[StartupTimer] = None,
+    batch_size: int = 1,
+    ask: Callable[[optuna.Study], Any] = _ask,
+    pruner_spec: Optional[PrunerSpec] = None,
+    tracker: Optional[TrialTracker] = None,
+    recycle: Optional[RecyclePolicy] = None,
+    alpha: Optional[float] = None,
+    timing: Optional[PhaseTiming] = None,
+    log_sink: Optional[LogSink] = None,
 ) -> None:
-    os.environ["OPTUNA_WORKER_ROLE"] = "worker"
+    if log_sink is not None:
+        log_sink.attach()
     pid = os.getpid()
-    print(
-        f"[WORKER {worker_id}] started pid={pid} cuda_visible={os.environ.get('CUDA_VISIBLE_DEVICES','')}",
-        flush=True,
+    if timing is not None:
+        timing.activate()
+    adapter, worker_adapter = _open_worker(
+        study_name, trial_adapter_path, worker_adapter_path, meta, project, worker_id, startup, objective
     )
-    adapter = _load_run_adapter(trial_adapter_path, TrialAdapter, meta, project, "Trial")
-    worker_adapter = _load_run_adapter(worker_adapter_path, WorkerAdapter, meta, project, "Worker")
-    if worker_adapter is not None:
-        try:
-            worker_adapter.on_worker_start(
-                _build_context("worker", study_name, phase="start", worker_id=worker_id)
-            )
-        except Exception as exc:
-            print(f"[WORKER {worker_id} pid={pid}] worker adapter start error: {exc}", flush=True)
-    t_start = time.time()
-    storage = _create_storage(storage_url, engine_kwargs)
-    study = optuna.load_study(study_name=study_name, storage=storage)
+    storage = storage_spec.build()
+    sampler = sampler_spec.build(worker_id)
+    pruner = pruner_spec.build() if pruner_spec is not None else None
+    study = optuna.load_study(study_name=study_name, storage=storage, sampler=sampler, pruner=pruner)
+    if isinstance(budget, StorageTrialBudget):
+        budget = budget.bind(storage, study._study_id)
+    deadline = study_deadline(study, timeout_sec, alpha)
+    finish = functools.partial(_tell, study)
+    if sampler_spec.sharded:
+        grid = sampler_spec.grid()
+        # Storage is read once for resume; the shard itself is fixed by worker_id.
+        sampler.feed(grid.shard(worker_id, n_workers, finished_grid_keys(study, grid)))
 
     consecutive_storage_errors = 0
     max_storage_errors = 10
+    trials_run = 0
 
     while True:
-        if timeout_sec is not None and (time.time() - t_start) > float(timeout_sec):
-            print(f"[WORKER {worker_id} pid={pid}] timeout reached, exiting", flush=True)
+        if deadline.expired():
+            log(f"[WORKER {worker_id} pid={pid}] timeout reached, exiting", worker_id=worker_id)
+            break
+        if not deadline.admits():
+            log(f"[WORKER {worker_id} pid={pid}] {deadline.describe()}, exiting", worker_id=worker_id)
             break
-        if n_trials > 0:
-            try:
-                if len(study.trials) >= int(n_trials):
-                    print(f"[WORKER {worker_id} pid={pid}] n_trials={n_trials} reached, exiting", flush=True)
-                    break
-                consecutive_storage_errors = 0
-            except Exception as exc:
-                consecutive_storage_errors += 1
-                print(
-                    f"[WORKER {worker_id} pid={pid}] error checking trial count ({consecutive_storage_errors}/{max_storage_errors}): {exc}",
-                    flush=True,
-                )
-                if consecutive_storage_errors >= max_storage_errors:
-                    print(f"[WORKER {worker_id} pid={pid}] too many storage errors, exiting", flush=True)
-                    break
-                time.sleep(0.5)
-                continue
         try:
-            trial = study.ask()
+            claimed = budget.claim()
             consecutive_storage_errors = 0
         except Exception as exc:
-            print(f"[WORKER {worker_id} pid={pid}] error asking for trial: {exc}", flush=True)
+            consecutive_storage_errors += 1
+            log(
+                f"[WORKER {worker_id} pid={pid}] error checking trial budget ({consecutive_storage_errors}/{max_storage_errors}): {exc}",
+                logging.WARNING,
+                worker_id=worker_id,
+            )
+            if consecutive_storage_errors >= max_storage_errors:
+                log(f"[WORKER {worker_id} pid={pid}] too many storage errors, exiting", logging.WARNING, worker_id=worker_id)
+                break
+            time.sleep(0.5)
+            continue
+        if not claimed:
+            log(f"[WORKER {worker_id} pid={pid}] {budget.exhausted_reason()}, exiting", worker_id=worker_id)
+            break
+        if sampler_spec.sharded and sampler.exhausted:
+            budget.release()
+            log(f"[WORKER {worker_id} pid={pid}] grid shard exhausted, exiting", worker_id=worker_id)
             break
-
-        if adapter is not None:
-            try:
-                adapter.on_trial_start(
-                    _build_context(
-                        "trial",
-                        study_name,
-                        trial=trial,
-                        phase="start",
-                        worker_id=worker_id,
-                    )
-                )
-            except Exception as exc:
-                error = exc
-                state_name = TrialState.FAIL.name
-                print(
-                    f"[WORKER {worker_id} pid={pid}] trial adapter start failed on trial {trial.number}: {exc}",
-                    flush=True,
-                )
-                try:
-                    trial.set_user_attr("trial_adapter_error", str(exc))
-                except Exception:
-                    pass
-                study.tell(trial, state=TrialState.FAIL)
-                try:
-                    adapter.on_trial_end(
-                        _build_context(
-                            "trial",
-                            study_name,
-                            trial=trial,
-                            value=None,
-                            state=state_name,
-                            error=error,
-                            phase="end",
-                            worker_id=worker_id,
-                        )
-                    )
-                except Exception as finish_exc:
-                    print(
-                        f"[WORKER {worker_id} pid={pid}] trial adapter end error after start failure: {finish_exc}",
-                        flush=True,
-                    )
-                continue
-
-        value: Optional[float] = None
-        state_name = None
-        error: Optional[BaseException] = None
         try:
-            value = objective(trial)
-            study.tell(trial, value)
-            state_name = TrialState.COMPLETE.name
-        except optuna.exceptions.TrialPruned as exc:
-            error = exc
-            state_name = TrialState.PRUNED.name
-            print(f"[WORKER {worker_id} pid={pid}] trial {trial.number} pruned", flush=True)
-            study.tell(trial, state=TrialState.PRUNED)
+            trial = ask(study)
         except Exception as exc:
-            error = exc
-            state_name = TrialState.FAIL.name
-            print(f"[WORKER {worker_id} pid={pid}] trial {trial.number} failed: {exc}", flush=True)
-            study.tell(trial, state=TrialState.FAIL)
-        finally:
-            if adapter is not None:
-                try:
-                    adapter.on_trial_end(
-                        _build_context(
-                            "trial",
-                            study_name,
-                            trial=trial,
-                            value=value,
-                            state=state_name,
-                            error=error,
-                            phase="end",
-                            worker_id=worker_id,
-                        )
-                    )
-                except Exception as exc:
-                    print(
-                        f"[WORKER {worker_id} pid={pid}] trial adapter end error on trial {trial.number}: {exc}",
-                        flush=True,
-                    )
+            budget.release()
+            log(f"[WORKER {worker_id} pid={pid}] error asking for trial: {exc}", logging.WARNING, worker_id=worker_id)
+            break
+        if not budget.confirm(study, trial):
+            log(f"[WORKER {worker_id} pid={pid}] trial {trial.number} is over budget, exiting", worker_id=worker_id)
+            break
 
-    if worker_adapter is not None:
-        try:
-            worker_adapter.on_worker_end(
-                _build_context("worker", study_name, phase="end", worker_id=worker_id)
-            )
-        except Exception as exc:
-            print(f"[WORKER {worker_id} pid={pid}] worker adapter end error: {exc}", flush=True)
+        trials = _fill_batch(study, budget, [trial], batch_size, ask) if batch_size > 1 else [trial]
+        deadline.annotate(trials)
+        t_trial = time.time()
+        if tracker is not None:
+            # Lets the coordinator recover these trials if this process dies mid-trial.
+            tracker.track(worker_id, [t._trial_id for t in trials])
+        if batch_size > 1:
+            outcomes = _run_batch(objective, trials, finish, adapter, study_name, worker_id)
+        else:
+            outcomes = [_run_trial(objective, trial, finish, adapter, study_name, worker_id)]
+        if tracker is not None:
+            tracker.clear(worker_id)
+        deadline.record(time.time() - t_trial)
+        for state, error in outcomes:
+            if getattr(error, "resample", False):
+                # Re-sampled duplicates do not use up the trial budget.
+                budget.release()
+            else:
+                budget.settle(state)
+        trials_run += len(trials)
+        reason = recycle.reason(trials_run) if recycle is not None else None
+        if reason is not None:
+            log(f"[WORKER {worker_id} pid={pid}] recycling: {reason}", worker_id=worker_id)
+            if tracker is not None:
+                tracker.retire(worker_id)
+            break
 
-    if hasattr(objective, "close"):
-        try:
-            objective.close()
-        except Exception as exc:
-            print(f"[WORKER {worker_id} pid={pid}] error during objective teardown: {exc}", flush=True)
+    _close_worker(study_name, objective, worker_adapter, worker_id)
+    if timing is not None:
+        timing.dump()
 
 
 def format_study_name(meta_name: str, version: Optional[int]) -> str:
@@ -278,7 +179,7 @@ def format_study_name(meta_name: str, version: Optional[int]) -> str:
 
 
 def get_study_name(
-    storage_url: Optional[str],
+    storage: Optional[Union[str, BaseStorage]],
     meta_name: str,
     study_version: Optional[int],
     continue_study: bool,
@@ -286,12 +187,12 @@ def get_study_name(
     candidate = format_study_name(meta_name, study_version)
     if continue_study:
         return candidate, study_version
-    if study_version is None or not storage_url:
+    if study_version is None or not storage:
         return candidate, study_version
     try:
-        summaries = optuna.study.get_all_study_summaries(storage=storage_url)
+        summaries = optuna.study.get_all_study_summaries(storage=storage)
     except Exception as exc:
-        print(f"[OPTUNA] warning: could not list existing studies: {exc}", flush=True)
+        log(f"[OPTUNA] warning: could not list existing studies: {exc}", logging.WARNING)
         return candidate, study_version
     if not summaries:
         return candidate, study_version
@@ -306,7 +207,7 @@ def get_study_name(
     names = {s.study_name for s in matching}
     if candidate not in names:
         return candidate, study_version
-    return get_study_name(storage_url, meta_name, study_version + 1, False)
+    return get_study_name(storage, meta_name, study_version + 1, False)
 
 
 def optimize_study(
@@ -323,6 +224,7 @@ def optimize_study(
     trial_adapter_path: Optional[str] = None,
     worker_adapter_path: Optional[str] = None,
     optimization_adapter_path: Optional[str] = None,
+    join: Optional[str] = None,
 ) -> Tuple[optuna.Study, float, Dict[str, Any], Dict[str, Any], Optional[int]]:
     timeout_sec = int(opt_cfg.get("timeout_sec", 0))
     if timeout_sec <= 0:
@@ -330,50 +232,90 @@ def optimize_study(
     n_jobs = _ensure_positive_int(opt_cfg.get("n_jobs", 1), "n_jobs")
     meta_name = str(meta.get("name", "optuna_study")).strip()
     study_version = int(meta["study_version"]) if "study_version" in meta else None
-    storage_url = opt_cfg.get("storage_url", None)
-    storage_sqlite = opt_cfg.get("storage_sqlite", None)
-    if storage_url is None and storage_sqlite:
-        storage_url = f"sqlite:///{Path(str(storage_sqlite)).as_posix()}"
-
-    sampler, n_trials = create_sampler(opt_cfg, seed)
-
-    study_name, resolved_version = get_study_name(
-        storage_url, meta_name, study_version, continue_study
-    )
-    if resolved_version is not None and resolved_version != study_version:
-        meta["study_version"] = int(resolved_version)
-        payload["meta"] = meta
-        save_params(Path(params_path), payload)
-        study_version = int(resolved_version)
-
-    storage_engine = None
-    engine_kwargs = dict(opt_cfg.get("storage_engine_kwargs", {}))
-    connect_args = engine_kwargs.get("connect_args", {})
-    if storage_url and str(storage_url).startswith("sqlite:///"):
-        connect_args.setdefault("timeout", int(opt_cfg.get("sqlite_timeout", 30)))
-        connect_args.setdefault("check_same_thread", False)
+    storage_spec = StorageSpec.from_config(opt_cfg)
+
+    if not isinstance(search_space, CompiledSearchSpace) or search_space.tree is None:
+        search_space = CompiledSearchSpace(search_space, tree=search_space_tree)
+    sampler_spec, n_trials = build_sampler_spec(opt_cfg, seed, search_space)
+    pruner_spec = build_pruner_spec(opt_cfg)
+    budget_mode = resolve_budget_mode(opt_cfg.get("budget_mode", "all"))
+    max_failures = max_consecutive_failures(opt_cfg)
+    dispatch = bool(opt_cfg.get("dispatcher", False))
+    dispatch_lookahead = int(opt_cfg.get("dispatch_lookahead", 1))
+    if dispatch_lookahead < 0:
+        raise ValueError(f"dispatch_lookahead must be >= 0, got {dispatch_lookahead}")
+    executor = resolve_executor(opt_cfg.get("executor", "process"))
+    concurrency = _ensure_positive_int(opt_cfg.get("concurrency", n_jobs), "concurrency")
+    if dispatch and executor != "process":
+        raise ValueError("dispatcher requires executor: process.")
+    if dispatch and "pruner" in opt_cfg and pruner_spec.name != "none":
+        # Dispatcher workers run a FixedTrial, so report()/should_prune() never reach the study.
+        raise ValueError(f"pruner '{pruner_spec.name}' is not supported with dispatcher; set pruner: none.")
+    batch_size = _ensure_positive_int(opt_cfg.get("batch_size", 1), "batch_size")
+    buffer_reports = write_buffer_reports(opt_cfg)
+    fidelity = FidelitySpec.from_config(opt_cfg)
+    if fidelity is not None and (dispatch or sampler_spec.name == "grid"):
+        raise ValueError("fidelity scheduling is not supported with dispatcher or the grid sampler.")
+    if batch_size > 1 and (dispatch or executor == "async"):
+        raise ValueError("batch_size > 1 is supported by the process and thread executors without dispatcher.")
+    recycle = RecyclePolicy.from_config(opt_cfg)
+    alpha = duration_alpha(opt_cfg)
+    timing = PhaseTiming.from_config(opt_cfg)
+    if recycle is not None and (dispatch or executor != "process"):
+        raise ValueError("max_trials_per_worker/max_worker_rss_mb require executor: process without dispatcher.")
+    trial_timeout = TrialTimeoutSpec.from_config(opt_cfg)
+    if trial_timeout is not None and trial_timeout.hard_sec is not None and (dispatch or executor != "process"):
+        raise ValueError("trial_timeout_sec requires executor: process without dispatcher; use trial_soft_timeout_sec.")
+    proxy = StorageProxy.from_config(opt_cfg, storage_spec)
+    if proxy is not None and (dispatch or executor != "process"):
+        raise ValueError("storage_proxy requires executor: process without dispatcher.")
+    if proxy is not None and str(opt_cfg.get("start_method", "spawn")).lower() == "fork":
+        raise ValueError("storage_proxy requires start_method spawn or forkserver; gRPC does not survive fork.")
+
+    budget_source = str(opt_cfg.get("budget_source", "shared")).strip().lower()
+    if budget_source not in ("shared", "storage"):
+        raise ValueError(f"Unsupported budget_source '{budget_source}'. Choose from shared/storage.")
+    storage_budget = bool(join) or budget_source == "storage"
+    if storage_budget and (fidelity is not None or sampler_spec.sharded):
+        raise ValueError("join/budget_source: storage do not support fidelity scheduling or the sharded grid sampler.")
+
+    storage_spec.prepare()
+    storage_engine = storage_spec.build()
+
+    if join:
+        study_name = str(join)
     else:
-        connect_timeout = int(opt_cfg.get("pg_connect_timeout", 30))
-        connect_args.setdefault("connect_timeout", connect_timeout)
-    engine_kwargs["connect_args"] = connect_args
+        study_name, resolved_version = get_study_name(
+            storage_engine, meta_name, study_version, continue_study
+        )
+        if resolved_version is not None and resolved_version != study_version:
+            meta["study_version"] = int(resolved_version)
+            payload["meta"] = meta
+            save_params(Path(params_path), payload)
+            study_version = int(resolved_version)
 
-    if storage_url:
-        if storage_sqlite:
-            _ensure_sqlite_pragmas(Path(str(storage_sqlite)))
-        storage_engine = RDBStorage(url=storage_url, engine_kwargs=engine_kwargs)
+    if join:
+        try:
+            study = optuna.load_study(
+                study_name=study_name, storage=storage_engine, sampler=sampler_spec.build(), pruner=pruner_spec.build()
+            )
+        except KeyError:
+            raise ValueError(f"Study '{study_name}' does not exist in {storage_spec.describe()}; start it without --join first.")
     else:
-        raise ValueError("Multiprocess optimization requires a persistent Optuna storage URL.")
-
-    study = optuna.create_study(
-        study_name=study_name,
-        direction="maximize",
-        storage=storage_engine,
-        load_if_exists=True,
-        sampler=sampler,
-    )
+        study = optuna.create_study(
+            study_name=study_name,
+            direction="maximize",
+            storage=storage_engine,
+            load_if_exists=True,
+            sampler=sampler_spec.build(),
+            pruner=pruner_spec.build(),
+        )
+    # Trials left RUNNING by a crashed earlier run are failed (and re-enqueued) before counting.
+    fail_stale(study)
 
     project = dict(project or {})
-    optimization_adapter = _load_run_adapter(
+    # Optimization hooks belong to the run that owns the study, not to joined workers.
+    optimization_adapter = None if join else _load_run_adapter(
         optimization_adapter_path, OptimizationAdapter, meta, project, "Optimization"
     )
     if optimization_adapter is not None:
@@ -381,34 +323,193 @@ def optimize_study(
             _build_context("optimization", study_name, phase="start")
         )
 
-    ctx = mp.get_context("spawn")
+    start_method = str(opt_cfg.get("start_method", "spawn")).lower()
+    ctx = create_context(
+        opt_cfg,
+        (
+            getattr(objective, "adapter_path", None),
+            getattr(objective, "prune_adapter_path", None),
+            trial_adapter_path,
+            worker_adapter_path,
+        ),
+    )
+    if start_method == "fork":
+        storage_spec.before_fork(storage_engine)
+    startup = StartupTimer(ctx, n_jobs)
+    if storage_budget:
+        # Other runs may share the study, so every claim counts trials in storage.
+        budget = StorageTrialBudget(storage_engine, study._study_id, n_trials, budget_mode, max_failures)
+    else:
+        # Counted once here; workers then claim slots from the shared counter in O(1).
+        used_trials = count_trials(
+            storage_engine,
+            study._study_id,
+            budget_states(budget_mode) or _CLAIMED_STATES,
+        )
+        budget = SharedTrialBudget(ctx, n_trials, budget_mode, initial=used_trials, max_failures=max_failures)
+    trial_retries = int(opt_cfg.get("trial_retries", 0))
+    # SQLite cannot lock rows, so enqueued trials (retries, fidelity promotions) are popped one ask at a time.
+    ask_lock = (
+        AskLock(ctx, float(opt_cfg.get("ask_lock_timeout_sec", 30)))
+        if fidelity is not None or trial_retries > 0
+        else None
+    )
+    scheduler = FidelityScheduler(fidelity, ask_lock) if fidelity is not None else None
+    ask = functools.partial(_ask, scheduler=scheduler, buffer_reports=buffer_reports, lock=ask_lock)
+    tracker = TrialTracker(ctx, n_jobs, batch_size)
+    shared_store = None
+    if hasattr(objective, "prepare_shared"):
+        # Published once here; workers attach zero-copy and the parent always cleans up.
+        shared_store = objective.prepare_shared(str(opt_cfg.get("shared_memory", "shm")))
     procs = []
-    for worker_id in range(1, n_jobs + 1):
-        p = ctx.Process(
-            target=_worker_loop,
-            args=(
-                storage_url,
-                study_name,
+    log_hub = LogHub.from_config(ctx, opt_cfg)
+    parent_sink = None
+    if log_hub is not None:
+        log_hub.start()
+        parent_sink = log_hub.sink()
+        parent_sink.attach()
+    worker_storage = storage_spec
+    try:
+        if timing is not None:
+            timing.prepare()
+        if proxy is not None:
+            # Workers share the coordinator's pool and cache instead of opening one engine each.
+            worker_storage = storage_spec.proxied(*proxy.start(storage_engine))
+            log(f"[OPTUNA] storage proxy listening on {proxy.host}:{proxy.port}")
+        if executor != "process":
+            if sampler_spec.sharded:
+                grid = sampler_spec.grid()
+                study.sampler.feed(grid.shard(1, 1, finished_grid_keys(study, grid)))
+            run_in_process(
+                executor,
+                study,
                 objective,
+                budget,
+                concurrency,
                 timeout_sec,
-                n_trials,
-                engine_kwargs,
                 trial_adapter_path,
                 worker_adapter_path,
                 meta,
                 project,
-                worker_id,
-            ),
-            daemon=False,
-        )
-        p.start()
-        procs.append(p)
-    for p in procs:
-        p.join()
-
-    failed_workers = [i for i, p in enumerate(procs) if p.exitcode != 0]
-    if failed_workers:
-        print(f"[OPTUNA] warning: {len(failed_workers)} worker(s) exited with non-zero code", flush=True)
+                batch_size,
+                ask,
+                alpha,
+                timing,
+            )
+        else:
+            if dispatch:
+                task_queue = ctx.Queue()
+                result_queue = ctx.Queue()
+                # Written by each worker as soon as it takes a task, so a worker that dies before its
+                # "start" message arrives still names the trial it held (-2: not taking tasks yet, -1: idle).
+                claimed = ctx.Array("i", [-2] * n_jobs, lock=False)
+            deadline = time.time() + float(timeout_sec) if timeout_sec is not None else None
+
+            def start_worker(worker_id: int) -> Any:
+                log_sink = log_hub.sink() if log_hub is not None else None
+                if dispatch:
+                    target = _dispatch_worker_loop
+                    args = (
+                        task_queue,
+                        result_queue,
+                        claimed,
+                        study_name,
+                        objective,
+                        trial_adapter_path,
+                        worker_adapter_path,
+                        meta,
+                        project,
+                        worker_id,
+                        startup,
+                        timing,
+                        log_sink,
+                    )
+                else:
+                    target = _worker_loop
+                    args = (
+                        worker_storage,
+                        study_name,
+                        objective,
+                        # Replacement workers only get what is left of the study timeout.
+                        None if deadline is None else max(0.0, deadline - time.time()),
+                        budget,
+                        sampler_spec,
+                        trial_adapter_path,
+                        worker_adapter_path,
+                        meta,
+                        project,
+                        worker_id,
+                        n_jobs,
+                        startup,
+                        batch_size,
+                        ask,
+                        pruner_spec,
+                        tracker,
+                        recycle,
+                        alpha,
+                        timing,
+                        log_sink,
+                    )
+                p = ctx.Process(target=target, args=args, daemon=False)
+                startup.mark_start(worker_id)
+                p.start()
+                if log_sink is not None:
+                    # The worker holds the write end now; the listener sees EOF when it exits.
+                    log_sink.close()
+                procs.append(p)
+                return p
+
+            workers = {worker_id: start_worker(worker_id) for worker_id in range(1, n_jobs + 1)}
+            if dispatch:
+                if sampler_spec.sharded:
+                    grid = sampler_spec.grid()
+                    study.sampler.feed(grid.shard(1, 1, finished_grid_keys(study, grid)))
+                dispatch_trials(
+                    study,
+                    search_space,
+                    budget,
+                    task_queue,
+                    result_queue,
+                    claimed,
+                    procs,
+                    dispatch_lookahead,
+                    timeout_sec,
+                    alpha,
+                )
+                for p in procs:
+                    p.join()
+            else:
+                supervise_workers(
+                    workers,
+                    start_worker,
+                    study,
+                    tracker,
+                    budget,
+                    trial_retries=trial_retries,
+                    max_restarts=int(opt_cfg.get("max_worker_restarts", 0)),
+                    deadline=deadline,
+                    trial_timeout=trial_timeout,
+                    ask_lock=ask_lock,
+                )
+        latencies = startup.latencies()
+        if latencies:
+            log(
+                f"[OPTUNA] worker startup start_method={start_method} "
+                f"mean={sum(latencies) / len(latencies):.2f}s max={max(latencies):.2f}s",
+            )
+        failed_workers = [i for i, p in enumerate(procs) if p.exitcode != 0]
+        if failed_workers:
+            log(f"[OPTUNA] warning: {len(failed_workers)} worker(s) exited with non-zero code", logging.WARNING)
+    finally:
+        if proxy is not None:
+            proxy.stop()
+        if shared_store is not None:
+            shared_store.close()
+        if timing is not None:
+            timing.report()
+        if log_hub is not None:
+            parent_sink.detach()
+            log_hub.stop()
 
     study = optuna.load_study(study_name=study_name, storage=storage_engine)
 
@@ -426,10 +527,6 @@ def optimize_study(
 
     best = study.best_trial
     best_value = float(best.value)
-    best_params_full = {
-        name: resolve_param_value(name, spec, best.params)
-        for name, spec in search_space.items()
-    }
-    best_params_full = {k: normalize_value(v) for k, v in best_params_full.items()}
-    best_params_tree = build_params_tree(search_space_tree, best_params_full)
+    best_params_full = search_space.resolve(best.params)
+    best_params_tree = search_space.params_tree(best_params_full)
     return study, best_value, best_params_full, best_params_tree, study_version
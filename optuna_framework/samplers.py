@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import optuna
+
+from optuna_framework.config import _ensure_positive_int
+from optuna_framework.grid import GridShardSampler, ShardedGrid
+from optuna_framework.search_space import CompiledSearchSpace
+
+SAMPLER_OPTIONS = {
+    "tpe": ("multivariate", "group", "constant_liar", "n_startup_trials", "n_ei_candidates"),
+    "qmc": ("qmc_type", "scramble"),
+    "random": (),
+    "grid": (),
+}
+
+
+def derive_seed(seed: int, worker_id: Optional[int] = None) -> int:
+    if worker_id is None:
+        return int(seed)
+    return (int(seed) * 1_000_003 + int(worker_id)) % (2**32)
+
+
+@dataclass
+class SamplerSpec:
+    """Picklable sampler description rebuilt in every worker."""
+
+    name: str
+    seed: int
+    options: Dict[str, Any] = field(default_factory=dict)
+    grid_params: Optional[Dict[str, Any]] = None
+    sharded: bool = False
+
+    def grid(self) -> ShardedGrid:
+        return ShardedGrid(self.grid_params or {})
+
+    def build(self, worker_id: Optional[int] = None) -> optuna.samplers.BaseSampler:
+        if self.name == "grid" and self.sharded:
+            return GridShardSampler()
+        if self.name == "grid":
+            return optuna.samplers.GridSampler(self.grid_params, seed=derive_seed(self.seed, worker_id))
+        if self.name == "random":
+            return optuna.samplers.RandomSampler(seed=derive_seed(self.seed, worker_id))
+        if self.name == "tpe":
+            return optuna.samplers.TPESampler(seed=derive_seed(self.seed, worker_id), **self.options)
+        if self.name == "qmc":
+            # QMC walks one shared sequence indexed through storage, so workers keep the same seed.
+            return optuna.samplers.QMCSampler(seed=int(self.seed), **self.options)
+        raise ValueError(f"Unsupported sampler '{self.name}'. Choose from grid/random/tpe/qmc.")
+
+
+def build_sampler_spec(
+    opt_cfg: Dict[str, Any], seed: int, search_space: Optional[Mapping] = None
+) -> Tuple[SamplerSpec, int]:
+    n_trials = _ensure_positive_int(opt_cfg.get("n_trials", 100), "n_trials")
+    sampler_name = str(opt_cfg.get("sampler", "tpe")).lower()
+    if sampler_name not in SAMPLER_OPTIONS:
+        raise ValueError(
+            f"Unsupported sampler '{sampler_name}'. Choose from grid/random/tpe/qmc."
+        )
+    options = dict(opt_cfg.get("sampler_options", None) or {})
+    unknown = sorted(set(options) - set(SAMPLER_OPTIONS[sampler_name]))
+    if unknown:
+        raise ValueError(
+            f"Unsupported sampler_options for '{sampler_name}': {', '.join(unknown)}."
+        )
+    if "n_startup_trials" in options:
+        options["n_startup_trials"] = int(options["n_startup_trials"])
+    if "n_ei_candidates" in options:
+        options["n_ei_candidates"] = _ensure_positive_int(options["n_ei_candidates"], "n_ei_candidates")
+    grid_params = None
+    sharded = False
+    if sampler_name == "grid":
+        grid_params = opt_cfg.get("grid_params", None)
+        if grid_params is None and search_space is not None:
+            # No explicit grid: expand search_space itself and shard it by worker_id.
+            if not isinstance(search_space, CompiledSearchSpace):
+                search_space = CompiledSearchSpace(search_space)
+            grid_params = search_space.grid_params()
+            sharded = True
+        if not isinstance(grid_params, dict) or not grid_params:
+            raise ValueError(
+                "Grid sampler requires optuna.grid_params dict with parameter lists "
+                "or a search_space with params to expand."
+            )
+        grid_size = 1
+        for values in grid_params.values():
+            grid_size *= len(values)
+        if n_trials > grid_size:
+            n_trials = grid_size
+    return SamplerSpec(sampler_name, int(seed), options, grid_params, sharded), n_trials
+
+
+def create_sampler(opt_cfg: Dict[str, Any], seed: int) -> Tuple[Optional[optuna.samplers.BaseSampler], int]:
+    spec, n_trials = build_sampler_spec(opt_cfg, seed)
+    return spec.build(), n_trials
@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
 
 try:
     import numpy as np
@@ -56,15 +57,87 @@ def normalize_value(value: Any) -> Any:
     return value
 
 
-def suggest_value(trial: optuna.trial.Trial, name: str, spec: Any) -> Any:
+class _FixedSlot:
+    __slots__ = ("name", "value", "distribution")
+
+    def __init__(self, name: str, value: Any) -> None:
+        self.name = name
+        self.value = normalize_value(value)
+        self.distribution = None
+
+    def suggest(self, trial: optuna.trial.Trial) -> Any:
+        return self.value
+
+
+class _CategoricalSlot:
+    __slots__ = ("name", "choices", "normalize", "distribution")
+
+    def __init__(self, name: str, choices: Any) -> None:
+        self.name = name
+        self.choices = choices
+        self.normalize = any(
+            isinstance(c, (list, tuple)) or (np is not None and isinstance(c, np.generic))
+            for c in choices
+        )
+        self.distribution = optuna.distributions.CategoricalDistribution(choices)
+
+    def suggest(self, trial: optuna.trial.Trial) -> Any:
+        value = trial.suggest_categorical(self.name, self.choices)
+        return normalize_value(value) if self.normalize else value
+
+    def grid_values(self) -> list:
+        return list(self.choices)
+
+
+class _IntSlot:
+    __slots__ = ("name", "lo", "hi", "step", "log", "distribution")
+
+    def __init__(self, name: str, lo: int, hi: int, step: int, log: bool) -> None:
+        self.name = name
+        self.lo = lo
+        self.hi = hi
+        self.step = step
+        self.log = log
+        self.distribution = optuna.distributions.IntDistribution(lo, hi, log=log, step=step)
+
+    def suggest(self, trial: optuna.trial.Trial) -> Any:
+        return int(trial.suggest_int(self.name, self.lo, self.hi, step=self.step, log=self.log))
+
+    def grid_values(self) -> list:
+        return list(range(self.lo, self.hi + 1, self.step))
+
+
+class _FloatSlot:
+    __slots__ = ("name", "lo", "hi", "step", "log", "distribution")
+
+    def __init__(self, name: str, lo: float, hi: float, step: Optional[float], log: bool) -> None:
+        self.name = name
+        self.lo = lo
+        self.hi = hi
+        self.step = step
+        self.log = log
+        self.distribution = optuna.distributions.FloatDistribution(lo, hi, log=log, step=step)
+
+    def suggest(self, trial: optuna.trial.Trial) -> Any:
+        return float(trial.suggest_float(self.name, self.lo, self.hi, step=self.step, log=self.log))
+
+    def grid_values(self) -> list:
+        if self.step is None:
+            raise ValueError(f"Param '{self.name}' needs a step to be expanded into a grid.")
+        n_steps = int(round((self.hi - self.lo) / self.step))
+        return [round(self.lo + i * self.step, 12) for i in range(n_steps + 1)]
+
+
+def _compile_param(name: str, spec: Any) -> Any:
     ps = parse_spec(spec, name)
     if ps["type"] == "fixed":
-        return ps["value"]
+        return _FixedSlot(name, ps["value"])
     if ps["type"] == "cat":
-        return trial.suggest_categorical(name, ps["choices"])
+        return _CategoricalSlot(name, ps["choices"])
     lo = ps["lo"]
     hi = ps["hi"]
     step = ps.get("step", None)
+    log = bool(ps.get("log", False))
     is_int = isinstance(lo, int) and isinstance(hi, int)
     if step is not None:
         try:
@@ -74,20 +147,62 @@ def suggest_value(trial: optuna.trial.Trial, name: str, spec: Any) -> Any:
     else:
         step_is_int = True
     if is_int and step_is_int:
-        if ps.get("log", False) and step is not None:
+        if log and step is not None:
             raise ValueError(f"Param '{name}' cannot use log with a step for int range.")
-        if step is None:
-            return int(trial.suggest_int(name, int(lo), int(hi), log=bool(ps.get("log", False))))
-        return int(trial.suggest_int(name, int(lo), int(hi), step=int(step)))
-    return float(
-        trial.suggest_float(
-            name,
-            float(lo),
-            float(hi),
-            step=step,
-            log=bool(ps.get("log", False)),
-        )
-    )
+        return _IntSlot(name, int(lo), int(hi), 1 if step is None else int(step), log)
+    return _FloatSlot(name, float(lo), float(hi), None if step is None else float(step), log)
+
+
+def suggest_value(trial: optuna.trial.Trial, name: str, spec: Any) -> Any:
+    return _compile_param(name, spec).suggest(trial)
+
+
+class CompiledSearchSpace(Mapping):
+    """Search space parsed once into per-parameter suggesters.
+
+    Behaves as a read-only mapping of param name to its original spec.
+    """
+
+    __slots__ = ("_specs", "_slots", "distributions", "tree")
+
+    def __init__(self, search_space: Mapping, tree: Optional[Dict[str, Any]] = None) -> None:
+        self._specs = dict(search_space)
+        self._slots = tuple(_compile_param(name, spec) for name, spec in self._specs.items())
+        self.distributions: Dict[str, optuna.distributions.BaseDistribution] = {
+            slot.name: slot.distribution for slot in self._slots if slot.distribution is not None
+        }
+        self.tree = tree
+
+    def __getitem__(self, name: str) -> Any:
+        return self._specs[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def suggest(self, trial: optuna.trial.Trial) -> Dict[str, Any]:
+        return {slot.name: slot.suggest(trial) for slot in self._slots}
+
+    def grid_params(self) -> Dict[str, list]:
+        return {slot.name: slot.grid_values() for slot in self._slots if slot.distribution is not None}
+
+    def resolve(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        resolved: Dict[str, Any] = {}
+        for slot in self._slots:
+            if slot.name in params:
+                resolved[slot.name] = normalize_value(params[slot.name])
+            elif slot.distribution is None:
+                resolved[slot.name] = slot.value
+            else:
+                raise ValueError(f"Missing param '{slot.name}' in best_params, and spec is not fixed.")
+        return resolved
+
+    def params_tree(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        if self.tree is None:
+            return dict(values)
+        return build_params_tree(self.tree, values)
 
 
 def resolve_param_value(name: str, spec: Any, best_params: Dict[str, Any]) -> Any:
@@ -111,5 +226,3 @@ def build_params_tree(spec_tree: Dict[str, Any], values: Dict[str, Any]) -> Dict
             if key in values:
                 out[key] = values[key]
     return out
-
-
@@ -0,0 +1,146 @@
+import mmap
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+SHARED_BACKENDS = ("shm", "mmap")
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    name: str
+    kind: str
+    location: str
+    shape: Tuple[int, ...] = ()
+    dtype: str = ""
+    size: int = 0
+
+
+class SharedStore:
+    """Parent-side owner of shared buffers; ``close`` releases them even if workers crashed."""
+
+    def __init__(self, backend: str = "shm") -> None:
+        backend = str(backend or "shm").lower()
+        if backend not in SHARED_BACKENDS:
+            raise ValueError(f"Unsupported shared_memory backend '{backend}'. Choose from shm/mmap.")
+        self.backend = backend
+        self._handles: Dict[str, SharedHandle] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._tmpdir: Optional[str] = None
+
+    def publish(self, name: str, obj: Any) -> SharedHandle:
+        if np is not None and isinstance(obj, np.ndarray):
+            handle = self._publish_array(name, obj)
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            handle = self._publish_bytes(name, bytes(obj))
+        else:
+            raise TypeError(f"Shared object '{name}' must be a numpy array or bytes, got {type(obj).__name__}.")
+        self._handles[name] = handle
+        return handle
+
+    def _publish_array(self, name: str, array: Any) -> SharedHandle:
+        array = np.ascontiguousarray(array)
+        if self.backend == "mmap":
+            path = os.path.join(self._ensure_tmpdir(), f"{name}.npy")
+            np.save(path, array)
+            return SharedHandle(name, "array", path, tuple(array.shape), array.dtype.str, array.nbytes)
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        self._blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        return SharedHandle(name, "array", block.name, tuple(array.shape), array.dtype.str, array.nbytes)
+
+    def _publish_bytes(self, name: str, data: bytes) -> SharedHandle:
+        if self.backend == "mmap":
+            path = os.path.join(self._ensure_tmpdir(), f"{name}.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            return SharedHandle(name, "bytes", path, size=len(data))
+        block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        self._blocks.append(block)
+        block.buf[: len(data)] = data
+        return SharedHandle(name, "bytes", block.name, size=len(data))
+
+    def _ensure_tmpdir(self) -> str:
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="optuna_shared_")
+        return self._tmpdir
+
+    def manifest(self) -> Dict[str, SharedHandle]:
+        return dict(self._handles)
+
+    def close(self) -> None:
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+        self._handles = {}
+
+
+class SharedView(dict):
+    """Worker-side zero-copy views over the parent's shared buffers."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._blocks: List[Any] = []
+
+    def close(self) -> None:
+        self.clear()
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                # A view is still referenced by user code; the OS mapping is released on exit.
+                pass
+        self._blocks = []
+
+
+def _attach_block(location: str) -> shared_memory.SharedMemory:
+    # Workers only borrow the block. Before Python 3.13 they report to the parent's resource
+    # tracker, which unlinks blocks only if the parent never did.
+    try:
+        return shared_memory.SharedMemory(name=location, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=location)
+
+
+def attach_shared(manifest: Optional[Dict[str, SharedHandle]]) -> SharedView:
+    view = SharedView()
+    for name, handle in (manifest or {}).items():
+        if handle.kind == "array":
+            if np is None:
+                raise ImportError("NumPy is required to attach shared arrays. Install with 'pip install numpy'.")
+            if handle.location.endswith(".npy"):
+                view[name] = np.load(handle.location, mmap_mode="r")
+                continue
+            block = _attach_block(handle.location)
+            view._blocks.append(block)
+            array = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=block.buf)
+            array.flags.writeable = False
+            view[name] = array
+        elif handle.location.endswith(".bin"):
+            if handle.size == 0:
+                view[name] = memoryview(b"")
+                continue
+            with open(handle.location, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view._blocks.append(mapped)
+            view[name] = memoryview(mapped)
+        else:
+            block = _attach_block(handle.location)
+            view._blocks.append(block)
+            view[name] = block.buf[: handle.size]
+    return view
@@ -0,0 +1,51 @@
+import multiprocessing as mp
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from optuna_framework.imports import module_of
+
+START_METHODS = ("spawn", "forkserver", "fork")
+
+
+def preload_modules(opt_cfg: Dict[str, Any], adapter_paths: Iterable[Optional[str]]) -> List[str]:
+    modules = ["optuna", "optuna_framework.runner"]
+    modules += [module_of(str(path)) for path in adapter_paths if path]
+    modules += [str(m) for m in opt_cfg.get("preload", None) or []]
+    return list(dict.fromkeys(modules))
+
+
+def create_context(opt_cfg: Dict[str, Any], adapter_paths: Iterable[Optional[str]] = ()) -> Any:
+    method = str(opt_cfg.get("start_method", "spawn")).lower()
+    if method not in START_METHODS:
+        raise ValueError(f"Unsupported start_method '{method}'. Choose from {'/'.join(START_METHODS)}.")
+    if method not in mp.get_all_start_methods():
+        raise ValueError(f"start_method '{method}' is not available on this platform.")
+    ctx = mp.get_context(method)
+    if method == "forkserver":
+        # Imported once in the fork server; every worker is forked from that warm process.
+        ctx.set_forkserver_preload(preload_modules(opt_cfg, adapter_paths))
+    return ctx
+
+
+class StartupTimer:
+    """Worker startup latency, from Process.start() in the parent to the worker being ready."""
+
+    def __init__(self, ctx: Any, n_workers: int) -> None:
+        self._started = ctx.Array("d", int(n_workers), lock=False)
+        self._ready = ctx.Array("d", int(n_workers), lock=False)
+
+    def mark_start(self, worker_id: int) -> None:
+        self._started[worker_id - 1] = time.time()
+        self._ready[worker_id - 1] = 0.0
+
+    def mark_ready(self, worker_id: int) -> float:
+        now = time.time()
+        self._ready[worker_id - 1] = now
+        return now - self._started[worker_id - 1]
+
+    def latencies(self) -> List[float]:
+        return [
+            ready - started
+            for started, ready in zip(self._started, self._ready)
+            if started > 0.0 and ready > 0.0
+        ]
@@ -0,0 +1,209 @@
+import dataclasses
+import sqlite3
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import optuna
+from optuna.storages import BaseStorage, JournalStorage, RDBStorage
+
+try:
+    import grpc
+except ImportError:  # pragma: no cover - optional dependency
+    grpc = None
+
+from optuna_framework.recovery import heartbeat_storage_kwargs
+
+STORAGE_BACKENDS = ("rdb", "journal")
+JOURNAL_LOCKS = ("symlink", "open")
+
+_SQLITE_PREFIX = "sqlite:///"
+
+
+def _sqlite_path(url: Optional[str]) -> Optional[str]:
+    if not url or not str(url).startswith(_SQLITE_PREFIX):
+        return None
+    path = str(url)[len(_SQLITE_PREFIX):].split("?", 1)[0]
+    return path if path and path != ":memory:" else None
+
+
+def _ensure_sqlite_pragmas(path: Path) -> None:
+    # WAL is stored in the database file, so setting it once covers every later connection.
+    try:
+        with sqlite3.connect(str(path)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+    except sqlite3.Error:
+        pass
+
+
+def _sqlite_on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL;")
+    cursor.close()
+
+
+def unwrap_storage(storage: BaseStorage) -> BaseStorage:
+    """The storage behind Optuna's cache wrapper for RDB studies; any other storage as-is."""
+    from optuna.storages._cached_storage import _CachedStorage
+
+    return storage._backend if isinstance(storage, _CachedStorage) else storage
+
+
+def engine_kwargs_for(url: str, opt_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """``storage_engine_kwargs`` plus the connect args each SQL dialect needs."""
+    engine_kwargs = dict(opt_cfg.get("storage_engine_kwargs", {}))
+    connect_args = dict(engine_kwargs.get("connect_args", {}))
+    dialect = str(url).split(":", 1)[0].split("+", 1)[0].lower()
+    if dialect == "sqlite":
+        connect_args.setdefault("timeout", int(opt_cfg.get("sqlite_timeout", 30)))
+        connect_args.setdefault("check_same_thread", False)
+    elif dialect in ("postgresql", "mysql"):
+        connect_args.setdefault("connect_timeout", int(opt_cfg.get("pg_connect_timeout", 30)))
+    engine_kwargs["connect_args"] = connect_args
+    return engine_kwargs
+
+
+@dataclass(frozen=True)
+class StorageSpec:
+    """Picklable storage settings; the coordinator and every worker build their own storage from them."""
+
+    backend: str = "rdb"
+    url: Optional[str] = None
+    engine_kwargs: Dict[str, Any] = field(default_factory=dict)
+    storage_kwargs: Dict[str, Any] = field(default_factory=dict)
+    journal_path: Optional[str] = None
+    journal_lock: str = "symlink"
+    proxy_address: Optional[Tuple[str, int]] = None
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any]) -> "StorageSpec":
+        journal_path = opt_cfg.get("storage_journal", None)
+        default = "journal" if journal_path else "rdb"
+        backend = str(opt_cfg.get("storage_backend", default) or default).strip().lower()
+        if backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Unsupported storage_backend '{backend}'. Choose from {'/'.join(STORAGE_BACKENDS)}.")
+        if backend == "journal":
+            if not journal_path:
+                raise ValueError("storage_backend: journal requires storage_journal (path of the journal file).")
+            if heartbeat_storage_kwargs(opt_cfg):
+                raise ValueError("heartbeat_interval requires storage_backend: rdb; journal storage has no heartbeats.")
+            lock = str(opt_cfg.get("storage_journal_lock", "symlink")).strip().lower()
+            if lock not in JOURNAL_LOCKS:
+                raise ValueError(f"Unsupported storage_journal_lock '{lock}'. Choose from {'/'.join(JOURNAL_LOCKS)}.")
+            return cls("journal", journal_path=str(journal_path), journal_lock=lock)
+
+        url = opt_cfg.get("storage_url", None)
+        storage_sqlite = opt_cfg.get("storage_sqlite", None)
+        if url is None and storage_sqlite:
+            url = f"{_SQLITE_PREFIX}{Path(str(storage_sqlite)).as_posix()}"
+        if not url:
+            raise ValueError("Multiprocess optimization requires a persistent Optuna storage URL.")
+        return cls("rdb", str(url), engine_kwargs_for(str(url), opt_cfg), heartbeat_storage_kwargs(opt_cfg))
+
+    @property
+    def sqlite_path(self) -> Optional[str]:
+        return _sqlite_path(self.url) if self.backend == "rdb" else None
+
+    def describe(self) -> str:
+        return f"journal:{self.journal_path}" if self.backend == "journal" else str(self.url)
+
+    def proxied(self, host: str, port: int) -> "StorageSpec":
+        """Spec for workers that reach this storage only through the coordinator's proxy."""
+        return dataclasses.replace(self, proxy_address=(host, int(port)))
+
+    def prepare(self) -> None:
+        """One-time setup in the coordinator before any storage is built."""
+        if self.sqlite_path is not None:
+            _ensure_sqlite_pragmas(Path(self.sqlite_path))
+
+    def build(self) -> BaseStorage:
+        if self.proxy_address is not None:
+            from optuna.storages import GrpcStorageProxy
+
+            host, port = self.proxy_address
+            with warnings.catch_warnings():
+                # Opted into via storage_proxy; one warning per worker adds nothing.
+                warnings.simplefilter("ignore", optuna.exceptions.ExperimentalWarning)
+                proxy = GrpcStorageProxy(host=host, port=port)
+            proxy.wait_server_ready(timeout=60)
+            return proxy
+        if self.backend == "journal":
+            from optuna.storages.journal import JournalFileBackend, JournalFileOpenLock, JournalFileSymlinkLock
+
+            lock_cls = JournalFileOpenLock if self.journal_lock == "open" else JournalFileSymlinkLock
+            return JournalStorage(JournalFileBackend(self.journal_path, lock_obj=lock_cls(self.journal_path)))
+        with warnings.catch_warnings():
+            # Heartbeats are opted into via heartbeat_interval.
+            warnings.simplefilter("ignore", optuna.exceptions.ExperimentalWarning)
+            storage = RDBStorage(url=self.url, engine_kwargs=self.engine_kwargs, **self.storage_kwargs)
+        if self.sqlite_path is not None:
+            from sqlalchemy import event
+
+            # Applied to every later connection; the one opened for schema setup is dropped.
+            event.listen(storage.engine, "connect", _sqlite_on_connect)
+            storage.engine.dispose()
+        return storage
+
+    def before_fork(self, storage: BaseStorage) -> None:
+        if isinstance(storage, RDBStorage):
+            # Forked workers must not inherit the parent's pooled connections.
+            storage.engine.dispose()
+
+
+def _grpc_service() -> Tuple[Any, Any]:
+    # Optuna ships the proxy server only as the blocking run_grpc_proxy_server, which cannot bind port 0 or be
+    # stopped. StorageProxy builds the same server from its private modules, present in Optuna 4.2 through 5.x.
+    try:
+        from optuna.storages._grpc.auto_generated import api_pb2_grpc
+        from optuna.storages._grpc.servicer import OptunaStorageProxyService
+    except ImportError as exc:
+        raise ImportError(
+            f"storage_proxy needs the gRPC storage server of Optuna >= 4.2 (tested up to 5.0); "
+            f"optuna {optuna.__version__} does not provide it ({exc})."
+        ) from exc
+    return api_pb2_grpc, OptunaStorageProxyService
+
+
+class StorageProxy:
+    """gRPC server in the coordinator in front of one pooled, cached storage; workers connect only to it."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, threads: int = 10) -> None:
+        self.host = host
+        self.port = int(port)
+        self.threads = int(threads)
+        self._server: Optional[Any] = None
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any], storage_spec: StorageSpec) -> Optional["StorageProxy"]:
+        if not bool(opt_cfg.get("storage_proxy", False)):
+            return None
+        if grpc is None:
+            raise ImportError("grpcio is required for storage_proxy. Install with 'pip install grpcio protobuf'.")
+        if storage_spec.backend != "rdb":
+            raise ValueError("storage_proxy requires storage_backend: rdb.")
+        if storage_spec.storage_kwargs:
+            raise ValueError("storage_proxy does not support heartbeat_interval; workers have no direct storage.")
+        threads = int(opt_cfg.get("storage_proxy_threads", 10))
+        if threads <= 0:
+            raise ValueError(f"storage_proxy_threads must be > 0, got {threads}")
+        _grpc_service()
+        return cls(str(opt_cfg.get("storage_proxy_host", "127.0.0.1")), int(opt_cfg.get("storage_proxy_port", 0)), threads)
+
+    def start(self, storage: BaseStorage) -> Tuple[str, int]:
+        api_pb2_grpc, OptunaStorageProxyService = _grpc_service()
+        # get_storage adds Optuna's in-process cache of study and finished-trial reads in front of the pool.
+        service = OptunaStorageProxyService(optuna.storages.get_storage(storage))
+        self._server = grpc.server(ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="optuna-proxy"))
+        api_pb2_grpc.add_StorageServiceServicer_to_server(service, self._server)
+        self.port = self._server.add_insecure_port(f"{self.host}:{self.port}")
+        if self.port == 0:
+            raise OSError(f"storage_proxy could not bind {self.host}.")
+        self._server.start()
+        return self.host, self.port
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.stop(grace=None).wait()
+            self._server = None
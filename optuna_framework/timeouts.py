@@ -0,0 +1,85 @@
+import ctypes
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import optuna
+from optuna.trial import TrialState
+
+TIMEOUT_STATES = {"fail": TrialState.FAIL, "pruned": TrialState.PRUNED}
+
+
+class TrialTimeout(optuna.TrialPruned):
+    """Raised inside ``execute`` when the soft trial deadline passes."""
+
+    def __init__(self, message: str = "soft trial timeout reached") -> None:
+        super().__init__(message)
+
+
+@dataclass(frozen=True)
+class TrialTimeoutSpec:
+    """Per-trial wall-clock limits: ``soft_sec`` prunes from inside the worker, ``hard_sec`` kills it."""
+
+    hard_sec: Optional[float] = None
+    soft_sec: Optional[float] = None
+    state: str = "fail"
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any]) -> Optional["TrialTimeoutSpec"]:
+        hard_sec = float(opt_cfg.get("trial_timeout_sec", 0) or 0) or None
+        soft_sec = float(opt_cfg.get("trial_soft_timeout_sec", 0) or 0) or None
+        if hard_sec is None and soft_sec is None:
+            return None
+        for name, seconds in (("trial_timeout_sec", hard_sec), ("trial_soft_timeout_sec", soft_sec)):
+            if seconds is not None and seconds < 0:
+                raise ValueError(f"{name} must be >= 0, got {seconds}")
+        if hard_sec is not None and soft_sec is not None and soft_sec >= hard_sec:
+            raise ValueError(f"trial_soft_timeout_sec ({soft_sec}) must be < trial_timeout_sec ({hard_sec}).")
+        state = str(opt_cfg.get("trial_timeout_state", "fail")).strip().lower()
+        if state not in TIMEOUT_STATES:
+            raise ValueError(f"Unsupported trial_timeout_state '{state}'. Choose from {'/'.join(TIMEOUT_STATES)}.")
+        return cls(hard_sec, soft_sec, state)
+
+    @property
+    def trial_state(self) -> TrialState:
+        return TIMEOUT_STATES[self.state]
+
+
+class SoftDeadline:
+    """Raise ``TrialTimeout`` in the entering thread once ``seconds`` have passed.
+
+    The exception is delivered between bytecodes, so code blocked in a native call is only
+    interrupted when the call returns; ``trial_timeout_sec`` covers that case.
+    """
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        self.seconds = seconds
+        self._lock = threading.Lock()
+        self._done = False
+        self._fired = False
+        self._timer: Optional[threading.Timer] = None
+
+    def _fire(self, thread_id: int) -> None:
+        with self._lock:
+            if self._done:
+                return
+            self._fired = True
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(TrialTimeout))
+
+    def __enter__(self) -> "SoftDeadline":
+        if self.seconds is not None:
+            self._timer = threading.Timer(self.seconds, self._fire, args=(threading.get_ident(),))
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        if self._timer is None:
+            return False
+        with self._lock:
+            self._done = True
+        self._timer.cancel()
+        if self._fired and exc_type is None:
+            # Fired as execute returned: drop the exception if it has not been delivered yet.
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(threading.get_ident()), None)
+        return False
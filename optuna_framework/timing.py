@@ -0,0 +1,172 @@
+import contextlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from optuna_framework.attrs import register_attrs
+from optuna_framework.logs import log
+
+register_attrs("phase_timings")
+
+PHASES = ("ask", "suggest", "validate", "prune", "execute", "attrs", "tell", "hooks")
+
+_NULL = contextlib.nullcontext()
+
+
+class PhaseTimer:
+    """Per-process phase durations: open per-trial records plus one compact array per phase."""
+
+    def __init__(self, store_attrs: bool = False) -> None:
+        self.store_attrs = store_attrs
+        self.samples: Dict[str, array] = {name: array("d") for name in PHASES + ("total",)}
+        self._open: Dict[int, Dict[str, float]] = {}
+        self._started: Dict[int, float] = {}
+
+    def add(self, trial: Any, name: str, seconds: float) -> None:
+        number = trial.number
+        record = self._open.get(number)
+        if record is None:
+            record = self._open[number] = {}
+            self._started[number] = time.perf_counter() - seconds
+        record[name] = record.get(name, 0.0) + seconds
+
+    def annotate(self, trial: Any) -> None:
+        record = self._open.get(trial.number)
+        if self.store_attrs and record:
+            trial.set_user_attr("phase_timings", {name: round(sec, 6) for name, sec in record.items()})
+
+    def close(self, trial: Any) -> None:
+        record = self._open.pop(trial.number, None)
+        started = self._started.pop(trial.number, None)
+        if record is None:
+            return
+        for name, seconds in record.items():
+            self.samples[name].append(seconds)
+        self.samples["total"].append(time.perf_counter() - started)
+
+
+_TIMER: Optional[PhaseTimer] = None
+
+
+class _Phase:
+    __slots__ = ("trial", "name", "t0")
+
+    def __init__(self, trial: Any, name: str) -> None:
+        self.trial = trial
+        self.name = name
+
+    def __enter__(self) -> "_Phase":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        if _TIMER is not None:
+            _TIMER.add(self.trial, self.name, time.perf_counter() - self.t0)
+        return False
+
+
+def phase(trial: Any, name: str) -> Any:
+    """Time a block as ``name`` for ``trial``; a shared no-op when timing is off."""
+    if _TIMER is None:
+        return _NULL
+    return _Phase(trial, name)
+
+
+def record_phase(trial: Any, name: str, seconds: float) -> None:
+    if _TIMER is not None:
+        _TIMER.add(trial, name, seconds)
+
+
+def annotate_phases(trial: Any) -> None:
+    """Store the phases timed so far as the ``phase_timings`` user attr (before tell)."""
+    if _TIMER is not None:
+        _TIMER.annotate(trial)
+
+
+def close_phases(trial: Any) -> None:
+    if _TIMER is not None:
+        _TIMER.close(trial)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+
+@dataclass
+class PhaseTiming:
+    """Picklable phase-timing settings; every worker dumps its samples into ``out_dir`` for the parent."""
+
+    store_attrs: bool = False
+    out_dir: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, opt_cfg: Dict[str, Any]) -> Optional["PhaseTiming"]:
+        if not bool(opt_cfg.get("phase_timing", False)):
+            return None
+        return cls(bool(opt_cfg.get("phase_timing_attrs", False)))
+
+    def prepare(self) -> None:
+        """Create the dump directory; called by the parent inside the block whose ``finally`` runs ``report``."""
+        if self.out_dir is None:
+            self.out_dir = tempfile.mkdtemp(prefix="optuna-timing-")
+
+    def activate(self) -> PhaseTimer:
+        global _TIMER
+        _TIMER = PhaseTimer(self.store_attrs)
+        return _TIMER
+
+    def dump(self) -> None:
+        if _TIMER is None or self.out_dir is None:
+            return
+        samples = {name: values.tobytes() for name, values in _TIMER.samples.items() if values}
+        with open(os.path.join(self.out_dir, f"{os.getpid()}.pkl"), "wb") as fh:
+            pickle.dump(samples, fh)
+
+    def collect(self) -> Dict[str, List[float]]:
+        merged: Dict[str, List[float]] = {}
+        if not self.out_dir or not os.path.isdir(self.out_dir):
+            return merged
+        for entry in sorted(os.listdir(self.out_dir)):
+            with open(os.path.join(self.out_dir, entry), "rb") as fh:
+                for name, raw in pickle.load(fh).items():
+                    values = array("d")
+                    values.frombytes(raw)
+                    merged.setdefault(name, []).extend(values)
+        return merged
+
+    def report(self) -> None:
+        """Print p50/p95/p99 per phase and the framework overhead, then remove the dump directory."""
+        try:
+            samples = self.collect()
+        finally:
+            self.cleanup()
+        totals = samples.get("total", [])
+        if not totals:
+            return
+        execute = sum(samples.get("execute", []))
+        overhead = 100.0 * (sum(totals) - execute) / sum(totals) if sum(totals) > 0 else 0.0
+        log(f"[TIMING] trials={len(totals)} framework_overhead={overhead:.1f}%")
+        for name in PHASES + ("total",):
+            values = sorted(samples.get(name, []))
+            if not values:
+                continue
+            p50, p95, p99 = (_percentile(values, q) * 1e3 for q in (50, 95, 99))
+            log(
+                f"[TIMING] {name:<8} n={len(values):<6} p50={p50:.2f}ms p95={p95:.2f}ms p99={p99:.2f}ms "
+                f"sum={sum(values):.2f}s",
+                phase=name,
+                n=len(values),
+                p50_ms=round(p50, 3),
+                p95_ms=round(p95, 3),
+                p99_ms=round(p99, 3),
+            )
+
+    def cleanup(self) -> None:
+        if self.out_dir is not None:
+            shutil.rmtree(self.out_dir, ignore_errors=True)
+            self.out_dir = None
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import optuna
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from optuna_framework.cache import EvaluationCache  # noqa: E402
+from optuna_framework.fidelity import FidelitySpec  # noqa: E402
+from optuna_framework.objective import ObjectiveCallable  # noqa: E402
+from optuna_framework.runner import optimize_study  # noqa: E402
+from optuna_framework.search_space import CompiledSearchSpace  # noqa: E402
+from optuna_framework.timeouts import TrialTimeoutSpec  # noqa: E402
+
+from fw_adapters import SEARCH_SPACE  # noqa: E402
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+def build_objective(opt_cfg: Dict[str, Any], adapter: str, space: CompiledSearchSpace, project: Dict[str, Any]) -> Any:
+    """The objective the CLI would build for ``opt_cfg``."""
+    trial_timeout = TrialTimeoutSpec.from_config(opt_cfg)
+    fidelity = FidelitySpec.from_config(opt_cfg)
+    return ObjectiveCallable(
+        space,
+        f"fw_adapters:{adapter}",
+        meta={},
+        project=project,
+        eval_cache=EvaluationCache.from_config(opt_cfg),
+        duplicate_policy=opt_cfg.get("duplicate_policy", "none"),
+        fidelity_param=fidelity.name if fidelity is not None else None,
+        soft_timeout_sec=trial_timeout.soft_sec if trial_timeout is not None else None,
+    )
+
+
+@pytest.fixture
+def run_study(tmp_path: Path) -> Any:
+    """Run ``optimize_study`` on a fresh SQLite study in ``tmp_path`` and return the study."""
+
+    def run(
+        adapter: str = "ValueObjective",
+        search_space: Optional[Dict[str, Any]] = None,
+        project: Optional[Dict[str, Any]] = None,
+        name: str = "test",
+        join: Optional[str] = None,
+        **opt_cfg: Any,
+    ) -> optuna.Study:
+        opt_cfg.setdefault("storage_url", f"sqlite:///{(tmp_path / 'study.db').as_posix()}")
+        opt_cfg.setdefault("sampler", "random")
+        opt_cfg.setdefault("pruner", "none")
+        opt_cfg.setdefault("start_method", "fork")
+        space = CompiledSearchSpace(dict(search_space or SEARCH_SPACE))
+        project = dict(project or {}, tmp_dir=str(tmp_path))
+        objective = build_objective(opt_cfg, adapter, space, project)
+        study, *_ = optimize_study(
+            objective, {}, str(tmp_path / "params.yaml"), opt_cfg, {"name": name}, space, {}, True, 0,
+            project=project, join=join,
+        )
+        return study
+
+    return run
@@ -0,0 +1,164 @@
+"""Objective adapters used by the tests; importable from spawned workers through ``sys.path``."""
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from optuna_framework.adapters.objective import ObjectiveAdapter, TrialResult
+
+SEARCH_SPACE = {"x": {"range": [0.0, 1.0]}, "k": [1, 2, 3, 4]}
+
+
+class ValueObjective(ObjectiveAdapter):
+    """Sum of the numeric params; works for any search space."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        return float(sum(v for v in params.values() if isinstance(v, (int, float))))
+
+
+class SleepObjective(ObjectiveAdapter):
+    """Sleeps ``project.sleep_sec`` so trials overlap across workers and threads."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        time.sleep(float(self.project.get("sleep_sec", 0.05)))
+        return float(params["x"])
+
+
+class ThreadRecordingObjective(SleepObjective):
+    def setup(self) -> None:
+        self.threads = set()
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        self.threads.add(threading.get_ident())
+        trial.set_user_attr("trial_id_env", os.environ.get("TRIAL_ID"))
+        return super().execute(params, trial)
+
+
+class CrashObjective(ObjectiveAdapter):
+    """Kills its worker on trial ``project.crash_trial``."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        time.sleep(0.05)
+        if trial.number == int(self.project.get("crash_trial", 2)):
+            os._exit(3)
+        return float(params["x"])
+
+
+class ReportingObjective(ObjectiveAdapter):
+    """Reports a short curve and sets attrs, some of them twice."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        for step in range(5):
+            trial.report(float(params["x"]) * step, step)
+        trial.set_user_attr("stage", "started")
+        trial.set_user_attr("stage", "done")
+        trial.set_user_attr("seen", dict(trial.user_attrs))
+        return float(params["x"])
+
+
+class FlakyObjective(ObjectiveAdapter):
+    """Raises on every third trial."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        if trial.number % 3 == 0:
+            raise RuntimeError("flaky")
+        return float(params["x"])
+
+
+class FailingObjective(ObjectiveAdapter):
+    """Raises on every trial, like an adapter whose import is broken."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        raise RuntimeError("always fails")
+
+
+class HangObjective(ObjectiveAdapter):
+    """Trial ``project.hang_trial`` runs for a minute: in Python code, or in one blocking call when ``blocking``."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        if trial.number == int(self.project.get("hang_trial", 1)):
+            if self.project.get("blocking"):
+                time.sleep(60)
+            deadline = time.time() + 60
+            while time.time() < deadline:
+                time.sleep(0.01)
+        return float(params["x"])
+
+
+class AttrsObjective(ObjectiveAdapter):
+    """Returns a TrialResult whose attrs the cache keeps; fingerprinted by ``project.fingerprint``."""
+
+    def cache_fingerprint(self) -> Any:
+        return self.project.get("fingerprint")
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> Any:
+        trial.set_user_attr("executed", True)
+        return TrialResult(float(params["k"]), {"double": 2 * params["k"]})
+
+
+class SharedObjective(ObjectiveAdapter):
+    """Reads a parent-published array and blob in every worker."""
+
+    def prepare_shared(self) -> Dict[str, Any]:
+        import numpy as np
+
+        return {"table": np.arange(40, dtype=np.float64).reshape(10, 4), "blob": b"abc"}
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        table = self.shared["table"]
+        trial.set_user_attr("writeable", bool(table.flags.writeable))
+        return float(table[trial.number % 10, 1]) + len(bytes(self.shared["blob"]))
+
+
+class BatchObjective(ObjectiveAdapter):
+    """Scores whole batches; trial 3 is pruned and trial 5 fails through their slots."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        raise AssertionError("execute_batch should be used")
+
+    def execute_batch(self, params_list: Any, trials: Any) -> Any:
+        import optuna
+
+        results: Any = []
+        for params, trial in zip(params_list, trials):
+            trial.set_user_attr("batch", [t.number for t in trials])
+            if trial.number == 3:
+                results.append(optuna.TrialPruned("slot pruned"))
+            elif trial.number == 5:
+                results.append(RuntimeError("slot failed"))
+            else:
+                results.append(float(params["x"]))
+        return results
+
+
+class BadBatchObjective(BatchObjective):
+    def execute_batch(self, params_list: Any, trials: Any) -> Any:
+        return [0.0]
+
+
+class CurveObjective(ObjectiveAdapter):
+    """Every trial's curve is worse than the ones before it, so pruners stop the later ones."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        import optuna
+
+        for step in range(5):
+            trial.report(-float(trial.number), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned(f"pruned at step {step}")
+        return -float(trial.number)
+
+
+class PidObjective(ObjectiveAdapter):
+    """Records the worker's pid as attr ``pid``."""
+
+    def execute(self, params: Dict[str, Any], trial: Any) -> float:
+        trial.set_user_attr("pid", os.getpid())
+        return 1.0
+
+
+class SlowInitObjective(ValueObjective):
+    """Takes ``project.init_sec`` to set up, like an adapter importing a heavy framework."""
+
+    def setup(self) -> None:
+        time.sleep(float(self.project.get("init_sec", 0.5)))
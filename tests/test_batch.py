@@ -0,0 +1,23 @@
+import pytest
+from optuna.trial import TrialState
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_batches_are_scored_together_and_told_per_trial(run_study, executor):
+    study = run_study("BatchObjective", n_trials=12, n_jobs=2, executor=executor, batch_size=4)
+    assert len(study.trials) == 12
+    states = {t.number: t.state for t in study.trials}
+    assert states.pop(3) == TrialState.PRUNED
+    assert states.pop(5) == TrialState.FAIL
+    assert set(states.values()) == {TrialState.COMPLETE}
+    assert max(len(t.user_attrs["batch"]) for t in study.trials if "batch" in t.user_attrs) > 1
+
+
+def test_wrong_result_count_fails_the_whole_batch(run_study):
+    with pytest.raises(RuntimeError, match="No completed trials"):
+        run_study("BadBatchObjective", n_trials=4, n_jobs=1, batch_size=2)
+
+
+def test_batch_size_is_rejected_with_dispatcher(run_study):
+    with pytest.raises(ValueError, match="batch_size"):
+        run_study(n_trials=4, n_jobs=2, batch_size=2, dispatcher=True)
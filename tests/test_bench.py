@@ -0,0 +1,41 @@
+import pytest
+
+from optuna_framework import bench
+
+
+def _case(backend, executor="process"):
+    return {
+        "objective": "noop",
+        "backend": backend,
+        "sampler": "random",
+        "n_jobs": 2,
+        "params": 3,
+        "trials": 10,
+        "prefill": 0,
+        "executor": executor,
+        "start_method": "fork",
+        "sleep_sec": 0.0,
+        "cpu_size": 8,
+        "seed": 0,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _query_counter():
+    bench._install_query_counter()
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_run_case_separates_startup_from_overhead(tmp_path, executor):
+    result = bench.run_case(_case("sqlite", executor), tmp_path, 0)
+    assert result["trials_done"] == 10
+    assert result["startup_sec"] > 0
+    # Startup is reported on its own, so it cannot dominate the per-trial figure.
+    assert result["overhead_ms_per_trial"] < 1e3 * result["wall_sec"] / result["trials_done"] * result["n_jobs"]
+    assert result["queries_per_trial"] > 0
+
+
+def test_journal_backend_reports_no_query_count(tmp_path):
+    result = bench.run_case(_case("journal"), tmp_path, 0)
+    assert result["trials_done"] == 10
+    assert result["queries"] is None and result["queries_per_trial"] is None
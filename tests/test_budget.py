@@ -0,0 +1,131 @@
+import multiprocessing
+
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.budget import SharedTrialBudget, StorageTrialBudget, count_trials, resolve_budget_mode
+
+
+def _claim_all(budget, claimed):
+    while budget.claim():
+        with claimed.get_lock():
+            claimed.value += 1
+
+
+def test_shared_budget_claims_are_exact_across_processes():
+    ctx = multiprocessing.get_context("fork")
+    budget = SharedTrialBudget(ctx, 500, initial=3)
+    claimed = ctx.Value("i", 0)
+    procs = [ctx.Process(target=_claim_all, args=(budget, claimed)) for _ in range(8)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert claimed.value == 497
+    assert budget.used == 500
+
+
+def test_settle_releases_slots_not_counted_by_the_mode():
+    ctx = multiprocessing.get_context("fork")
+    budget = SharedTrialBudget(ctx, 2, "complete")
+    assert budget.claim() and budget.claim() and not budget.claim()
+    budget.settle(TrialState.FAIL)
+    assert budget.used == 1
+    budget.settle(TrialState.COMPLETE)
+    assert budget.used == 1
+
+
+def test_resolve_budget_mode():
+    assert resolve_budget_mode("completed+pruned") == "complete_pruned"
+    with pytest.raises(ValueError, match="budget_mode"):
+        resolve_budget_mode("some")
+
+
+@pytest.mark.parametrize("n_jobs", [1, 4])
+def test_run_stops_at_exactly_n_trials(run_study, n_jobs):
+    study = run_study("SleepObjective", n_trials=17, n_jobs=n_jobs, project={"sleep_sec": 0.01})
+    assert len(study.trials) == 17
+
+
+def test_complete_mode_replaces_failed_trials(run_study):
+    study = run_study("FlakyObjective", n_trials=12, n_jobs=3, budget_mode="complete")
+    assert sum(t.state == TrialState.COMPLETE for t in study.trials) == 12
+    assert all(t.state in (TrialState.COMPLETE, TrialState.FAIL) for t in study.trials)
+
+
+def test_continued_study_counts_existing_trials(run_study):
+    run_study(n_trials=6, n_jobs=2)
+    study = run_study(n_trials=10, n_jobs=2)
+    assert len(study.trials) == 10
+
+
+def test_storage_budget_counts_in_flight_trials(tmp_path):
+    storage = optuna.storages.RDBStorage(f"sqlite:///{(tmp_path / 'b.db').as_posix()}")
+    study = optuna.create_study(storage=storage)
+    study.tell(study.ask(), 1.0)
+    study.ask()
+    budget = StorageTrialBudget(storage, study._study_id, 3, "complete")
+    assert count_trials(storage, study._study_id, (TrialState.COMPLETE,)) == 1
+    assert budget.used == 2
+    study.ask()
+    assert not budget.claim()
+
+
+def test_storage_budget_fails_trials_asked_past_the_budget(tmp_path):
+    storage = optuna.storages.RDBStorage(f"sqlite:///{(tmp_path / 'b.db').as_posix()}")
+    study = optuna.create_study(storage=storage)
+    budget = StorageTrialBudget(storage, study._study_id, 2, "complete")
+    # Three workers passed the pre-check together.
+    trials = [study.ask() for _ in range(3)]
+    assert [budget.confirm(study, t) for t in trials] == [True, True, False]
+    surplus = study.trials[2]
+    assert surplus.state == TrialState.FAIL and surplus.user_attrs["budget_surplus"]
+    study.tell(trials[0], state=TrialState.FAIL)
+    # The freed slot goes to the next trial asked.
+    assert budget.claim() and budget.confirm(study, study.ask())
+
+
+@pytest.mark.parametrize("executor, n_jobs", [("thread", 8), ("process", 4)])
+def test_storage_budget_is_exact_under_concurrency(run_study, executor, n_jobs):
+    study = run_study(
+        "SleepObjective", n_trials=20, n_jobs=n_jobs, executor=executor, budget_source="storage",
+        project={"sleep_sec": 0.01},
+    )
+    run = [t for t in study.trials if not t.user_attrs.get("budget_surplus")]
+    assert len(run) == 20
+    assert all(t.state == TrialState.COMPLETE for t in run)
+    assert all(t.state == TrialState.FAIL for t in study.trials if t.user_attrs.get("budget_surplus"))
+
+
+def test_consecutive_failures_stop_a_budget_that_gives_failures_back():
+    ctx = multiprocessing.get_context("fork")
+    budget = SharedTrialBudget(ctx, 10, "complete", max_failures=2)
+    budget.claim()
+    budget.settle(TrialState.FAIL)
+    budget.settle(TrialState.COMPLETE)
+    budget.settle(TrialState.FAIL)
+    assert not budget.failing and budget.claim()
+    budget.settle(TrialState.FAIL)
+    assert budget.failing and not budget.claim()
+    assert "max_consecutive_failures=2" in budget.exhausted_reason()
+    # Failures count toward the budget in "all" mode, so the run ends on its own.
+    assert not SharedTrialBudget(ctx, 10, "all", max_failures=1).failing
+
+
+@pytest.mark.parametrize("budget_source", ["shared", "storage"])
+def test_always_failing_objective_does_not_loop_forever(run_study, tmp_path, budget_source):
+    with pytest.raises(RuntimeError, match="No completed trials"):
+        run_study(
+            "FailingObjective", n_trials=5, n_jobs=2, budget_mode="complete", budget_source=budget_source,
+            max_consecutive_failures=4,
+        )
+    study = optuna.load_study(study_name="test", storage=f"sqlite:///{(tmp_path / 'study.db').as_posix()}")
+    assert all(t.state == TrialState.FAIL for t in study.trials)
+    # Shared: 4 in total, plus a trial in flight. Storage: each process stops after its own 4.
+    assert 4 <= len(study.trials) <= 8
+
+
+def test_invalid_max_consecutive_failures(run_study):
+    with pytest.raises(ValueError, match="max_consecutive_failures"):
+        run_study(n_trials=2, max_consecutive_failures=0)
@@ -0,0 +1,88 @@
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.buffered import BufferedTrial
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_buffered_attrs_and_reports_are_stored_on_tell(run_study, executor):
+    study = run_study(
+        "ReportingObjective", n_trials=6, n_jobs=2, executor=executor, write_buffer=True, write_buffer_reports=3
+    )
+    for trial in study.trials:
+        assert trial.state == TrialState.COMPLETE
+        assert trial.user_attrs["stage"] == "done"
+        assert trial.user_attrs["seen"]["stage"] == "done"
+        assert trial.intermediate_values == {step: trial.params["x"] * step for step in range(5)}
+
+
+def test_buffered_reports_reach_the_pruner():
+    study = optuna.create_study(pruner=optuna.pruners.MedianPruner(n_startup_trials=1, n_warmup_steps=0))
+    first = study.ask()
+    first.report(0.0, 0)
+    study.tell(first, 0.0)
+    trial = BufferedTrial(study.ask(), report_every=10)
+    trial.report(5.0, 0)
+    assert study._storage.get_trial(trial._trial_id).intermediate_values == {}
+    # Minimizing: 5.0 is worse than the median 0.0, so the buffered report must be seen.
+    assert trial.should_prune()
+    assert study._storage.get_trial(trial._trial_id).intermediate_values == {0: 5.0}
+
+
+def _rdb_study(tmp_path, **kwargs):
+    storage = optuna.storages.RDBStorage(f"sqlite:///{(tmp_path / 'study.db').as_posix()}")
+    return optuna.create_study(storage=storage, **kwargs), storage
+
+
+def _count_commits(storage):
+    from sqlalchemy import event
+
+    commits = []
+    event.listen(storage.engine, "commit", lambda conn: commits.append(1))
+    return commits
+
+
+def test_flush_is_one_transaction_on_rdb(tmp_path):
+    study, storage = _rdb_study(tmp_path)
+    commits = _count_commits(storage)
+    trial = BufferedTrial(study.ask(), report_every=100)
+    del commits[:]
+    for step in range(5):
+        trial.set_user_attr(f"attr{step}", {"step": step})
+        trial.report(float(step), step)
+    assert commits == []
+    trial.flush()
+    assert len(commits) == 1
+    stored = storage.get_trial(trial._trial_id)
+    assert stored.user_attrs == {f"attr{step}": {"step": step} for step in range(5)}
+    assert stored.intermediate_values == {step: float(step) for step in range(5)}
+    # The trial's local copy is in step, so a later report of a flushed step is ignored.
+    assert trial.trial.user_attrs["attr4"] == {"step": 4}
+    trial.set_user_attr("attr0", "again")
+    trial.report(99.0, 0)
+    trial.report(float("inf"), 5)
+    trial.flush()
+    stored = storage.get_trial(trial._trial_id)
+    assert stored.user_attrs["attr0"] == "again"
+    assert stored.intermediate_values[0] == 0.0 and stored.intermediate_values[5] == float("inf")
+
+
+def test_buffered_reports_reach_the_pruner_on_rdb(tmp_path):
+    study, storage = _rdb_study(tmp_path, pruner=optuna.pruners.MedianPruner(n_startup_trials=1, n_warmup_steps=0))
+    first = study.ask()
+    first.report(0.0, 0)
+    study.tell(first, 0.0)
+    trial = BufferedTrial(study.ask(), report_every=10)
+    trial.report(5.0, 0)
+    assert trial.should_prune()
+
+
+def test_flush_after_tell_is_rejected(tmp_path):
+    study, storage = _rdb_study(tmp_path)
+    trial = BufferedTrial(study.ask())
+    trial.set_user_attr("late", 1)
+    study.tell(trial.trial, 1.0)
+    with pytest.raises(optuna.exceptions.UpdateFinishedTrialError):
+        trial.flush()
+    assert "late" not in storage.get_trial(trial._trial_id).user_attrs
@@ -0,0 +1,92 @@
+import threading
+
+from optuna_framework.cache import EvaluationCache
+
+
+def test_cache_is_usable_from_several_threads(tmp_path):
+    cache = EvaluationCache(str(tmp_path / "cache.db"))
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(20):
+                cache.put(f"k{offset}-{i}", float(i), {"offset": offset})
+                assert cache.get(f"k{offset}-{i}") == (float(i), {"offset": offset})
+        except Exception as exc:  # collected for the main thread
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.close()
+    assert errors == []
+    reopened = EvaluationCache(str(tmp_path / "cache.db"))
+    assert reopened.get("k3-19") == (19.0, {"offset": 3})
+    reopened.close()
+
+
+def _stored_size(cache):
+    conn = cache._connect()
+    return int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM evaluations").fetchone()[0])
+
+
+def test_eviction_keeps_cache_under_limit(tmp_path):
+    cache = EvaluationCache(str(tmp_path / "cache.db"), max_size_mb=0.001)
+    for i in range(200):
+        cache.put(f"key-{i:04d}", float(i), {"pad": "x" * 20})
+    assert _stored_size(cache) <= cache.max_size_bytes
+    # Least recently used entries go first.
+    assert cache.get("key-0000") is None
+    assert cache.get("key-0199") == (199.0, {"pad": "x" * 20})
+    cache.close()
+
+
+def test_size_total_tracks_replace_and_other_connections(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first, second = EvaluationCache(path), EvaluationCache(path)
+    first.put("a", 1.0, {"v": "short"})
+    second.put("a", 2.0, {"v": "much longer than before"})
+    second.put("b", 3.0, {})
+    total = first._connect().execute("SELECT total FROM cache_size").fetchone()[0]
+    assert total == _stored_size(first)
+    first.close()
+    second.close()
+
+
+def test_size_total_is_seeded_from_existing_rows(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EvaluationCache(path)
+    cache.put("a", 1.0, {"v": 1})
+    conn = cache._connect()
+    conn.execute("DROP TABLE cache_size")
+    cache.close()
+    reopened = EvaluationCache(path)
+    total = reopened._connect().execute("SELECT total FROM cache_size").fetchone()[0]
+    assert total == _stored_size(reopened) > 0
+    reopened.close()
+
+
+CHOICES = {"k": [1, 2, 3]}
+
+
+def test_cache_is_reused_across_study_versions(run_study, tmp_path):
+    cache = str(tmp_path / "evals.db")
+    first = run_study("AttrsObjective", CHOICES, name="v1", n_trials=3, n_jobs=1, sampler="grid", eval_cache=cache)
+    assert all(t.user_attrs["executed"] and "cache_hit" not in t.user_attrs for t in first.trials)
+    second = run_study("AttrsObjective", CHOICES, name="v2", n_trials=3, n_jobs=2, sampler="grid", eval_cache=cache)
+    for trial in second.trials:
+        assert trial.user_attrs["cache_hit"] is True
+        assert "executed" not in trial.user_attrs
+        assert trial.value == trial.params["k"] and trial.user_attrs["double"] == 2 * trial.params["k"]
+
+
+def test_cache_fingerprint_separates_entries(run_study, tmp_path):
+    cache = str(tmp_path / "evals.db")
+    run_study("AttrsObjective", CHOICES, name="v1", n_trials=3, n_jobs=1, sampler="grid", eval_cache=cache)
+    study = run_study(
+        "AttrsObjective", CHOICES, project={"fingerprint": "data-v2"}, name="v2", n_trials=3, n_jobs=1,
+        sampler="grid", eval_cache=cache,
+    )
+    assert all(t.user_attrs["executed"] for t in study.trials)
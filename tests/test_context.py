@@ -0,0 +1,69 @@
+import json
+
+import optuna
+import pytest
+
+from optuna_framework.context import TrialContext
+
+
+def _trial():
+    study = optuna.create_study()
+    trial = study.ask()
+    trial.suggest_int("k", 1, 4)
+    trial.set_user_attr("stage", "fit")
+    return trial
+
+
+def test_context_without_trial_only_has_set_keys():
+    context = TrialContext("worker", "study", phase="", worker_id="2")
+    assert dict(context) == {"role": "worker", "study_name": "study", "worker_id": 2}
+    assert "params" not in context and len(context) == 3
+    with pytest.raises(KeyError):
+        context["params"]
+    with pytest.raises(KeyError):
+        context["unknown"]
+
+
+def test_context_copies_trial_dicts_lazily():
+    trial = _trial()
+    context = TrialContext("trial", "study", trial, value=1, state="COMPLETE", error=RuntimeError("boom"))
+    assert context["trial_number"] == 0 and "params" in context
+    assert context._trial is trial
+    assert context["params"] == {"k": trial.params["k"]}
+    assert context._trial is None
+    assert context.user_attrs == {"stage": "fit"}
+    context["params"]["k"] = 99
+    context["user_attrs"]["stage"] = "changed"
+    assert trial.params["k"] != 99 and trial.user_attrs["stage"] == "fit"
+    assert context.params["k"] == 99
+    assert (context["value"], context["state"], context["error"]) == (1.0, "COMPLETE", "boom")
+    assert list(context) == ["role", "study_name", "trial_number", "params", "user_attrs", "value", "state", "error"]
+
+
+def test_context_is_a_dict():
+    trial = _trial()
+    context = TrialContext("trial", "study", trial, value=1)
+    assert isinstance(context, dict)
+    assert json.loads(json.dumps(context)) == {
+        "role": "trial",
+        "study_name": "study",
+        "trial_number": 0,
+        "params": trial.params,
+        "user_attrs": {"stage": "fit"},
+        "value": 1.0,
+    }
+    copied = TrialContext("trial", "study", trial).copy()
+    assert type(copied) is dict and copied["params"] == trial.params
+    assert {**TrialContext("trial", "study", trial)}["user_attrs"] == {"stage": "fit"}
+    context = TrialContext("trial", "study", trial)
+    context["extra"] = 1
+    del context["user_attrs"]
+    assert context == {"role": "trial", "study_name": "study", "trial_number": 0, "params": trial.params, "extra": 1}
+
+
+def test_context_accepts_frozen_trials():
+    trial = _trial()
+    frozen = trial.study.trials[0]
+    context = TrialContext("trial", "study", frozen)
+    assert context.get("params") == frozen.params
+    assert context.get("phase", "none") == "none"
@@ -0,0 +1,49 @@
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.deadline import DurationEstimate, StudyDeadline, duration_alpha
+
+
+def test_duration_estimate_is_an_ewma():
+    estimate = DurationEstimate(0.5, [2.0, 4.0])
+    assert estimate.value == pytest.approx(3.0)
+    estimate.update(-1.0)
+    assert estimate.value == pytest.approx(1.5)
+
+
+def test_deadline_admits_only_trials_predicted_to_fit():
+    assert StudyDeadline(None).admits()
+    deadline = StudyDeadline(10, DurationEstimate(0.3))
+    assert deadline.admits()
+    deadline.record(5.0)
+    assert deadline.admits()
+    deadline.record(30.0)
+    assert not deadline.admits()
+    assert 9 <= deadline.budget_attrs()["time_budget_sec"] <= 10
+
+
+def test_duration_alpha_from_config():
+    assert duration_alpha({}) is None
+    assert duration_alpha({"timeout_sec": 5, "deadline_aware": False}) is None
+    assert duration_alpha({"timeout_sec": 5}) == 0.3
+    with pytest.raises(ValueError, match="duration_ewma_alpha"):
+        duration_alpha({"timeout_sec": 5, "duration_ewma_alpha": 0})
+
+
+def _span(study):
+    trials = [t for t in study.trials if t.state == TrialState.COMPLETE]
+    start = min(t.datetime_start for t in trials)
+    return (max(t.datetime_complete for t in trials) - start).total_seconds()
+
+
+def test_study_timeout_is_not_overshot(run_study):
+    project = {"sleep_sec": 1.5}
+    study = run_study("SleepObjective", project=project, n_trials=50, n_jobs=2, timeout_sec=2)
+    assert _span(study) < 2.0
+    assert all("time_budget_sec" in t.user_attrs for t in study.trials)
+
+
+def test_deadline_unaware_run_overshoots(run_study):
+    project = {"sleep_sec": 1.5}
+    study = run_study("SleepObjective", project=project, n_trials=50, n_jobs=2, timeout_sec=2, deadline_aware=False)
+    assert _span(study) > 2.0
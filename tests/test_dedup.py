@@ -0,0 +1,82 @@
+import pickle
+
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.cache import canonical_params_hash
+from optuna_framework.dedup import DuplicateIndex, resolve_duplicate_policy
+
+CHOICES = {"k": [1, 2]}
+
+
+def _unique_complete(study):
+    return {t.params["k"] for t in study.trials if t.state == TrialState.COMPLETE and "duplicate_of" not in t.user_attrs}
+
+
+def test_reuse_returns_the_earlier_result_without_executing(run_study):
+    study = run_study("AttrsObjective", CHOICES, n_trials=8, n_jobs=1, duplicate_policy="reuse")
+    executed = [t for t in study.trials if t.user_attrs.get("executed")]
+    assert len(executed) == len({t.params["k"] for t in executed})
+    for trial in study.trials:
+        assert trial.state == TrialState.COMPLETE
+        assert trial.value == trial.params["k"]
+        if "duplicate_of" in trial.user_attrs:
+            original = study.trials[trial.user_attrs["duplicate_of"]]
+            assert original.params == trial.params and trial.user_attrs["double"] == 2 * trial.params["k"]
+
+
+def test_prune_marks_duplicates_pruned(run_study):
+    study = run_study("AttrsObjective", CHOICES, n_trials=8, n_jobs=1, duplicate_policy="prune")
+    complete = [t for t in study.trials if t.state == TrialState.COMPLETE]
+    assert len(complete) == len({t.params["k"] for t in complete})
+    assert all(
+        t.state == TrialState.PRUNED and "duplicate_of" in t.user_attrs
+        for t in study.trials
+        if t.state != TrialState.COMPLETE
+    )
+
+
+def test_resample_gives_the_slot_back_until_the_limit(run_study):
+    study = run_study(
+        "AttrsObjective", CHOICES, n_trials=4, n_jobs=1, duplicate_policy="resample", budget_mode="all"
+    )
+    assert _unique_complete(study) == {1, 2}
+    # Resampled duplicates do not consume the budget, so more than n_trials trials were asked.
+    assert len(study.trials) > 4
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="duplicate_policy"):
+        resolve_duplicate_policy("skip")
+
+
+def test_index_syncs_incrementally_and_keeps_only_result_attrs(monkeypatch):
+    study = optuna.create_study()
+    index = DuplicateIndex()
+    scans = []
+    get_trials = study.get_trials
+    monkeypatch.setattr(study, "get_trials", lambda *a, **k: scans.append(1) or get_trials(*a, **k))
+    for k in range(20):
+        trial = study.ask()
+        trial.suggest_int("k", k, k)
+        # Set by another worker: one objective attr and two the framework owns.
+        trial.set_user_attr("double", 2 * k)
+        trial.set_user_attr("phase_timings", {"execute": 0.1})
+        trial.set_user_attr("time_budget_sec", 5.0)
+        running = study.ask()
+        index.sync(study)
+        study.tell(trial, float(k))
+        study.tell(running, state=TrialState.FAIL)
+    index.sync(study)
+    assert scans == [1]
+    entry = index.lookup(canonical_params_hash({"k": 7}))
+    assert entry["number"] == 14 and entry["value"] == 7.0
+    assert entry["user_attrs"] == {"double": 14}
+
+
+def test_index_pickles_without_its_state():
+    index = DuplicateIndex("epochs")
+    index.add("key", 0, 1.0, {})
+    clone = pickle.loads(pickle.dumps(index))
+    assert clone.fidelity_param == "epochs" and clone.lookup("key") is None
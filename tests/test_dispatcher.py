@@ -0,0 +1,50 @@
+import multiprocessing
+import queue
+
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.budget import SharedTrialBudget
+from optuna_framework.dispatcher import dispatch_trials
+from optuna_framework.search_space import CompiledSearchSpace
+
+from fw_adapters import SEARCH_SPACE
+
+
+def test_dispatcher_runs_budget(run_study):
+    study = run_study(n_trials=10, n_jobs=2, dispatcher=True)
+    assert len(study.trials) == 10
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
+
+
+def test_dispatcher_rejects_pruner(run_study):
+    with pytest.raises(ValueError, match="dispatcher"):
+        run_study(n_trials=4, n_jobs=2, dispatcher=True, pruner="median")
+
+
+def test_dispatcher_worker_death_fails_its_trial(run_study):
+    study = run_study("CrashObjective", n_trials=8, n_jobs=2, dispatcher=True)
+    states = {t.number: t.state for t in study.trials}
+    assert states[2] == TrialState.FAIL
+    assert "worker" in study.trials[2].user_attrs["dispatch_error"]
+    # The surviving worker finishes the rest of the budget.
+    assert sum(state == TrialState.COMPLETE for state in states.values()) == 7
+
+
+class _Proc:
+    def __init__(self, alive):
+        self.alive = alive
+
+    def is_alive(self):
+        return self.alive
+
+
+def test_worker_dead_before_recording_task_does_not_hang():
+    study = optuna.create_study(direction="maximize")
+    space = CompiledSearchSpace(SEARCH_SPACE)
+    budget = SharedTrialBudget(multiprocessing.get_context("fork"), 3, "all")
+    # Worker 1 died idle or between get() and recording its task; worker 2 is alive but never answers.
+    claimed = [-1, -1]
+    dispatch_trials(study, space, budget, queue.Queue(), queue.Queue(), claimed, [_Proc(False), _Proc(True)], 1, None)
+    assert [t.state for t in study.trials] == [TrialState.FAIL] * 3
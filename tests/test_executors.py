@@ -0,0 +1,36 @@
+import os
+import warnings
+
+import optuna
+import pytest
+
+
+def test_thread_executor_with_eval_cache(run_study, tmp_path, monkeypatch):
+    monkeypatch.delenv("TRIAL_ID", raising=False)
+    study = run_study(
+        "ThreadRecordingObjective",
+        n_trials=20,
+        n_jobs=2,
+        executor="thread",
+        eval_cache=str(tmp_path / "cache.db"),
+    )
+    assert len(study.trials) == 20
+    assert all(t.state == optuna.trial.TrialState.COMPLETE for t in study.trials)
+    # TRIAL_ID is process-global, so the in-process executors leave it unset.
+    assert all(t.user_attrs["trial_id_env"] is None for t in study.trials)
+
+
+def test_async_executor_completes_budget(run_study):
+    study = run_study("SleepObjective", n_trials=12, n_jobs=1, concurrency=4, executor="async")
+    assert len(study.trials) == 12
+    assert all(t.state == optuna.trial.TrialState.COMPLETE for t in study.trials)
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_in_process_executors_leave_coordinator_settings(run_study, monkeypatch, executor):
+    monkeypatch.delenv("OPTUNA_WORKER_ROLE", raising=False)
+    filters = list(warnings.filters)
+    study = run_study(n_trials=4, n_jobs=1, concurrency=2, executor=executor)
+    assert len(study.trials) == 4
+    assert "OPTUNA_WORKER_ROLE" not in os.environ
+    assert warnings.filters == filters
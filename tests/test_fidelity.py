@@ -0,0 +1,94 @@
+import multiprocessing
+
+import optuna
+import pytest
+
+from optuna_framework.fidelity import FidelityScheduler, FidelitySpec, fidelity_params
+from optuna_framework.recovery import AskLock
+
+
+def test_fidelity_budgets_follow_eta():
+    assert FidelitySpec("epochs", 1, 27).budgets() == [1, 3, 9, 27]
+    assert FidelitySpec("epochs", 1, 10).budgets() == [1, 3, 9, 10]
+    assert FidelitySpec("frac", 0.1, 1.0, 2).budgets() == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0])
+
+
+@pytest.mark.parametrize(
+    "cfg, message",
+    [
+        ({"name": "epochs", "min": 1}, "requires name, min and max"),
+        ({"name": "epochs", "min": 5, "max": 5}, "0 < min < max"),
+        ({"name": "epochs", "min": 1, "max": 9, "eta": 1}, "eta must be > 1"),
+    ],
+)
+def test_invalid_fidelity_is_rejected(cfg, message):
+    with pytest.raises(ValueError, match=message):
+        FidelitySpec.from_config({"fidelity": cfg})
+
+
+def test_fidelity_params_adds_the_budget():
+    assert fidelity_params({"x": 1}, {"fidelity_budget": 3}, "epochs") == {"x": 1, "epochs": 3}
+    assert fidelity_params({"x": 1}, {}, "epochs") == {"x": 1}
+
+
+def test_scheduler_promotes_top_trials():
+    study = optuna.create_study(direction="maximize")
+    scheduler = FidelityScheduler(FidelitySpec("epochs", 1, 9), AskLock(multiprocessing.get_context("fork"), 5))
+    for value in (1.0, 3.0, 2.0):
+        trial = scheduler.ask(study)
+        trial.suggest_float("x", 0, 1)
+        study.tell(trial, value)
+    promoted = scheduler.ask(study)
+    assert promoted.user_attrs == {"fidelity_rung": 1, "fidelity_budget": 3, "fidelity_parent": 1}
+    assert promoted.suggest_float("x", 0, 1) == study.trials[1].params["x"]
+    study.tell(promoted, 4.0)
+    assert scheduler.ask(study).user_attrs["fidelity_rung"] == 0
+
+
+def test_fidelity_run_passes_budgets_to_the_adapter(run_study):
+    study = run_study(n_trials=12, n_jobs=2, fidelity={"name": "epochs", "min": 1, "max": 9, "eta": 3})
+    trials = study.trials
+    assert len(trials) == 12
+    assert {t.user_attrs["fidelity_budget"] for t in trials} >= {1, 3}
+    for t in trials:
+        assert t.value == pytest.approx(t.params["x"] + t.params["k"] + t.user_attrs["fidelity_budget"])
+        if "fidelity_parent" in t.user_attrs:
+            parent = trials[t.user_attrs["fidelity_parent"]]
+            assert t.params == parent.params
+            assert t.user_attrs["fidelity_rung"] == parent.user_attrs["fidelity_rung"] + 1
+
+
+@pytest.mark.parametrize("extra", [{"dispatcher": True}, {"sampler": "grid"}])
+def test_fidelity_rejects_dispatcher_and_grid(run_study, extra):
+    with pytest.raises(ValueError, match="fidelity scheduling is not supported"):
+        fidelity = {"name": "epochs", "min": 1, "max": 9}
+        run_study(search_space={"k": [1, 2, 3, 4]}, n_trials=4, n_jobs=2, fidelity=fidelity, **extra)
+
+
+def test_scheduler_reads_the_study_incrementally(monkeypatch):
+    study = optuna.create_study(direction="maximize")
+    scheduler = FidelityScheduler(FidelitySpec("epochs", 1, 9), AskLock(multiprocessing.get_context("fork"), 5))
+    scans = []
+    get_trials = study.get_trials
+    monkeypatch.setattr(study, "get_trials", lambda *a, **k: scans.append(1) or get_trials(*a, **k))
+    for i in range(40):
+        trial = scheduler.ask(study)
+        x = trial.suggest_float("x", 0, 1)
+        study.tell(trial, x + trial.user_attrs["fidelity_rung"])
+    # One full read when the scheduler starts; every later ask reads only new and running trials.
+    assert scans == [1]
+    children = [t for t in study.trials if "fidelity_parent" in t.user_attrs]
+    assert children and len({t.user_attrs["fidelity_parent"] for t in children}) == len(children)
+    for t in children:
+        parent = study.trials[t.user_attrs["fidelity_parent"]]
+        rung = parent.user_attrs["fidelity_rung"]
+        # Only trials in the top 1/eta of their rung when promoted are ever promoted.
+        peers = [p for p in study.trials[: t.number] if p.user_attrs["fidelity_rung"] == rung and p.value is not None]
+        better = sum(p.value > parent.value for p in peers)
+        assert better < len(peers) / 3
+
+
+def test_fidelity_run_with_spawned_workers(run_study):
+    study = run_study(n_trials=9, n_jobs=2, start_method="spawn", fidelity={"name": "epochs", "min": 1, "max": 3})
+    assert len(study.trials) == 9
+    assert any("fidelity_parent" in t.user_attrs for t in study.trials)
@@ -0,0 +1,47 @@
+import itertools
+
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.grid import GridShardSampler, ShardedGrid
+
+GRID_SPACE = {"n": {"range": [1, 4]}, "mode": ["a", "b", "c"], "lr": {"range": [0.0, 0.2], "step": 0.1}}
+
+
+def test_shards_partition_the_grid():
+    grid = ShardedGrid({"a": [1, 2, 3], "b": ["x", "y"], "c": [True, False]})
+    assert grid.size == 12
+    points = [grid.key(p) for worker_id in (1, 2, 3) for p in grid.shard(worker_id, 3)]
+    assert sorted(points) == sorted(itertools.product([1, 2, 3], ["x", "y"], [True, False]))
+    done = {grid.key(grid.point(0)), grid.key(grid.point(3))}
+    assert [grid.key(p) for p in grid.shard(1, 3, done)] == [grid.key(grid.point(i)) for i in (6, 9)]
+
+
+def test_shard_sampler_is_exhausted_after_its_points():
+    sampler = GridShardSampler()
+    sampler.feed(iter([]))
+    assert sampler.exhausted
+
+
+@pytest.mark.parametrize("dispatcher", [False, True])
+def test_sharded_grid_evaluates_every_point_once(run_study, dispatcher):
+    study = run_study(search_space=GRID_SPACE, n_trials=100, n_jobs=3, sampler="grid", dispatcher=dispatcher)
+    keys = [(t.params["n"], t.params["mode"], t.params["lr"]) for t in study.trials]
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
+    assert len(keys) == len(set(keys)) == 4 * 3 * 3
+
+
+def test_continued_grid_skips_finished_points(run_study):
+    run_study(search_space=GRID_SPACE, n_trials=10, n_jobs=2, sampler="grid")
+    study = run_study(search_space=GRID_SPACE, n_trials=100, n_jobs=2, sampler="grid")
+    keys = [(t.params["n"], t.params["mode"], t.params["lr"]) for t in study.trials]
+    assert len(keys) == len(set(keys)) == 36
+
+
+def test_continued_grid_with_list_choices(run_study):
+    space = {"shape": [[8, 8], [16, 16], [32, 8]], "k": [1, 2]}
+    run_study(search_space=space, n_trials=3, n_jobs=1, sampler="grid")
+    study = run_study(search_space=space, n_trials=100, n_jobs=2, sampler="grid")
+    keys = [(tuple(t.params["shape"]), t.params["k"]) for t in study.trials]
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
+    assert len(keys) == len(set(keys)) == 6
@@ -0,0 +1,37 @@
+import pytest
+from optuna.trial import TrialState
+
+
+def _run(study):
+    return [t for t in study.trials if not t.user_attrs.get("budget_surplus")]
+
+
+def test_joined_workers_share_the_storage_budget(run_study):
+    owner = run_study(n_trials=6, n_jobs=2, budget_source="storage")
+    assert len(_run(owner)) == 6
+    joined = run_study(n_trials=10, n_jobs=2, join="test")
+    assert joined.study_name == "test"
+    assert len(_run(joined)) == 10
+    assert all(t.state == TrialState.COMPLETE for t in _run(joined))
+
+
+def test_join_with_full_budget_runs_nothing(run_study):
+    run_study(n_trials=4, n_jobs=2, budget_source="storage")
+    assert len(_run(run_study(n_trials=4, n_jobs=2, join="test"))) == 4
+
+
+def test_join_requires_an_existing_study(run_study):
+    with pytest.raises(ValueError, match="Study 'missing' does not exist"):
+        run_study(n_trials=4, join="missing")
+
+
+@pytest.mark.parametrize(
+    "extra, message",
+    [
+        ({"budget_source": "workers"}, "Unsupported budget_source 'workers'"),
+        ({"budget_source": "storage", "fidelity": {"name": "epochs", "min": 1, "max": 9}}, "do not support fidelity"),
+    ],
+)
+def test_invalid_budget_source_config(run_study, extra, message):
+    with pytest.raises(ValueError, match=message):
+        run_study(n_trials=4, **extra)
@@ -0,0 +1,41 @@
+import json
+import logging
+import multiprocessing
+import os
+
+import pytest
+
+from optuna_framework.logs import LogHub, log
+
+
+def test_log_prints_without_a_sink(capsys):
+    log("plain message", worker_id=1)
+    assert capsys.readouterr().out == "plain message\n"
+
+
+def test_log_hub_from_config():
+    ctx = multiprocessing.get_context("fork")
+    assert LogHub.from_config(ctx, {}) is None
+    hub = LogHub.from_config(ctx, {"log_file": "run.jsonl"})
+    assert (hub.level, hub.path, hub.console) == (logging.INFO, "run.jsonl", False)
+    assert LogHub.from_config(ctx, {"log_level": "debug"}).console
+    with pytest.raises(ValueError, match="Unsupported log_level 'loud'"):
+        LogHub.from_config(ctx, {"log_level": "loud"})
+
+
+def test_worker_records_reach_the_log_file(run_study, tmp_path, capsys):
+    path = tmp_path / "run.jsonl"
+    run_study(n_trials=6, n_jobs=2, log_file=str(path))
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert records
+    assert all({"ts", "level", "pid", "msg"} <= set(record) for record in records)
+    assert os.getpid() in {record["pid"] for record in records}
+    assert {record["worker_id"] for record in records if "worker_id" in record} == {1, 2}
+    assert capsys.readouterr().out == ""
+
+
+def test_log_level_filters_records(run_study, tmp_path):
+    path = tmp_path / "run.jsonl"
+    run_study(n_trials=4, n_jobs=2, log_file=str(path), log_level="error")
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert all(record["level"] == "ERROR" for record in records)
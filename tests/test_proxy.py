@@ -0,0 +1,42 @@
+import sys
+
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.storage import StorageProxy, StorageSpec
+
+pytest.importorskip("grpc")
+
+
+def test_proxy_run_completes_budget(run_study):
+    study = run_study(n_trials=8, n_jobs=2, storage_proxy=True, start_method="spawn")
+    assert len(study.trials) == 8
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
+
+
+def test_proxy_from_config(tmp_path):
+    spec = StorageSpec.from_config({"storage_sqlite": str(tmp_path / "s.db")})
+    assert StorageProxy.from_config({}, spec) is None
+    proxy = StorageProxy.from_config({"storage_proxy": True, "storage_proxy_threads": 4}, spec)
+    assert (proxy.host, proxy.port, proxy.threads) == ("127.0.0.1", 0, 4)
+    assert spec.proxied("127.0.0.1", "5000").proxy_address == ("127.0.0.1", 5000)
+    with pytest.raises(ValueError, match="storage_proxy_threads must be > 0"):
+        StorageProxy.from_config({"storage_proxy": True, "storage_proxy_threads": 0}, spec)
+    with pytest.raises(ValueError, match="requires storage_backend: rdb"):
+        StorageProxy.from_config({"storage_proxy": True}, StorageSpec.from_config({"storage_journal": "s.log"}))
+
+
+@pytest.mark.parametrize(
+    "extra, message",
+    [({"start_method": "fork"}, "gRPC does not survive fork"), ({"executor": "thread"}, "executor: process")],
+)
+def test_proxy_rejects_fork_and_thread(run_study, extra, message):
+    with pytest.raises(ValueError, match=message):
+        run_study(n_trials=4, n_jobs=2, storage_proxy=True, **extra)
+
+
+def test_proxy_reports_missing_grpc_server(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "optuna.storages._grpc.servicer", None)
+    spec = StorageSpec.from_config({"storage_sqlite": str(tmp_path / "s.db")})
+    with pytest.raises(ImportError, match=r"Optuna >= 4.2"):
+        StorageProxy.from_config({"storage_proxy": True}, spec)
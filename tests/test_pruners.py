@@ -0,0 +1,39 @@
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.pruners import build_pruner_spec
+
+
+def test_pruner_specs_are_parsed():
+    assert build_pruner_spec({}).name == "median"
+    assert build_pruner_spec({"pruner": None}).name == "none"
+    assert build_pruner_spec({"pruner": "asha"}).name == "successive_halving"
+    spec = build_pruner_spec({"pruner": "hyperband", "pruner_options": {"min_resource": "2", "max_resource": "auto"}})
+    assert spec.options == {"min_resource": 2, "max_resource": "auto"}
+    assert isinstance(spec.build(), optuna.pruners.HyperbandPruner)
+
+
+def test_invalid_pruner_config_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported pruner 'early'"):
+        build_pruner_spec({"pruner": "early"})
+    with pytest.raises(ValueError, match="pruner_options for 'median': percentile"):
+        build_pruner_spec({"pruner": "median", "pruner_options": {"percentile": 25}})
+    with pytest.raises(ValueError, match="requires optuna.pruner_options.percentile"):
+        build_pruner_spec({"pruner": "percentile"})
+
+
+@pytest.mark.parametrize("pruner", ["median", "successive_halving"])
+def test_configured_pruner_runs_in_workers(run_study, pruner):
+    options = {"n_startup_trials": 2} if pruner == "median" else {"min_resource": 1}
+    study = run_study("CurveObjective", n_trials=8, n_jobs=1, pruner=pruner, pruner_options=options)
+    states = [t.state for t in study.trials]
+    assert states[0] == TrialState.COMPLETE
+    assert TrialState.PRUNED in states[2:]
+    pruned = next(t for t in study.trials if t.state == TrialState.PRUNED)
+    assert pruned.intermediate_values
+
+
+def test_no_pruner_never_prunes(run_study):
+    study = run_study("CurveObjective", n_trials=6, n_jobs=2, pruner="none")
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
@@ -0,0 +1,80 @@
+import multiprocessing
+import os
+import time
+import warnings
+
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.recovery import AskLock
+
+
+def test_crash_is_recovered_retried_and_respawned(run_study):
+    study = run_study(
+        "CrashObjective", n_trials=8, n_jobs=2, trial_retries=1, max_worker_restarts=1, project={"crash_trial": 2}
+    )
+    crashed = study.trials[2]
+    assert crashed.state == TrialState.FAIL
+    assert "exited with code 3" in crashed.user_attrs["worker_error"]
+    retries = [t for t in study.trials if t.system_attrs.get("failed_trial") == 2]
+    assert len(retries) == 1 and retries[0].state == TrialState.COMPLETE
+    assert retries[0].params == crashed.params
+    # The crashed trial's slot went back to the budget.
+    assert sum(t.state == TrialState.COMPLETE for t in study.trials) == 8
+
+
+def test_run_without_heartbeat_emits_no_experimental_warning(run_study):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        run_study(n_trials=4, n_jobs=2, trial_retries=1)
+    assert not [w for w in caught if issubclass(w.category, optuna.exceptions.ExperimentalWarning)]
+
+
+@pytest.mark.filterwarnings("ignore::optuna.exceptions.ExperimentalWarning")
+@pytest.mark.filterwarnings("ignore:Heartbeat of storage")
+def test_stale_trial_is_failed_and_retried_on_start(run_study, tmp_path):
+    storage = optuna.storages.RDBStorage(
+        f"sqlite:///{(tmp_path / 'study.db').as_posix()}", heartbeat_interval=1, grace_period=1
+    )
+    study = optuna.create_study(study_name="test", storage=storage, direction="maximize")
+    study.enqueue_trial({"x": 0.25, "k": 2})
+    stale = study.ask()
+    storage.record_heartbeat(stale._trial_id)
+    # SQLite timestamps have one-second resolution.
+    time.sleep(2.5)
+    study = run_study(n_trials=4, n_jobs=1, heartbeat_interval=1, grace_period=1, trial_retries=1)
+    assert study.trials[0].state == TrialState.FAIL
+    retried = [t for t in study.trials if t.system_attrs.get("failed_trial") == 0]
+    assert len(retried) == 1 and retried[0].params == {"x": 0.25, "k": 2}
+    assert retried[0].state == TrialState.COMPLETE
+
+
+def _die_holding(lock):
+    with lock.hold():
+        os._exit(9)
+
+
+def test_ask_lock_is_released_for_dead_holder():
+    ctx = multiprocessing.get_context("fork")
+    lock = AskLock(ctx, timeout=30)
+    p = ctx.Process(target=_die_holding, args=(lock,))
+    p.start()
+    p.join()
+    assert lock.release_for(p.pid)
+    t0 = time.time()
+    with lock.hold():
+        pass
+    assert time.time() - t0 < 1
+
+
+def test_ask_lock_times_out_instead_of_blocking():
+    ctx = multiprocessing.get_context("fork")
+    lock = AskLock(ctx, timeout=0.2)
+    p = ctx.Process(target=_die_holding, args=(lock,))
+    p.start()
+    p.join()
+    t0 = time.time()
+    with lock.hold():
+        pass
+    assert time.time() - t0 < 5
@@ -0,0 +1,30 @@
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.recycle import RecyclePolicy
+
+
+def test_recycle_policy_from_config():
+    assert RecyclePolicy.from_config({}) is None
+    policy = RecyclePolicy.from_config({"max_trials_per_worker": 3})
+    assert policy.reason(2) is None
+    assert "max_trials_per_worker=3" in policy.reason(3)
+    assert "max_worker_rss_mb" in RecyclePolicy.from_config({"max_worker_rss_mb": 1e-6}).reason(0)
+    with pytest.raises(ValueError, match="max_worker_rss_mb must be > 0"):
+        RecyclePolicy.from_config({"max_worker_rss_mb": -1})
+
+
+def test_recycled_workers_are_replaced_and_budget_completes(run_study):
+    study = run_study("PidObjective", n_trials=9, n_jobs=2, max_trials_per_worker=2)
+    trials = study.trials
+    assert len(trials) == 9
+    assert all(t.state == TrialState.COMPLETE for t in trials)
+    pids = [t.user_attrs["pid"] for t in trials]
+    assert max(pids.count(pid) for pid in set(pids)) <= 2
+    assert len(set(pids)) >= 5
+
+
+@pytest.mark.parametrize("extra", [{"executor": "thread"}, {"dispatcher": True}])
+def test_recycle_rejects_thread_and_dispatcher(run_study, extra):
+    with pytest.raises(ValueError, match="max_trials_per_worker"):
+        run_study(n_trials=4, n_jobs=2, max_trials_per_worker=2, **extra)
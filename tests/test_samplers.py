@@ -0,0 +1,50 @@
+import pickle
+
+import optuna
+import pytest
+
+from optuna_framework.samplers import build_sampler_spec, derive_seed
+
+
+def _first_params(sampler):
+    study = optuna.create_study(sampler=sampler)
+    trial = study.ask({"x": optuna.distributions.FloatDistribution(0.0, 1.0)})
+    return trial.params
+
+
+def test_worker_seeds_are_distinct_and_reproducible():
+    spec, _ = build_sampler_spec({"sampler": "random"}, 7)
+    spec = pickle.loads(pickle.dumps(spec))
+    assert derive_seed(7) == 7
+    assert len({derive_seed(7, worker_id) for worker_id in range(1, 65)}) == 64
+    assert _first_params(spec.build(1)) == _first_params(spec.build(1))
+    assert _first_params(spec.build(1)) != _first_params(spec.build(2))
+
+
+def test_tpe_options_reach_the_sampler():
+    spec, n_trials = build_sampler_spec(
+        {"sampler": "tpe", "n_trials": 5, "sampler_options": {"n_startup_trials": "3", "constant_liar": True}}, 0
+    )
+    sampler = spec.build(1)
+    assert n_trials == 5
+    assert isinstance(sampler, optuna.samplers.TPESampler)
+    assert sampler._n_startup_trials == 3 and sampler._constant_liar
+
+
+def test_invalid_sampler_config_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported sampler 'cmaes'"):
+        build_sampler_spec({"sampler": "cmaes"}, 0)
+    with pytest.raises(ValueError, match="sampler_options for 'random': multivariate"):
+        build_sampler_spec({"sampler": "random", "sampler_options": {"multivariate": True}}, 0)
+    with pytest.raises(ValueError, match="n_ei_candidates"):
+        build_sampler_spec({"sampler": "tpe", "sampler_options": {"n_ei_candidates": 0}}, 0)
+
+
+@pytest.mark.filterwarnings("ignore::optuna.exceptions.ExperimentalWarning")
+@pytest.mark.parametrize("sampler", ["tpe", "qmc"])
+def test_configured_sampler_runs_in_workers(run_study, sampler):
+    if sampler == "qmc":
+        pytest.importorskip("scipy")
+    study = run_study(n_trials=8, n_jobs=2, sampler=sampler)
+    assert len(study.trials) == 8
+    assert len({t.params["x"] for t in study.trials}) == 8
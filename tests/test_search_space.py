@@ -0,0 +1,57 @@
+import optuna
+import pytest
+
+from optuna_framework.search_space import CompiledSearchSpace, flatten_spec_tree, suggest_value
+
+# List choices are normalized to tuples by design; Optuna warns about them when the distribution is built.
+pytestmark = pytest.mark.filterwarnings("ignore:Choices for a categorical distribution")
+
+TREE = {
+    "group": {"lr": {"range": [1e-4, 1e-2], "log": True}, "batch_size": [16, 32, 64]},
+    "layers": {"range": [1, 8]},
+    "dropout": [0.0, 0.5],
+    "shape": [[1, 2], [3, 4]],
+    "fixed_flag": True,
+}
+
+
+def test_compiled_space_distributions():
+    space = CompiledSearchSpace(flatten_spec_tree(TREE), tree=TREE)
+    assert set(space) == {"lr", "batch_size", "layers", "dropout", "shape", "fixed_flag"}
+    assert space["lr"] == TREE["group"]["lr"]
+    dists = space.distributions
+    assert dists["lr"] == optuna.distributions.FloatDistribution(1e-4, 1e-2, log=True)
+    assert dists["layers"] == optuna.distributions.IntDistribution(1, 8)
+    assert dists["dropout"] == optuna.distributions.FloatDistribution(0.0, 0.5)
+    assert isinstance(dists["batch_size"], optuna.distributions.CategoricalDistribution)
+    assert "fixed_flag" not in dists
+
+
+def test_compiled_suggest_matches_suggest_value():
+    space = CompiledSearchSpace(flatten_spec_tree(TREE), tree=TREE)
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    compiled = space.suggest(study.ask())
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    trial = study.ask()
+    one_by_one = {name: suggest_value(trial, name, space[name]) for name in space}
+    assert compiled == one_by_one
+    assert isinstance(compiled["shape"], tuple)
+
+
+def test_resolve_and_params_tree():
+    space = CompiledSearchSpace(flatten_spec_tree(TREE), tree=TREE)
+    params = {"lr": 0.001, "batch_size": 32, "layers": 2, "dropout": 0.1, "shape": [1, 2]}
+    resolved = space.resolve(params)
+    assert resolved["fixed_flag"] is True and resolved["shape"] == (1, 2)
+    assert space.params_tree(resolved)["group"] == {"lr": 0.001, "batch_size": 32}
+    with pytest.raises(ValueError, match="Missing param 'lr'"):
+        space.resolve({})
+
+
+def test_invalid_specs_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate param"):
+        CompiledSearchSpace(flatten_spec_tree({"a": {"x": [1, 2]}, "b": {"x": [3, 4]}}))
+    with pytest.raises(ValueError, match="log with a step"):
+        CompiledSearchSpace({"n": {"range": [1, 9], "step": 2, "log": True}})
+    with pytest.raises(ValueError, match="needs a step"):
+        CompiledSearchSpace({"x": {"range": [0.0, 1.0]}}).grid_params()
@@ -0,0 +1,37 @@
+import pytest
+
+from optuna_framework.shared import SharedStore, attach_shared
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("backend", ["shm", "mmap"])
+def test_store_round_trip_and_close(backend):
+    store = SharedStore(backend)
+    store.publish("a", np.arange(6, dtype=np.int32).reshape(2, 3))
+    store.publish("b", b"payload")
+    manifest = store.manifest()
+    view = attach_shared(manifest)
+    assert view["a"].tolist() == [[0, 1, 2], [3, 4, 5]]
+    assert not view["a"].flags.writeable
+    assert bytes(view["b"]) == b"payload"
+    view.close()
+    store.close()
+    # The parent released the buffers.
+    with pytest.raises(OSError):
+        attach_shared({"b": manifest["b"]})
+
+
+def test_unsupported_objects_and_backends_are_rejected():
+    with pytest.raises(TypeError, match="numpy array or bytes"):
+        SharedStore().publish("x", [1, 2])
+    with pytest.raises(ValueError, match="shared_memory backend"):
+        SharedStore("redis")
+
+
+@pytest.mark.parametrize("backend,start_method", [("shm", "fork"), ("mmap", "fork"), ("shm", "spawn")])
+def test_workers_read_parent_data(run_study, backend, start_method):
+    study = run_study("SharedObjective", n_trials=6, n_jobs=2, shared_memory=backend, start_method=start_method)
+    for trial in study.trials:
+        assert trial.value == 4 * (trial.number % 10) + 1 + 3
+        assert trial.user_attrs["writeable"] is False
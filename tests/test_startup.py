@@ -0,0 +1,39 @@
+import re
+
+import pytest
+
+from optuna_framework.startup import StartupTimer, create_context, preload_modules
+
+
+def test_preload_modules_include_adapters_and_extras():
+    modules = preload_modules({"preload": ["numpy", "optuna"]}, ["fw_adapters:ValueObjective", None])
+    assert modules == ["optuna", "optuna_framework.runner", "fw_adapters", "numpy"]
+
+
+def test_unknown_start_method_is_rejected():
+    with pytest.raises(ValueError, match="start_method"):
+        create_context({"start_method": "threads"})
+
+
+def test_startup_timer_reports_ready_workers_only():
+    import multiprocessing
+
+    timer = StartupTimer(multiprocessing.get_context("fork"), 3)
+    timer.mark_start(1)
+    timer.mark_start(2)
+    assert timer.mark_ready(1) >= 0
+    assert len(timer.latencies()) == 1
+
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver", "fork"])
+def test_every_start_method_completes_the_run(run_study, start_method, capsys):
+    study = run_study(n_trials=4, n_jobs=2, start_method=start_method)
+    assert len(study.trials) == 4
+    assert f"worker startup start_method={start_method}" in capsys.readouterr().out
+
+
+def test_startup_includes_objective_adapter_setup(run_study, capsys):
+    run_study("SlowInitObjective", project={"init_sec": 0.5}, n_trials=2, n_jobs=2)
+    out = capsys.readouterr().out
+    mean = float(re.search(r"worker startup start_method=fork mean=([0-9.]+)s", out).group(1))
+    assert mean >= 0.5
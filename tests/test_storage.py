@@ -0,0 +1,39 @@
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.storage import StorageSpec
+
+
+@pytest.mark.parametrize("lock", ["symlink", "open"])
+def test_journal_backend_runs_budget(run_study, tmp_path, lock):
+    path = tmp_path / "study.log"
+    study = run_study(n_trials=10, n_jobs=2, storage_journal=str(path), storage_journal_lock=lock)
+    assert len(study.trials) == 10
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
+    assert not (tmp_path / "study.db").exists()
+    storage = StorageSpec.from_config({"storage_journal": str(path)}).build()
+    assert len(optuna.load_study(study_name="test", storage=storage).trials) == 10
+
+
+def test_storage_spec_from_config(tmp_path):
+    spec = StorageSpec.from_config({"storage_sqlite": str(tmp_path / "s.db")})
+    assert spec.backend == "rdb" and spec.sqlite_path == str(tmp_path / "s.db")
+    assert spec.engine_kwargs["connect_args"]["timeout"] == 30
+    journal = StorageSpec.from_config({"storage_journal": "s.log", "storage_journal_lock": "OPEN"})
+    assert (journal.backend, journal.journal_lock, journal.describe()) == ("journal", "open", "journal:s.log")
+
+
+@pytest.mark.parametrize(
+    "opt_cfg, message",
+    [
+        ({"storage_backend": "redis"}, "Unsupported storage_backend 'redis'"),
+        ({"storage_backend": "journal"}, "requires storage_journal"),
+        ({"storage_journal": "s.log", "storage_journal_lock": "flock"}, "Unsupported storage_journal_lock 'flock'"),
+        ({"storage_journal": "s.log", "heartbeat_interval": 5}, "heartbeat_interval requires storage_backend: rdb"),
+        ({}, "requires a persistent Optuna storage URL"),
+    ],
+)
+def test_invalid_storage_config_is_rejected(opt_cfg, message):
+    with pytest.raises(ValueError, match=message):
+        StorageSpec.from_config(opt_cfg)
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from optuna.trial import TrialState
+
+from optuna_framework.timeouts import SoftDeadline, TrialTimeout, TrialTimeoutSpec
+
+
+def test_spec_validation():
+    assert TrialTimeoutSpec.from_config({}) is None
+    with pytest.raises(ValueError, match="must be <"):
+        TrialTimeoutSpec.from_config({"trial_timeout_sec": 5, "trial_soft_timeout_sec": 5})
+    with pytest.raises(ValueError, match="trial_timeout_state"):
+        TrialTimeoutSpec.from_config({"trial_timeout_sec": 5, "trial_timeout_state": "complete"})
+    assert TrialTimeoutSpec.from_config({"trial_timeout_sec": 5, "trial_timeout_state": "pruned"}).trial_state == (
+        TrialState.PRUNED
+    )
+
+
+def test_soft_deadline_interrupts_python_code():
+    with pytest.raises(TrialTimeout):
+        with SoftDeadline(0.1):
+            while True:
+                time.sleep(0.01)
+
+
+def test_soft_deadline_is_silent_when_the_block_finishes_in_time():
+    with SoftDeadline(5.0):
+        pass
+    time.sleep(0.05)
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_soft_timeout_prunes_the_trial(run_study, executor):
+    study = run_study(
+        "HangObjective", n_trials=4, n_jobs=2, executor=executor, trial_soft_timeout_sec=0.5, project={"hang_trial": 1}
+    )
+    hung = study.trials[1]
+    assert hung.state == TrialState.PRUNED
+    assert hung.user_attrs["timeout"] == "soft"
+    assert sum(t.state == TrialState.COMPLETE for t in study.trials) == 3
+
+
+@pytest.mark.parametrize("state", ["fail", "pruned"])
+def test_hard_timeout_kills_the_worker_and_records_the_state(run_study, state):
+    t0 = time.time()
+    study = run_study(
+        "HangObjective",
+        n_trials=5,
+        n_jobs=2,
+        trial_timeout_sec=1.5,
+        trial_timeout_state=state,
+        project={"hang_trial": 1, "blocking": True},
+    )
+    assert time.time() - t0 < 30
+    hung = study.trials[1]
+    assert hung.state == TrialState[state.upper()]
+    assert hung.user_attrs["timeout"] == "hard"
+    # The killed worker is replaced and the rest of the budget completes.
+    assert len(study.trials) == 5
+    assert sum(t.state == TrialState.COMPLETE for t in study.trials) == 4
+
+
+def test_hard_timeout_requires_process_workers(run_study):
+    with pytest.raises(ValueError, match="trial_timeout_sec"):
+        run_study(n_trials=2, n_jobs=1, executor="thread", trial_timeout_sec=5)
@@ -0,0 +1,31 @@
+import tempfile
+
+import pytest
+
+from optuna_framework.timing import PhaseTiming
+
+
+@pytest.fixture
+def tempdir(tmp_path, monkeypatch):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+    return scratch
+
+
+def test_phase_timing_removes_its_directory(run_study, tempdir, capsys):
+    run_study(n_trials=4, n_jobs=2, phase_timing=True)
+    assert "[TIMING] trials=4" in capsys.readouterr().out
+    assert not list(tempdir.glob("optuna-timing-*"))
+
+
+def test_config_error_leaks_no_timing_directory(run_study, tempdir):
+    with pytest.raises(ValueError, match="budget_source"):
+        run_study(n_trials=4, n_jobs=2, phase_timing=True, budget_source="bogus")
+    assert not list(tempdir.glob("optuna-timing-*"))
+
+
+def test_from_config_creates_nothing(tempdir):
+    timing = PhaseTiming.from_config({"phase_timing": True})
+    assert timing.out_dir is None
+    assert not list(tempdir.iterdir())